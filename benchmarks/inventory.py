@@ -0,0 +1,87 @@
+"""Synthetic inventories for benchmarks.
+
+An inventory of N spaces has one consolidated space over every device, a
+tenth of the spaces as groups of `group_fanout` consecutive devices, and
+the rest as individual device spaces. Devices are spread over /24 subnets
+of 10.0.0.0/8, so generated CLAUDE.md files describe realistic networks.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+
+def make_inventory(
+    spaces: int,
+    devices: Optional[int] = None,
+    group_fanout: int = 8,
+    groups: Optional[int] = None,
+    spaces_base_path: str = "spaces",
+) -> dict:
+    """Build a config.yaml document.
+
+    Args:
+        spaces: Number of spaces, including the consolidated one
+        devices: Number of devices (default: one per individual space, at least one)
+        group_fanout: Devices per group space
+        groups: Number of group spaces (default: a tenth of the spaces)
+        spaces_base_path: Where the spaces are created
+    """
+    spaces = max(1, spaces)
+    groups = min(spaces // 10 if groups is None else groups, spaces - 1)
+    individual = spaces - 1 - groups
+    devices = max(1, individual if devices is None else devices)
+
+    device_list = [
+        {
+            "id": f"dev-{i:05d}",
+            "name": f"Device {i}",
+            "ip": f"10.{i // 62500}.{i // 250 % 250}.{i % 250 + 1}",
+            "mcp_port": 3001 + i % 8,
+            "description": f"Synthetic device {i}",
+        }
+        for i in range(devices)
+    ]
+    device_ids = [device["id"] for device in device_list]
+
+    space_list = [{
+        "id": "lan-manager",
+        "name": "LAN Manager",
+        "category": "consolidated",
+        "devices": device_ids,
+        "description": "Every device",
+    }]
+    for g in range(groups):
+        start = g * group_fanout % devices
+        members = [device_ids[(start + k) % devices] for k in range(min(group_fanout, devices))]
+        space_list.append({
+            "id": f"group-{g:05d}",
+            "name": f"Group {g}",
+            "category": "group",
+            "devices": members,
+        })
+    for i in range(individual):
+        space_list.append({
+            "id": f"space-{i:05d}",
+            "name": f"Space {i}",
+            "category": "individual",
+            "devices": [device_ids[i % devices]],
+        })
+
+    return {
+        "spaces_base_path": spaces_base_path,
+        "terminal_emulator": "xterm",
+        "devices": device_list,
+        "spaces": space_list,
+    }
+
+
+def write_inventory(directory: Path, spaces: int, **kwargs) -> Path:
+    """Write a synthetic config.yaml (spaces created under directory/spaces)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    kwargs.setdefault("spaces_base_path", str(directory / "spaces"))
+    path = directory / "config.yaml"
+    with open(path, "w") as f:
+        yaml.safe_dump(make_inventory(spaces, **kwargs), f, sort_keys=False)
+    return path
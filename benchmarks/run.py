@@ -0,0 +1,265 @@
+"""Startup and scaling benchmarks.
+
+Measures, for synthetic inventories of each size (see inventory.py):
+
+- import: importing the CLI (claude_lan_manager.setup) and the GUI
+  (claude_lan_manager.app), each in a fresh interpreter
+- config_load_cold / config_load_cached: AppConfig.load without and with
+  the config snapshot cache
+- generate_mcp_json / generate_claude_md: rendering every space's files
+- init_spaces_cold / init_spaces_warm: initialize_spaces into an empty
+  directory, then again with nothing changed
+- main_window / multiplexer_window: constructing and first showing each
+  window on the offscreen Qt platform
+
+Results are written as JSON and compared against a baseline saved earlier
+with --save-baseline:
+
+    uv run python benchmarks/run.py --sizes 10,100,1000 --save-baseline
+    # ... change something ...
+    uv run python benchmarks/run.py --sizes 10,100,1000
+
+Exits with status 1 when a benchmark got slower than the baseline by more
+than --threshold.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from inventory import write_inventory
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+# Slowdown against the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Medians below this are too noisy to compare
+MIN_COMPARED_SECONDS = 0.002
+
+IMPORTED_MODULES = {
+    "import_cli": "claude_lan_manager.setup",
+    "import_gui": "claude_lan_manager.app",
+}
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> list[float]:
+    """Run func repeat times (calling setup before each run, untimed); seconds per run."""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def quietly(func: Callable[[], object]) -> Callable[[], object]:
+    """Wrap func to discard what it prints."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+
+def measure_import(module: str, repeat: int) -> list[float]:
+    """Time importing a module in fresh interpreters (excluding interpreter startup)."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ
+        ).stdout
+        runs.append(float(output.strip().splitlines()[-1]))
+    return runs
+
+
+class Suite:
+    def __init__(self, workdir: Path, repeat: int, gui: bool):
+        self.workdir = workdir
+        self.repeat = repeat
+        self.gui = gui
+        self.results: list[dict] = []
+        self._app = None
+
+    def record(self, name: str, size: Optional[int], runs: list[float]) -> None:
+        median = statistics.median(runs)
+        self.results.append({"name": name, "size": size, "median": median, "runs": runs})
+        label = f"{name} [{size}]" if size is not None else name
+        print(f"  {label:<32} {median * 1000:>10.2f} ms", flush=True)
+
+    def run(self, sizes: list[int], group_fanout: int) -> None:
+        for name, module in IMPORTED_MODULES.items():
+            if name == "import_gui" and not self.gui:
+                continue
+            self.record(name, None, measure_import(module, self.repeat))
+        for size in sizes:
+            self.run_size(size, group_fanout)
+
+    def run_size(self, size: int, group_fanout: int) -> None:
+        from claude_lan_manager.config import AppConfig, generate_claude_md, generate_mcp_json
+        from claude_lan_manager.setup import initialize_spaces
+
+        directory = self.workdir / f"inventory-{size}"
+        config_path = write_inventory(directory, size, group_fanout=group_fanout)
+        # Fewer repeats for the slow, large runs
+        repeat = self.repeat if size < 10000 else max(1, self.repeat // 2)
+
+        self.record("config_load_cold", size, measure(lambda: AppConfig.load(config_path, use_cache=False), repeat))
+        AppConfig.load(config_path)
+        self.record("config_load_cached", size, measure(lambda: AppConfig.load(config_path), repeat))
+
+        config = AppConfig.load(config_path, use_cache=False)
+        resolved = [(space, config.get_devices_for_space(space)) for space in config.spaces.values()]
+        self.record("generate_mcp_json", size, measure(
+            lambda: [json.dumps(generate_mcp_json(devices)) for _space, devices in resolved], repeat
+        ))
+        self.record("generate_claude_md", size, measure(
+            lambda: [generate_claude_md(space, devices, network=config.network) for space, devices in resolved],
+            repeat,
+        ))
+
+        def clear_spaces():
+            shutil.rmtree(config.spaces_base_path, ignore_errors=True)
+
+        self.record("init_spaces_cold", size, measure(
+            quietly(lambda: initialize_spaces(config)), repeat, setup=clear_spaces
+        ))
+        self.record("init_spaces_warm", size, measure(quietly(lambda: initialize_spaces(config)), repeat))
+
+        if self.gui:
+            from claude_lan_manager.app import MainWindow
+            from claude_lan_manager.multiplexer import MultiplexerWindow
+
+            self.record("main_window", size, measure(lambda: self.show_window(MainWindow, config), repeat))
+            self.record("multiplexer_window", size, measure(lambda: self.show_window(MultiplexerWindow, config), repeat))
+
+    def show_window(self, window_class, config) -> None:
+        """Construct a window and process events until it is first painted."""
+        from PyQt6.QtWidgets import QApplication
+
+        from claude_lan_manager.styles import STYLESHEET
+
+        if self._app is None:
+            self._app = QApplication.instance() or QApplication([sys.argv[0]])
+            self._app.setStyleSheet(STYLESHEET)
+        window = window_class(config)
+        window.show()
+        self._app.processEvents()
+        # Closing stops the window's monitors and waits for their threads, which
+        # would otherwise keep writing caches into the work directory
+        window.close()
+        window.deleteLater()
+        self._app.processEvents()
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Print current against baseline medians; returns the regressed benchmarks."""
+    previous = {(item["name"], item["size"]): item["median"] for item in baseline.get("results", [])}
+    regressions = []
+    print(f"\n  {'benchmark':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for item in results:
+        key = (item["name"], item["size"])
+        label = f"{item['name']} [{item['size']}]" if item["size"] is not None else item["name"]
+        if key not in previous:
+            print(f"  {label:<32} {'-':>10} {item['median'] * 1000:>8.2f}ms")
+            continue
+        before, now = previous[key], item["median"]
+        change = (now - before) / before if before else 0.0
+        flag = ""
+        if change > threshold and max(before, now) >= MIN_COMPARED_SECONDS:
+            flag = "  REGRESSION"
+            regressions.append(label)
+        print(f"  {label:<32} {before * 1000:>8.2f}ms {now * 1000:>8.2f}ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Claude LAN Manager startup and scaling benchmarks")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated inventory sizes, in spaces (default: %(default)s)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark (default: %(default)s)")
+    parser.add_argument("--group-fanout", type=int, default=8, help="Devices per group space (default: %(default)s)")
+    parser.add_argument("--no-gui", action="store_true", help="Skip the Qt import and window benchmarks")
+    parser.add_argument("--output", "-o", type=Path, help="Write results to this JSON file")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline to compare against (default: benchmarks/baseline.json)"
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown that counts as a regression, as a fraction (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="clm-bench-", ignore_cleanup_errors=True) as tmp:
+        workdir = Path(tmp)
+        # Keep caches, the session registry and config lookups out of the user's home
+        os.environ["XDG_CACHE_HOME"] = str(workdir / "cache")
+        os.environ["XDG_STATE_HOME"] = str(workdir / "state")
+        os.environ["XDG_DATA_HOME"] = str(workdir / "data")
+        os.environ["CLAUDE_LAN_MANAGER_NO_LAUNCH_TRACE"] = "1"
+        os.environ.pop("CLAUDE_LAN_MANAGER_NO_CONFIG_CACHE", None)
+        if not args.no_gui:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+        print(f"Benchmarking {', '.join(map(str, sizes))} spaces, {args.repeat} runs each")
+        suite = Suite(workdir, args.repeat, gui=not args.no_gui)
+        suite.run(sizes, args.group_fanout)
+
+        report = {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "sizes": sizes,
+                "repeat": args.repeat,
+                "group_fanout": args.group_fanout,
+            },
+            "results": suite.results,
+        }
+        # Before the work directory goes, so a failed cleanup can't lose the results
+        if args.output:
+            args.output.write_text(json.dumps(report, indent=2) + "\n")
+            print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; store one with --save-baseline")
+        return 0
+    regressions = compare(suite.results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
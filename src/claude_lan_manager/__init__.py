@@ -1,6 +1,11 @@
 """Claude LAN Manager - GUI launcher for managing LAN devices via Claude Code."""
 
-from claude_lan_manager.app import main
-
 __version__ = "0.1.0"
 __all__ = ["main"]
+
+
+def main():
+    """Start the GUI (imported on call, so the CLI tools don't load Qt)."""
+    from claude_lan_manager.app import main as run
+
+    return run()
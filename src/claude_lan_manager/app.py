@@ -9,118 +9,31 @@ from PyQt6.QtWidgets import (
     QMainWindow,
     QWidget,
     QVBoxLayout,
-    QHBoxLayout,
-    QGridLayout,
-    QPushButton,
     QLabel,
-    QFrame,
     QMessageBox,
-    QScrollArea,
-    QGroupBox,
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QIcon
 
 from claude_lan_manager.config import AppConfig, Space
-from claude_lan_manager.launcher import (
-    launch_claude_in_terminal,
-    check_terminal_available,
-    check_claude_available,
-)
-
+from claude_lan_manager.launch_trace import LaunchTrace
+from claude_lan_manager.reload import ConfigDiff
+from claude_lan_manager.spaces_window import SpacesWindow
+from claude_lan_manager.styles import STYLESHEET, set_role, set_warning
 
-class SpaceButton(QPushButton):
-    """Custom button for launching a Claude Space."""
+SECTION_TITLES = {
+    "consolidated": "LAN Manager",
+    "group": "Device Groups",
+    "individual": "Individual Devices",
+}
 
-    def __init__(self, space: Space, parent=None):
-        super().__init__(parent)
-        self.space = space
 
-        # Set button text with device count indicator
-        device_count = len(space.devices)
-        if device_count == 1:
-            count_text = "1 device"
-        else:
-            count_text = f"{device_count} devices"
-
-        self.setText(f"{space.name}\n({count_text})")
-
-        # Style based on category
-        self.setMinimumSize(QSize(150, 80))
-        self.setMaximumSize(QSize(200, 100))
-
-        # Set tooltip with description
-        if space.description:
-            self.setToolTip(space.description)
-
-        # Apply category-specific styling
-        self._apply_style()
-
-    def _apply_style(self):
-        """Apply styling based on space category."""
-        base_style = """
-            QPushButton {
-                font-size: 12px;
-                font-weight: 600;
-                padding: 12px;
-                border-radius: 8px;
-                border: 1px solid;
-            }
-            QPushButton:pressed {
-                padding-top: 14px;
-                padding-bottom: 10px;
-            }
-        """
-
-        if self.space.category == "consolidated":
-            # Blue for consolidated/LAN manager
-            self.setStyleSheet(base_style + """
-                QPushButton {
-                    background-color: #4a90d9;
-                    border-color: #3a7bc8;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #5a9fe8;
-                    border-color: #4a8fd7;
-                }
-            """)
-        elif self.space.category == "group":
-            # Teal for group managers
-            self.setStyleSheet(base_style + """
-                QPushButton {
-                    background-color: #26a69a;
-                    border-color: #1e8e82;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #2ebfb1;
-                    border-color: #26a69a;
-                }
-            """)
-        else:
-            # Light gray/blue for individual devices
-            self.setStyleSheet(base_style + """
-                QPushButton {
-                    background-color: #6c8ebf;
-                    border-color: #5a7cad;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #7c9ecf;
-                    border-color: #6c8ebf;
-                }
-            """)
-
-
-class MainWindow(QMainWindow):
+class MainWindow(SpacesWindow):
     """Main application window."""
 
     def __init__(self, config: AppConfig):
-        super().__init__()
-        self.config = config
+        super().__init__(config, SECTION_TITLES)
 
-        self.setWindowTitle("Claude LAN Manager")
         self.setMinimumSize(600, 400)
 
         # Create central widget and layout
@@ -135,82 +48,27 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(header)
 
         # Subtitle showing spaces path
-        subtitle = QLabel(f"Spaces: {config.spaces_base_path}")
-        subtitle.setStyleSheet("color: #888; font-size: 10px;")
-        subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        main_layout.addWidget(subtitle)
-
-        # Scroll area for buttons
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        main_layout.addWidget(scroll)
-
-        scroll_content = QWidget()
-        scroll.setWidget(scroll_content)
-        content_layout = QVBoxLayout(scroll_content)
-
-        # Group spaces by category
-        consolidated = []
-        groups = []
-        individual = []
-
-        for space in config.spaces.values():
-            if space.category == "consolidated":
-                consolidated.append(space)
-            elif space.category == "group":
-                groups.append(space)
-            else:
-                individual.append(space)
-
-        # Add consolidated section (LAN Manager)
-        if consolidated:
-            group_box = QGroupBox("LAN Manager")
-            group_layout = QHBoxLayout(group_box)
-            group_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            for space in consolidated:
-                btn = SpaceButton(space)
-                btn.clicked.connect(partial(self._launch_space, space))
-                group_layout.addWidget(btn)
-            content_layout.addWidget(group_box)
-
-        # Add group managers section
-        if groups:
-            group_box = QGroupBox("Device Groups")
-            group_layout = QHBoxLayout(group_box)
-            group_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            for space in groups:
-                btn = SpaceButton(space)
-                btn.clicked.connect(partial(self._launch_space, space))
-                group_layout.addWidget(btn)
-            content_layout.addWidget(group_box)
-
-        # Add individual devices section
-        if individual:
-            group_box = QGroupBox("Individual Devices")
-            grid_layout = QGridLayout(group_box)
-
-            cols = 3
-            for i, space in enumerate(individual):
-                row = i // cols
-                col = i % cols
-                btn = SpaceButton(space)
-                btn.clicked.connect(partial(self._launch_space, space))
-                grid_layout.addWidget(btn, row, col)
-
-            content_layout.addWidget(group_box)
-
-        # Add stretch at bottom
-        content_layout.addStretch()
-
-        # Status bar
-        self.statusBar().showMessage("Ready")
-
-        # Check prerequisites
-        self._check_prerequisites()
+        self._subtitle = QLabel(f"Spaces: {config.spaces_base_path}")
+        set_role(self._subtitle, "subtitle")
+        self._subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        main_layout.addWidget(self._subtitle)
+
+        main_layout.addWidget(self._targets)
+
+    def _start_background_work(self):
+        super()._start_background_work()
+        if not self._background_stopped:
+            self._check_prerequisites()
+
+    def apply_config(self, config: AppConfig, diff: ConfigDiff):
+        """Update the window for a config change."""
+        super().apply_config(config, diff)
+        self._subtitle.setText(f"Spaces: {config.spaces_base_path}")
 
     def _check_prerequisites(self):
         """Check that terminal and Claude are available."""
+        from claude_lan_manager.launcher import check_claude_available, check_terminal_available
+
         warnings = []
 
         if not check_terminal_available(self.config.terminal_emulator):
@@ -221,27 +79,74 @@ class MainWindow(QMainWindow):
 
         if warnings:
             self.statusBar().showMessage(" | ".join(warnings))
-            self.statusBar().setStyleSheet("color: orange;")
+            set_warning(self.statusBar(), True)
 
     def _launch_space(self, space: Space):
-        """Launch Claude Code in the specified space."""
-        try:
-            self.statusBar().showMessage(f"Launching {space.name}...")
-            launch_claude_in_terminal(self.config, space)
-            self.statusBar().showMessage(f"Launched {space.name}")
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Launch Error",
-                f"Failed to launch {space.name}:\n{str(e)}"
+        """Launch Claude Code in the specified space (in the background)."""
+        if not self._launcher.submit(self.config, space):
+            self.statusBar().showMessage(f"{space.name} is already launching...")
+
+    def _on_launch_started(self, space_id: str):
+        self.statusBar().showMessage(f"Launching {self._space_name(space_id)}...")
+
+    def _on_launched(self, space_id: str, session):
+        if session.reused:
+            self.statusBar().showMessage(
+                f"{self._space_name(space_id)} is already running in {session.describe()}"
             )
-            self.statusBar().showMessage("Launch failed")
+        else:
+            self.statusBar().showMessage(f"Launched {self._space_name(space_id)} in {session.describe()}")
+        if self._sessions is not None:
+            self._sessions.refresh()
+
+    def _on_launch_failed(self, space_id: str, message: str):
+        name = self._space_name(space_id)
+        self.statusBar().showMessage("Launch failed")
+        QMessageBox.critical(
+            self,
+            "Launch Error",
+            f"Failed to launch {name}:\n{message}"
+        )
+
+
+def build_parser(description: str = "Claude LAN Manager"):
+    """Options shared by the GUIs."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--no-config-cache",
+        action="store_true",
+        help="Always re-parse the config file instead of using the cached snapshot"
+    )
+    return parser
+
+
+def parse_args(argv: list[str] = None, parser=None):
+    """Parse launcher options (build_parser()'s, by default), leaving anything else for Qt.
+
+    Returns:
+        Tuple of (parsed options, remaining arguments for QApplication)
+    """
+    parser = parser or build_parser()
+    return parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+
+
+def watch_config(window: QMainWindow, config: AppConfig, use_cache: bool = True):
+    """Apply config file changes to a window."""
+    from claude_lan_manager.config_watcher import ConfigWatcher
+
+    watcher = ConfigWatcher(config, use_cache=use_cache, parent=window)
+    watcher.reloaded.connect(window.apply_config)
+    watcher.failed.connect(window.statusBar().showMessage)
 
 
 def main():
     """Main entry point for the application."""
     # Load configuration
-    config = AppConfig.load()
+    args, qt_args = parse_args()
+    with LaunchTrace().span("config_load"):
+        config = AppConfig.load(use_cache=not args.no_config_cache)
 
     # If no spaces configured, show a helpful message
     if not config.spaces:
@@ -252,49 +157,20 @@ def main():
         sys.exit(1)
 
     # Create Qt application
-    app = QApplication(sys.argv)
+    app = QApplication([sys.argv[0], *qt_args])
     app.setApplicationName("Claude LAN Manager")
     app.setApplicationVersion("0.1.0")
 
     # Light theme
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #f5f5f5;
-        }
-        QWidget {
-            background-color: #f5f5f5;
-            color: #333;
-        }
-        QGroupBox {
-            font-weight: bold;
-            font-size: 13px;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            margin-top: 14px;
-            padding-top: 12px;
-            background-color: #fff;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 12px;
-            padding: 0 6px;
-            color: #555;
-        }
-        QStatusBar {
-            background-color: #e8e8e8;
-            color: #666;
-            border-top: 1px solid #ddd;
-        }
-        QScrollArea {
-            border: none;
-            background-color: #f5f5f5;
-        }
-    """)
+    app.setStyleSheet(STYLESHEET)
 
     # Create and show main window
     window = MainWindow(config)
     window.show()
 
+    # Reload the window in place when the config file changes (once it is shown)
+    QTimer.singleShot(0, partial(watch_config, window, config, use_cache=not args.no_config_cache))
+
     # Run event loop
     sys.exit(app.exec())
 
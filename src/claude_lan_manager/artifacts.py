@@ -0,0 +1,228 @@
+"""Generated space artifacts (CLAUDE.md, .mcp.json, logs/README.md).
+
+Each space keeps a small manifest recording the content hash of every file
+we generated and the fingerprint of the config inputs that produced them.
+Files are only written when their rendered bytes actually differ, and always
+via a temp file plus rename, so an interrupted write never leaves a
+half-written .mcp.json behind.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import astuple
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from claude_lan_manager.capabilities import device_tools
+from claude_lan_manager.config import AppConfig, Device, Space, generate_claude_md, generate_mcp_json
+from claude_lan_manager.templates import get_template
+
+MANIFEST_NAME = ".claude-lan-manager.json"
+
+CLAUDE_MD = "CLAUDE.md"
+MCP_JSON = ".mcp.json"
+LOGS_README = "logs/README.md"
+ARTIFACT_NAMES = (CLAUDE_MD, MCP_JSON, LOGS_README)
+
+
+def render_logs_readme(space: Space) -> str:
+    """Generate the README placed in a space's logs folder."""
+    return f"""# {space.name} Logs
+
+This folder contains logs and documentation generated during Claude sessions.
+
+## Recommended Structure
+
+- `session-YYYY-MM-DD.md` - Daily session notes
+- `changes.md` - Configuration and system changes
+- `issues.md` - Problems encountered and resolutions
+"""
+
+
+# Artifact name -> renderer(config, space, devices) returning the file's bytes
+RENDERERS: dict[str, Callable[[AppConfig, Space, list[Device]], bytes]] = {
+    CLAUDE_MD: lambda config, space, devices: generate_claude_md(
+        space, devices, config.template_dir, config.network, device_tools(devices),
+        gateway=config.gateway_url(space) is not None,
+    ).encode(),
+    MCP_JSON: lambda config, space, devices: json.dumps(
+        generate_mcp_json(devices, config.gateway_url(space)), indent=2
+    ).encode(),
+    LOGS_README: lambda config, space, devices: render_logs_readme(space).encode(),
+}
+
+
+def _read_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once: changing the umask is process-wide and not thread-safe
+_UMASK = _read_umask()
+
+
+def space_fingerprint(config: AppConfig, space: Space) -> str:
+    """Fingerprint of every config input that the space's artifacts depend on."""
+    devices = config.get_devices_for_space(space)
+    template = get_template(space.category, config.template_dir)
+    # Catalog changes only matter to templates that list the tools
+    tools = device_tools(devices) if "tools" in template.identifiers else ()
+    return hashlib.sha256(
+        repr((
+            astuple(space), [astuple(d) for d in devices], config.network, template.key, tools,
+            config.gateway_url(space),
+        )).encode()
+    ).hexdigest()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write a file via a temp file in the same directory and an atomic rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the permissions a plain write would give
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SpaceManifest:
+    """Record of the artifacts generated for one space."""
+
+    def __init__(self, space: Space):
+        self.path = space.path / MANIFEST_NAME
+        self.fingerprint: Optional[str] = None
+        self.artifacts: dict[str, dict] = {}
+        self._dirty = False
+
+        try:
+            data = json.loads(self.path.read_text())
+            self.fingerprint = data.get("fingerprint")
+            self.artifacts = dict(data.get("artifacts", {}))
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def is_current(self, name: str, path: Path, digest: str) -> bool:
+        """Check, by hash and stat, that a file still holds what we last wrote."""
+        entry = self.artifacts.get(name)
+        if entry is None or entry.get("sha256") != digest:
+            return False
+        return self.is_untouched(name, path)
+
+    def is_untouched(self, name: str, path: Path) -> bool:
+        """Check, by stat only, that a file is still exactly as we recorded it."""
+        entry = self.artifacts.get(name)
+        if entry is None:
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns")
+
+    def record(self, name: str, path: Path, digest: str) -> None:
+        stat = path.stat()
+        entry = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if self.artifacts.get(name) != entry:
+            self.artifacts[name] = entry
+            self._dirty = True
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        if self.fingerprint != fingerprint:
+            self.fingerprint = fingerprint
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if anything changed."""
+        if not self._dirty:
+            return
+        data = {"fingerprint": self.fingerprint, "artifacts": self.artifacts}
+        atomic_write(self.path, json.dumps(data, indent=2, sort_keys=True).encode())
+        self._dirty = False
+
+
+def is_space_current(config: AppConfig, space: Space) -> bool:
+    """Check whether a space's artifacts were generated from its current inputs.
+
+    Cheap enough to run for thousands of spaces: one manifest read and a
+    stat per artifact, no rendering.
+    """
+    manifest = SpaceManifest(space)
+    if manifest.fingerprint != space_fingerprint(config, space):
+        return False
+    return all(manifest.is_untouched(name, space.path / name) for name in ARTIFACT_NAMES)
+
+
+def sync_space(
+    config: AppConfig,
+    space: Space,
+    names: Iterable[str] = ARTIFACT_NAMES,
+    overwrite: Optional[Iterable[str]] = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Bring a space's generated files up to date, writing only what changed.
+
+    Args:
+        config: Application configuration
+        space: Space to sync
+        names: Artifacts to consider (see ARTIFACT_NAMES)
+        overwrite: Artifacts that may replace an existing file with different
+            contents. Others are only created when missing. Defaults to all.
+        dry_run: Report what would be written without touching the disk
+
+    Returns:
+        Names of the artifacts that were (or would be) written
+    """
+    names = list(names)
+    overwrite = set(names if overwrite is None else overwrite)
+    devices = config.get_devices_for_space(space)
+    written = []
+    current = set()  # artifacts known to match their rendered contents
+
+    if not dry_run:
+        space.path.mkdir(parents=True, exist_ok=True)
+        space.logs_path.mkdir(exist_ok=True)
+    manifest = SpaceManifest(space)
+
+    for name in names:
+        path = space.path / name
+        exists = path.exists()
+        if exists and name not in overwrite:
+            continue
+
+        data = RENDERERS[name](config, space, devices)
+        digest = content_hash(data)
+
+        current.add(name)
+        if exists and (manifest.is_current(name, path, digest) or path.read_bytes() == data):
+            if not dry_run:
+                manifest.record(name, path, digest)
+            continue
+
+        written.append(name)
+        if not dry_run:
+            atomic_write(path, data)
+            manifest.record(name, path, digest)
+
+    if not dry_run:
+        # The fingerprint vouches for every artifact, so only set it when all match
+        if current.issuperset(ARTIFACT_NAMES):
+            manifest.set_fingerprint(space_fingerprint(config, space))
+        manifest.save()
+
+    return written
@@ -0,0 +1,104 @@
+"""On-disk cache helpers for Claude LAN Manager.
+
+Snapshots live under ``$XDG_CACHE_HOME/claude-lan-manager/`` and are keyed
+on everything that could change their contents. A snapshot that is missing,
+corrupt, written by another user or keyed differently is simply treated as
+a cache miss.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# Bump when the on-disk snapshot layout changes
+CACHE_FORMAT = 1
+
+
+def get_cache_dir() -> Path:
+    """Get the cache directory for Claude LAN Manager."""
+    xdg_cache = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return Path(xdg_cache) / "claude-lan-manager"
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable cache key from hashable, repr-able parts."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
+
+
+def read_with_fingerprint(path: Path) -> tuple[bytes, tuple]:
+    """Read a file and return its bytes with a (path, size, mtime, hash) fingerprint."""
+    stat = path.stat()
+    data = path.read_bytes()
+    digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+    return data, (str(path.resolve()), stat.st_size, stat.st_mtime_ns, digest)
+
+
+def _snapshot_path(name: str) -> Path:
+    return get_cache_dir() / f"{name}.pickle"
+
+
+def snapshot_stamp(name: str) -> Optional[tuple]:
+    """(size, mtime) of a stored snapshot, to tell cheaply whether it changed."""
+    try:
+        stat = _snapshot_path(name).stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _is_trusted(path: Path) -> bool:
+    """Only unpickle files we own that nobody else can write to."""
+    stat = path.stat()
+    if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+        return False
+    return not stat.st_mode & 0o022
+
+
+def load_snapshot(name: str, key: str) -> Optional[Any]:
+    """Load a cached snapshot, or None if it is missing or stale.
+
+    Args:
+        name: Snapshot name (file stem inside the cache directory)
+        key: Key the snapshot must have been stored with
+
+    Returns:
+        The cached value, or None on any kind of miss
+    """
+    path = _snapshot_path(name)
+    try:
+        if not _is_trusted(path):
+            return None
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if header != (CACHE_FORMAT, sys.hexversion, key):
+                return None
+            return pickle.load(f)
+    except Exception:
+        # Corrupt, truncated or unreadable snapshots are just misses
+        return None
+
+
+def store_snapshot(name: str, key: str, value: Any) -> None:
+    """Atomically store a snapshot. Failures are silently ignored."""
+    cache_dir = get_cache_dir()
+    tmp_path = None
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".{name}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((CACHE_FORMAT, sys.hexversion, key), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _snapshot_path(name))
+        tmp_path = None
+    except Exception:
+        pass
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,89 @@
+"""Tool catalogs of the devices' MCP servers.
+
+Catalogs (what `tools/list` returned, plus the server's name and version)
+are kept in the cache directory, keyed by endpoint, and refreshed by
+claude_lan_manager.capabilities_probe. Reading them never touches the
+network: generated CLAUDE.md files list the tools each device offers (see
+the $tools template variable), and the GUIs show them in the space
+tooltips.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from claude_lan_manager.cache import load_snapshot, make_key, snapshot_stamp
+
+if TYPE_CHECKING:
+    from claude_lan_manager.config import Device
+
+# Seconds a catalog is used without asking the server
+CATALOG_TTL = 3600
+
+# Seconds until a device that couldn't be probed is tried again
+RETRY_AFTER = 300
+
+# Between the device ID and the tool name in the MCP gateway's tool names
+GATEWAY_TOOL_SEPARATOR = "__"
+
+CACHE_NAME = "capabilities"
+CACHE_KEY = make_key(CACHE_NAME, 2)
+
+
+@dataclass(frozen=True, slots=True)
+class ToolInfo:
+    """One tool of a device's MCP server."""
+    name: str
+    description: str = ""
+    parameters: tuple[str, ...] = ()  # Argument names; optional ones end in "?"
+    definition: str = ""  # The tool as the server listed it, as JSON (for the gateway)
+
+    def signature(self) -> str:
+        return f"{self.name}({', '.join(self.parameters)})"
+
+
+@dataclass(slots=True)
+class DeviceCatalog:
+    """What an MCP server said about itself, and when."""
+    endpoint: str  # "ip:port"
+    server_name: str = ""
+    server_version: str = ""
+    protocol_version: str = ""
+    tools: tuple[ToolInfo, ...] = ()
+    listed_at: float = 0.0  # When tools/list last succeeded; 0 if it never did
+    checked_at: float = 0.0  # When the server was last tried
+    error: str = ""  # Why the last try failed
+
+    @property
+    def fingerprint(self) -> tuple[str, str, str]:
+        return self.server_name, self.server_version, self.protocol_version
+
+    def is_fresh(self, now: float, ttl: float = CATALOG_TTL) -> bool:
+        return now - self.checked_at < (min(ttl, RETRY_AFTER) if self.error else ttl)
+
+
+def endpoint_of(device: "Device") -> str:
+    return f"{device.ip}:{device.mcp_port}"
+
+
+# Last loaded catalogs and the stamp of the snapshot they came from
+_loaded: tuple[Optional[tuple], dict[str, DeviceCatalog]] = (None, {})
+
+
+def load_catalogs() -> dict[str, DeviceCatalog]:
+    """Cached catalogs by endpoint (read again only when the file changes)."""
+    global _loaded
+    stamp = snapshot_stamp(CACHE_NAME)
+    if stamp != _loaded[0]:
+        _loaded = (stamp, load_snapshot(CACHE_NAME, CACHE_KEY) or {} if stamp else {})
+    return _loaded[1]
+
+
+def device_tools(devices: Iterable["Device"]) -> tuple[tuple[str, tuple[ToolInfo, ...]], ...]:
+    """(device ID, tools) for each device with a known catalog, from the cache only."""
+    catalogs = load_catalogs()
+    rows = []
+    for device in devices:
+        catalog = catalogs.get(endpoint_of(device))
+        if catalog is not None and catalog.listed_at:
+            rows.append((device.id, catalog.tools))
+    return tuple(rows)
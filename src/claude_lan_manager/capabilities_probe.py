@@ -0,0 +1,149 @@
+"""Refreshing the devices' tool catalogs (see claude_lan_manager.capabilities).
+
+The prober opens an MCP session with every device (`initialize`) and asks
+for its tools (`tools/list`), many devices at once. A catalog is used
+without asking the server for CATALOG_TTL seconds. After that, an
+`initialize` alone revalidates it: as long as the server reports the same
+name, version and protocol version (its fingerprint), the tools are assumed
+unchanged and only listed again once a day. Devices that can't be reached
+keep their last catalog and are retried after RETRY_AFTER seconds.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import replace
+from typing import Iterable, Optional
+
+from claude_lan_manager.cache import store_snapshot
+from claude_lan_manager.capabilities import (
+    CACHE_KEY,
+    CACHE_NAME,
+    CATALOG_TTL,
+    DeviceCatalog,
+    ToolInfo,
+    endpoint_of,
+    load_catalogs,
+)
+from claude_lan_manager.config import Device
+from claude_lan_manager.mcp_client import McpConnection, McpError
+
+# Seconds until tools are listed again even though the server looks the same
+MAX_LIST_AGE = 24 * 3600
+
+PROBE_CONCURRENCY = 64
+PROBE_TIMEOUT = 5.0
+
+# Pages of tools/list followed at most
+MAX_PAGES = 20
+
+# Longest tool description kept, in characters
+MAX_DESCRIPTION = 200
+
+
+def _parse_tool(data: dict) -> Optional[ToolInfo]:
+    if not isinstance(data, dict) or not isinstance(data.get("name"), str):
+        return None
+    description = " ".join(str(data.get("description") or "").split())
+    if len(description) > MAX_DESCRIPTION:
+        description = description[:MAX_DESCRIPTION - 1].rstrip() + "…"
+    schema = data.get("inputSchema") if isinstance(data.get("inputSchema"), dict) else {}
+    properties = schema.get("properties") if isinstance(schema.get("properties"), dict) else {}
+    required = set(schema.get("required") or ())
+    parameters = tuple(name if name in required else f"{name}?" for name in properties)
+    definition = json.dumps(data, separators=(",", ":"), sort_keys=True)
+    return ToolInfo(data["name"], description, parameters, definition)
+
+
+async def _list_tools(connection: McpConnection) -> tuple[ToolInfo, ...]:
+    tools = []
+    cursor = None
+    for _page in range(MAX_PAGES):
+        result = await connection.request("tools/list", {"cursor": cursor} if cursor else {})
+        if not isinstance(result, dict):
+            break
+        tools.extend(tool for tool in map(_parse_tool, result.get("tools") or ()) if tool is not None)
+        cursor = result.get("nextCursor")
+        if not cursor:
+            break
+    return tuple(tools)
+
+
+async def probe_catalog(
+    device: Device,
+    previous: Optional[DeviceCatalog] = None,
+    timeout: float = PROBE_TIMEOUT,
+) -> DeviceCatalog:
+    """Ask a device's server for its catalog, reusing `previous` if the server is unchanged."""
+    endpoint = endpoint_of(device)
+    now = time.time()
+    connection = McpConnection(device.ip, device.mcp_port, timeout=timeout)
+    try:
+        result = await connection.initialize()
+        info = connection.server_info
+        catalog = DeviceCatalog(
+            endpoint,
+            server_name=str(info.get("name", "")),
+            server_version=str(info.get("version", "")),
+            protocol_version=str(result.get("protocolVersion", "")),
+            checked_at=now,
+        )
+        if (
+            previous is not None
+            and previous.listed_at
+            and previous.fingerprint == catalog.fingerprint
+            and now - previous.listed_at < MAX_LIST_AGE
+        ):
+            catalog.tools, catalog.listed_at = previous.tools, previous.listed_at
+        else:
+            catalog.tools, catalog.listed_at = await _list_tools(connection), now
+        return catalog
+    except McpError as e:
+        if previous is not None:
+            return replace(previous, checked_at=now, error=str(e))
+        return DeviceCatalog(endpoint, checked_at=now, error=str(e))
+    finally:
+        await connection.close()
+
+
+async def refresh_catalogs_async(
+    devices: Iterable[Device],
+    ttl: float = CATALOG_TTL,
+    force: bool = False,
+    concurrency: int = PROBE_CONCURRENCY,
+    timeout: float = PROBE_TIMEOUT,
+) -> list[str]:
+    """Probe the devices whose catalogs are stale (all of them with force).
+
+    Returns the endpoints that were probed; the cache is only written if
+    there were any.
+    """
+    catalogs = dict(load_catalogs())
+    now = time.time()
+    stale = {}
+    for device in devices:
+        endpoint = endpoint_of(device)
+        catalog = catalogs.get(endpoint)
+        if force or catalog is None or not catalog.is_fresh(now, ttl):
+            stale.setdefault(endpoint, device)
+    if not stale:
+        return []
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(endpoint: str, device: Device):
+        async with semaphore:
+            previous = None if force else catalogs.get(endpoint)
+            catalogs[endpoint] = await probe_catalog(device, previous, timeout)
+
+    await asyncio.gather(*(probe(endpoint, device) for endpoint, device in stale.items()))
+    # Someone else may have probed other devices meanwhile; keep their results
+    merged = dict(load_catalogs())
+    merged.update((endpoint, catalogs[endpoint]) for endpoint in stale)
+    store_snapshot(CACHE_NAME, CACHE_KEY, merged)
+    return list(stale)
+
+
+def refresh_catalogs(devices: Iterable[Device], **kwargs) -> list[str]:
+    """Blocking refresh_catalogs_async(), for the command line."""
+    return asyncio.run(refresh_catalogs_async(devices, **kwargs))
@@ -2,6 +2,8 @@
 
 import os
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional
@@ -9,8 +11,35 @@ from typing import Optional
 import yaml
 from dotenv import load_dotenv
 
+from claude_lan_manager.cache import load_snapshot, make_key, read_with_fingerprint, store_snapshot
+from claude_lan_manager.capabilities import device_tools
+from claude_lan_manager.inventory import InventoryIndex
+from claude_lan_manager.templates import TEMPLATE_DIR_NAME, render_claude_md
 
-@dataclass
+# Prefer the LibYAML-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Directory of extra config fragments, next to the main config file
+FRAGMENT_DIR_NAME = "config.d"
+
+# .mcp.json server entry of spaces that use the local MCP gateway
+GATEWAY_SERVER_NAME = "lan-gateway"
+
+# Environment variables that influence a loaded configuration
+CONFIG_ENV_VARS = (
+    "CLAUDE_SPACES_PATH",
+    "TERMINAL_EMULATOR",
+    "CLAUDE_CODE_CMD",
+    "XDG_DATA_HOME",
+    "HOME",
+)
+
+
+class ConfigError(ValueError):
+    """Raised when the configuration files are inconsistent."""
+
+
+@dataclass(slots=True)
 class Device:
     """Represents a network device with MCP endpoint."""
     id: str
@@ -27,7 +56,7 @@ class Device:
         return f"http://{self.ip}:{self.mcp_port}/mcp"
 
 
-@dataclass
+@dataclass(slots=True)
 class Space:
     """Represents a Claude Space configuration."""
     id: str
@@ -36,6 +65,8 @@ class Space:
     devices: list[str]  # List of device IDs
     category: str = "individual"
     description: str = ""
+    max_sessions: Optional[int] = None  # Concurrent sessions allowed; None for no limit
+    memory_max: Optional[str] = None  # Memory cap per session, e.g. "4G"; None for no cap
 
     @property
     def claude_md_path(self) -> Path:
@@ -53,6 +84,168 @@ class Space:
         return self.path.exists()
 
 
+@dataclass(slots=True)
+class SessionPoolSettings:
+    """Pre-warmed Claude sessions kept ready in a background tmux server."""
+    size: int = 0  # Ready sessions per warm space; 0 disables the pool
+    idle_timeout: int = 1800  # Seconds a space may go unlaunched before its sessions are dropped
+    frequent: int = 3  # Also keep this many of the most-launched spaces warm
+    pinned: list[str] = field(default_factory=list)  # Space IDs that are always kept warm
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionPoolSettings":
+        unknown = set(data) - {"size", "idle_timeout", "frequent", "pinned"}
+        if unknown:
+            raise ConfigError(f"Unknown session_pool setting(s): {', '.join(sorted(unknown))}")
+        return cls(
+            size=int(data.get("size", 0)),
+            idle_timeout=int(data.get("idle_timeout", 1800)),
+            frequent=int(data.get("frequent", 3)),
+            pinned=list(data.get("pinned") or []),
+        )
+
+
+@dataclass(slots=True)
+class BulkLaunchSettings:
+    """Limits for launching many spaces at once (e.g. a whole category)."""
+    concurrency: int = 4  # Launches in flight at once
+    stagger: float = 0.5  # Minimum seconds between the starts of two launches
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BulkLaunchSettings":
+        unknown = set(data) - {"concurrency", "stagger"}
+        if unknown:
+            raise ConfigError(f"Unknown bulk_launch setting(s): {', '.join(sorted(unknown))}")
+        return cls(
+            concurrency=max(1, int(data.get("concurrency", 4))),
+            stagger=max(0.0, float(data.get("stagger", 0.5))),
+        )
+
+
+@dataclass(slots=True)
+class HealthSettings:
+    """Background reachability checks of every device's MCP endpoint."""
+    enabled: bool = True
+    interval: float = 5.0  # Seconds between checks of a device that answers
+    timeout: float = 1.5  # Seconds a probe may take before the device counts as down
+    concurrency: int = 256  # Probes in flight at once
+    slow: float = 0.5  # Answers slower than this many seconds count as degraded
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HealthSettings":
+        unknown = set(data) - {"enabled", "interval", "timeout", "concurrency", "slow"}
+        if unknown:
+            raise ConfigError(f"Unknown health setting(s): {', '.join(sorted(unknown))}")
+        return cls(
+            enabled=bool(data.get("enabled", True)),
+            interval=max(0.5, float(data.get("interval", 5.0))),
+            timeout=max(0.1, float(data.get("timeout", 1.5))),
+            concurrency=max(1, int(data.get("concurrency", 256))),
+            slow=max(0.0, float(data.get("slow", 0.5))),
+        )
+
+
+@dataclass(slots=True)
+class GatewaySettings:
+    """Local MCP gateway that spaces with several devices reach their devices through (opt-in)."""
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = 8765
+    min_devices: int = 2  # Spaces with at least this many devices use the gateway
+    connections: int = 4  # Kept-alive connections per device, at most
+    idle_timeout: float = 300.0  # Seconds an unused device connection stays open
+    timeout: float = 120.0  # Seconds a tool call may take on a device
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GatewaySettings":
+        unknown = set(data) - {
+            "enabled", "host", "port", "min_devices", "connections", "idle_timeout", "timeout"
+        }
+        if unknown:
+            raise ConfigError(f"Unknown gateway setting(s): {', '.join(sorted(unknown))}")
+        port = int(data.get("port", 8765))
+        if not 0 < port <= 65535:
+            raise ConfigError(f"Invalid gateway port: {port}")
+        return cls(
+            enabled=bool(data.get("enabled", False)),
+            host=str(data.get("host", "127.0.0.1")),
+            port=port,
+            min_devices=max(1, int(data.get("min_devices", 2))),
+            connections=max(1, int(data.get("connections", 4))),
+            idle_timeout=max(1.0, float(data.get("idle_timeout", 300.0))),
+            timeout=max(1.0, float(data.get("timeout", 120.0))),
+        )
+
+    @property
+    def url(self) -> str:
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        return f"http://{host}:{self.port}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """How the gateway reuses the results of one tool."""
+    ttl: float = 0.0  # Seconds a result is reused; 0 never caches it
+    key: Optional[tuple[str, ...]] = None  # Arguments that tell results apart; all of them if None
+    invalidates: tuple[str, ...] = ()  # Tools whose cached results on the device a call drops
+
+    @classmethod
+    def from_dict(cls, tool: str, data: dict) -> "CachePolicy":
+        unknown = set(data) - {"ttl", "key", "invalidates"}
+        if unknown:
+            raise ConfigError(f"Unknown response_cache setting(s) for {tool}: {', '.join(sorted(unknown))}")
+        key = data.get("key")
+        return cls(
+            ttl=max(0.0, float(data.get("ttl") or 0.0)),
+            key=tuple(str(name) for name in key) if key is not None else None,
+            invalidates=tuple(str(name) for name in data.get("invalidates") or ()),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            **({"key": list(self.key)} if self.key is not None else {}),
+            **({"invalidates": list(self.invalidates)} if self.invalidates else {}),
+        }
+
+
+# Policies for the example MCP server's tools. Commands and writes are never
+# cached, and drop what they may have changed.
+DEFAULT_CACHE_POLICIES = {
+    "get_system_info": CachePolicy(ttl=30.0),
+    "read_file": CachePolicy(ttl=10.0, key=("path",)),
+    "write_file": CachePolicy(invalidates=("read_file",)),
+    "run_command": CachePolicy(invalidates=("read_file", "get_system_info")),
+}
+
+
+@dataclass(slots=True)
+class ResponseCacheSettings:
+    """Reuse of tool results by the MCP gateway, per tool."""
+    enabled: bool = True
+    max_bytes: int = 16 * 1024 * 1024  # Budget for cached results; least recently used go first
+    tools: dict[str, CachePolicy] = field(default_factory=lambda: dict(DEFAULT_CACHE_POLICIES))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResponseCacheSettings":
+        unknown = set(data) - {"enabled", "max_bytes", "tools"}
+        if unknown:
+            raise ConfigError(f"Unknown response_cache setting(s): {', '.join(sorted(unknown))}")
+        tools = dict(DEFAULT_CACHE_POLICIES)
+        for tool, policy in (data.get("tools") or {}).items():
+            # A tool listed without settings is never cached
+            tools[str(tool)] = CachePolicy.from_dict(tool, policy or {})
+        return cls(
+            enabled=bool(data.get("enabled", True)),
+            max_bytes=max(0, int(data.get("max_bytes", 16 * 1024 * 1024))),
+            tools=tools,
+        )
+
+
 @dataclass
 class AppConfig:
     """Application configuration."""
@@ -61,6 +254,14 @@ class AppConfig:
     claude_code_cmd: str = "claude"
     devices: dict[str, Device] = field(default_factory=dict)
     spaces: dict[str, Space] = field(default_factory=dict)
+    network: Optional[str] = None  # Network description for CLAUDE.md; derived from device IPs if unset
+    config_path: Optional[Path] = None  # File this config was loaded from, if any
+    session_pool: SessionPoolSettings = field(default_factory=SessionPoolSettings)
+    bulk_launch: BulkLaunchSettings = field(default_factory=BulkLaunchSettings)
+    health: HealthSettings = field(default_factory=HealthSettings)
+    gateway: GatewaySettings = field(default_factory=GatewaySettings)
+    response_cache: ResponseCacheSettings = field(default_factory=ResponseCacheSettings)
+    _index: Optional[InventoryIndex] = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
     def get_default_spaces_path(cls) -> Path:
@@ -70,8 +271,14 @@ class AppConfig:
         return Path(xdg_data) / "claude-lan-manager" / "spaces"
 
     @classmethod
-    def load(cls, config_path: Optional[Path] = None) -> "AppConfig":
-        """Load configuration from file."""
+    def load(cls, config_path: Optional[Path] = None, use_cache: bool = True) -> "AppConfig":
+        """Load configuration from file.
+
+        Parsed configuration is cached as a snapshot keyed on the config
+        file's path, size, mtime and content hash plus the environment it
+        was loaded under. Pass use_cache=False (or set
+        CLAUDE_LAN_MANAGER_NO_CONFIG_CACHE=1) to always re-parse.
+        """
         # Try to find config file
         if config_path is None:
             # Check common locations
@@ -88,6 +295,9 @@ class AppConfig:
         # Load environment variables
         load_dotenv()
 
+        if os.environ.get("CLAUDE_LAN_MANAGER_NO_CONFIG_CACHE"):
+            use_cache = False
+
         # Start with defaults
         spaces_path = Path(os.environ.get(
             "CLAUDE_SPACES_PATH",
@@ -100,20 +310,67 @@ class AppConfig:
             claude_code_cmd=os.environ.get("CLAUDE_CODE_CMD", "claude"),
         )
 
-        # Load from YAML if exists
+        # Load from YAML if exists, plus any config.d/*.yaml fragments next to it
         if config_path and config_path.exists():
-            with open(config_path) as f:
-                data = yaml.safe_load(f) or {}
+            sources = [config_path, *find_fragments(config_path)]
+            read = _map_parallel(read_with_fingerprint, sources)
+            fingerprints = [fingerprint for _raw, fingerprint in read]
+
+            snapshot_name = f"config-{make_key(fingerprints[0][0])[:16]}"
+            snapshot_key = make_key(fingerprints, _env_fingerprint(), _schema_fingerprint())
+            if use_cache:
+                cached = load_snapshot(snapshot_name, snapshot_key)
+                if isinstance(cached, cls):
+                    return cached
+
+            # Fragments are cached individually so an edit only re-parses that file
+            cache_fragments = use_cache and len(sources) > 1
+            documents = _map_parallel(
+                lambda item: _parse_source(*item, use_cache=cache_fragments), read
+            )
+
+            config.config_path = config_path
+            config._apply_documents(list(zip(sources, documents)))
+            config.reindex()
+
+            if use_cache:
+                store_snapshot(snapshot_name, snapshot_key, config)
+
+        return config
 
+    def _apply_documents(self, documents: list[tuple[Path, dict]]) -> None:
+        """Merge parsed YAML documents on top of this configuration.
+
+        Documents are applied in order: settings in later documents override
+        earlier ones, while a device or space ID may only be defined once
+        across all documents.
+        """
+        for _source, data in documents:
             if "spaces_base_path" in data:
-                config.spaces_base_path = Path(os.path.expanduser(data["spaces_base_path"]))
+                self.spaces_base_path = Path(os.path.expanduser(data["spaces_base_path"]))
             if "terminal_emulator" in data:
-                config.terminal_emulator = data["terminal_emulator"]
+                self.terminal_emulator = data["terminal_emulator"]
             if "claude_code_cmd" in data:
-                config.claude_code_cmd = data["claude_code_cmd"]
-
+                self.claude_code_cmd = data["claude_code_cmd"]
+            if "network" in data:
+                self.network = data["network"]
+            if "session_pool" in data:
+                self.session_pool = SessionPoolSettings.from_dict(data["session_pool"] or {})
+            if "bulk_launch" in data:
+                self.bulk_launch = BulkLaunchSettings.from_dict(data["bulk_launch"] or {})
+            if "health" in data:
+                self.health = HealthSettings.from_dict(data["health"] or {})
+            if "gateway" in data:
+                self.gateway = GatewaySettings.from_dict(data["gateway"] or {})
+            if "response_cache" in data:
+                self.response_cache = ResponseCacheSettings.from_dict(data["response_cache"] or {})
+
+        device_sources: dict[str, Path] = {}
+        space_sources: dict[str, Path] = {}
+
+        for source, data in documents:
             # Load devices
-            for dev_data in data.get("devices", []):
+            for dev_data in data.get("devices") or []:
                 device = Device(
                     id=dev_data["id"],
                     name=dev_data["name"],
@@ -123,21 +380,23 @@ class AppConfig:
                     category=dev_data.get("category", "individual"),
                     icon=dev_data.get("icon", "computer"),
                 )
-                config.devices[device.id] = device
+                _check_duplicate("device", device.id, source, device_sources)
+                self.devices[device.id] = device
 
             # Load spaces
-            for space_data in data.get("spaces", []):
+            for space_data in data.get("spaces") or []:
                 space = Space(
                     id=space_data["id"],
                     name=space_data["name"],
-                    path=config.spaces_base_path / space_data["id"],
+                    path=self.spaces_base_path / space_data["id"],
                     devices=space_data.get("devices", []),
                     category=space_data.get("category", "individual"),
                     description=space_data.get("description", ""),
+                    max_sessions=_parse_max_sessions(space_data.get("max_sessions")),
+                    memory_max=_parse_memory_max(space_data.get("memory_max")),
                 )
-                config.spaces[space.id] = space
-
-        return config
+                _check_duplicate("space", space.id, source, space_sources)
+                self.spaces[space.id] = space
 
     def save(self, config_path: Path) -> None:
         """Save configuration to file."""
@@ -147,6 +406,56 @@ class AppConfig:
             "spaces_base_path": str(self.spaces_base_path),
             "terminal_emulator": self.terminal_emulator,
             "claude_code_cmd": self.claude_code_cmd,
+            **({"network": self.network} if self.network else {}),
+            **(
+                {"session_pool": {
+                    "size": self.session_pool.size,
+                    "idle_timeout": self.session_pool.idle_timeout,
+                    "frequent": self.session_pool.frequent,
+                    "pinned": self.session_pool.pinned,
+                }}
+                if self.session_pool.enabled else {}
+            ),
+            **(
+                {"bulk_launch": {
+                    "concurrency": self.bulk_launch.concurrency,
+                    "stagger": self.bulk_launch.stagger,
+                }}
+                if self.bulk_launch != BulkLaunchSettings() else {}
+            ),
+            **(
+                {"health": {
+                    "enabled": self.health.enabled,
+                    "interval": self.health.interval,
+                    "timeout": self.health.timeout,
+                    "concurrency": self.health.concurrency,
+                    "slow": self.health.slow,
+                }}
+                if self.health != HealthSettings() else {}
+            ),
+            **(
+                {"gateway": {
+                    "enabled": self.gateway.enabled,
+                    "host": self.gateway.host,
+                    "port": self.gateway.port,
+                    "min_devices": self.gateway.min_devices,
+                    "connections": self.gateway.connections,
+                    "idle_timeout": self.gateway.idle_timeout,
+                    "timeout": self.gateway.timeout,
+                }}
+                if self.gateway != GatewaySettings() else {}
+            ),
+            **(
+                {"response_cache": {
+                    "enabled": self.response_cache.enabled,
+                    "max_bytes": self.response_cache.max_bytes,
+                    "tools": {
+                        tool: policy.to_dict() for tool, policy in self.response_cache.tools.items()
+                        if DEFAULT_CACHE_POLICIES.get(tool) != policy
+                    },
+                }}
+                if self.response_cache != ResponseCacheSettings() else {}
+            ),
             "devices": [
                 {
                     "id": d.id,
@@ -166,6 +475,8 @@ class AppConfig:
                     "devices": s.devices,
                     "category": s.category,
                     "description": s.description,
+                    **({"max_sessions": s.max_sessions} if s.max_sessions is not None else {}),
+                    **({"memory_max": s.memory_max} if s.memory_max is not None else {}),
                 }
                 for s in self.spaces.values()
             ],
@@ -174,85 +485,191 @@ class AppConfig:
         with open(config_path, "w") as f:
             yaml.dump(data, f, default_flow_style=False, sort_keys=False)
 
+    @property
+    def template_dir(self) -> Optional[Path]:
+        """Directory holding CLAUDE.md template overrides, next to the config file."""
+        if self.config_path is None:
+            return None
+        return self.config_path.parent / TEMPLATE_DIR_NAME
+
+    def render_claude_md(self, space: Space) -> str:
+        """Generate CLAUDE.md for a space using this config's templates, network and the cached tool catalogs."""
+        devices = self.get_devices_for_space(space)
+        return generate_claude_md(
+            space, devices, self.template_dir, self.network, device_tools(devices),
+            gateway=self.gateway_url(space) is not None,
+        )
+
+    def gateway_url(self, space: Space) -> Optional[str]:
+        """URL of the space's endpoint on the local MCP gateway, if the space uses it."""
+        gateway = self.gateway
+        if not gateway.enabled or len(self.get_devices_for_space(space)) < gateway.min_devices:
+            return None
+        return f"{gateway.url}/spaces/{space.id}/mcp"
+
+    def claude_command(self, space: Space) -> str:
+        """Shell command that starts Claude Code restricted to a space's MCP servers.
+
+        --strict-mcp-config: Only use MCP servers from --mcp-config, ignoring all other MCP configurations
+        --mcp-config: Load MCP servers from the space's .mcp.json file
+        """
+        return f'{self.claude_code_cmd} --strict-mcp-config --mcp-config "{space.mcp_json_path}"'
+
+    @property
+    def index(self) -> InventoryIndex:
+        """Lookup index over devices and spaces, built on first use."""
+        if self._index is None:
+            self._index = InventoryIndex.build(self.devices, self.spaces)
+        return self._index
+
+    def reindex(self) -> None:
+        """Rebuild the inventory index after devices or spaces were modified."""
+        self._index = InventoryIndex.build(self.devices, self.spaces)
+
     def get_devices_for_space(self, space: Space) -> list[Device]:
         """Get all Device objects for a space."""
+        resolved = self.index.space_devices.get(space.id)
+        if resolved is not None and self.spaces.get(space.id) is space:
+            return list(resolved)
         return [self.devices[dev_id] for dev_id in space.devices if dev_id in self.devices]
 
+    def get_spaces_for_device(self, device_id: str) -> list[Space]:
+        """Get all spaces that include the given device."""
+        return list(self.index.spaces_by_device.get(device_id, []))
 
-def generate_mcp_json(devices: list[Device]) -> dict:
-    """Generate mcp.json content for given devices.
+    def get_spaces_by_category(self, category: str) -> list[Space]:
+        """Get spaces in a category ("consolidated", "group" or "individual")."""
+        return list(self.index.by_category.get(category, []))
 
-    This creates a configuration that ONLY includes the specified MCPs,
-    ensuring no user-level MCPs bleed through.
+    def find_device(self, ip: str, port: Optional[int] = None) -> Optional[Device]:
+        """Find a device by IP address, optionally narrowed by MCP port."""
+        return self.index.find_device(ip, port)
 
-    Note: Claude Code uses "type": "http" for Streamable HTTP transport,
-    not "streamableHttp" which is the MCP protocol terminology.
-    """
-    mcp_servers = {}
+    def get_dangling_references(self) -> dict[str, list[str]]:
+        """Get device IDs referenced by spaces but not defined, keyed by space ID."""
+        return {space_id: list(dev_ids) for space_id, dev_ids in self.index.dangling.items()}
 
-    for device in devices:
-        server_name = f"{device.id}-mcp"
-        mcp_servers[server_name] = {
-            "type": "http",
-            "url": device.mcp_url,
-        }
 
-    return {"mcpServers": mcp_servers}
+def find_fragments(config_path: Path) -> list[Path]:
+    """Find config.d/*.yaml fragments next to a config file, in merge order."""
+    fragment_dir = config_path.parent / FRAGMENT_DIR_NAME
+    if not fragment_dir.is_dir():
+        return []
+    return sorted(
+        path for path in fragment_dir.iterdir()
+        if path.suffix in (".yaml", ".yml") and not path.name.startswith(".") and path.is_file()
+    )
 
 
-def generate_claude_md(space: Space, devices: list[Device]) -> str:
-    """Generate CLAUDE.md content for a space."""
-    device_list = "\n".join([
-        f"- **{d.name}** ({d.ip}:{d.mcp_port}): {d.description}"
-        for d in devices
-    ])
+def _map_parallel(func, items: list) -> list:
+    """Map over items on a small thread pool (inline for a single item)."""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(8, len(items))) as pool:
+        return list(pool.map(func, items))
 
-    if space.category == "consolidated":
-        role = "LAN Manager"
-        role_desc = "You are the consolidated LAN Manager for the home network."
-    elif space.category == "group":
-        role = f"{space.name}"
-        role_desc = f"You are the {space.name}, responsible for managing a group of related devices."
-    else:
-        device_name = devices[0].name if devices else "Unknown Device"
-        role = f"{device_name} Manager"
-        role_desc = f"You are the dedicated manager for {device_name}."
 
-    return f"""# {role}
+def _parse_source(raw: bytes, fingerprint: tuple, use_cache: bool = False) -> dict:
+    """Parse one YAML source, reusing its cached parse when unchanged."""
+    if use_cache:
+        name = f"fragment-{make_key(fingerprint[0])[:16]}"
+        key = make_key(fingerprint)
+        data = load_snapshot(name, key)
+        if isinstance(data, dict):
+            return data
 
-{role_desc}
+    data = yaml.load(raw, Loader=YamlLoader) or {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"{fingerprint[0]}: expected a mapping at the top level")
 
-## Your Role
+    if use_cache:
+        store_snapshot(name, key, data)
+    return data
 
-You are a systems administration assistant. Your task is to help the user manage and administer the device(s) under your control using the MCP tools available to you.
 
-## Managed Devices
+def parse_size(text) -> int:
+    """Parse a byte size such as 4G, 512M or 1073741824 (binary units)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", str(text), re.IGNORECASE)
+    if match is None:
+        raise ConfigError(f"Invalid size: {text!r} (expected e.g. 512M or 4G)")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit.upper() or " "))
 
-{device_list}
 
-## Available Tools
+def _parse_memory_max(value) -> Optional[str]:
+    if value is None:
+        return None
+    parse_size(value)
+    return str(value)
 
-You have MCP connections to the device(s) listed above. Use these tools to:
-- Execute commands on the target system(s)
-- Read and write files
-- Check system status
-- Perform administrative tasks
 
-## Guidelines
+def _parse_max_sessions(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ConfigError(f"max_sessions must be a positive integer, not {value!r}")
+    return value
 
-1. **Be careful with destructive operations** - Always confirm before deleting files or making irreversible changes
-2. **Log important actions** - Save notes and logs to the `logs/` subfolder
-3. **Stay focused** - Only interact with the devices assigned to you
-4. **Report issues** - If you encounter connectivity problems or errors, inform the user
 
-## Logging
+def _check_duplicate(kind: str, item_id: str, source: Path, seen: dict[str, Path]) -> None:
+    """Reject IDs defined in more than one config file."""
+    previous = seen.get(item_id)
+    if previous is not None and previous != source:
+        raise ConfigError(f"Duplicate {kind} ID '{item_id}' in {source} (already defined in {previous})")
+    seen[item_id] = source
 
-Save any important logs, notes, or documentation to the `logs/` subfolder in this space:
-- `logs/session-YYYY-MM-DD.md` for session notes
-- `logs/changes.md` for tracking configuration changes
-- `logs/issues.md` for recording problems and resolutions
 
-## Network Context
+def _env_fingerprint() -> tuple:
+    """Snapshot of the environment variables a loaded config depends on."""
+    return tuple((name, os.environ.get(name)) for name in CONFIG_ENV_VARS)
 
-All devices are on the local network (10.0.0.0/24). MCP servers use Streamable HTTP transport and are unauthenticated (local network only).
-"""
+
+def _schema_fingerprint() -> tuple:
+    """Identify the code that produced a snapshot, so upgrades invalidate it."""
+    fingerprint = []
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        stat = source.stat()
+        fingerprint.append((source.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def generate_mcp_json(devices: list[Device], gateway_url: Optional[str] = None) -> dict:
+    """Generate mcp.json content for given devices.
+
+    This creates a configuration that ONLY includes the specified MCPs,
+    ensuring no user-level MCPs bleed through. With a gateway URL (see
+    AppConfig.gateway_url) the devices are reached through the local
+    gateway's single endpoint instead of one server entry each.
+
+    Note: Claude Code uses "type": "http" for Streamable HTTP transport,
+    not "streamableHttp" which is the MCP protocol terminology.
+    """
+    if gateway_url is not None:
+        return {"mcpServers": {GATEWAY_SERVER_NAME: {"type": "http", "url": gateway_url}}}
+
+    mcp_servers = {}
+
+    for device in devices:
+        server_name = f"{device.id}-mcp"
+        mcp_servers[server_name] = {
+            "type": "http",
+            "url": device.mcp_url,
+        }
+
+    return {"mcpServers": mcp_servers}
+
+
+def generate_claude_md(
+    space: Space,
+    devices: list[Device],
+    template_dir: Optional[Path] = None,
+    network: Optional[str] = None,
+    tools: tuple = (),
+    gateway: bool = False,
+) -> str:
+    """Generate CLAUDE.md content for a space.
+
+    See claude_lan_manager.templates for the template variables and how to
+    override the per-category templates.
+    """
+    return render_claude_md(space, devices, template_dir, network, tools, gateway)
@@ -0,0 +1,95 @@
+"""Qt integration for config hot-reload.
+
+Watches the active config file, its config.d fragments and its CLAUDE.md
+templates through inotify (driven by a QSocketNotifier, so no polling and
+no extra thread), reloads the configuration, regenerates only the affected
+spaces and tells the windows what changed.
+"""
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QSocketNotifier, QTimer, pyqtSignal
+
+from claude_lan_manager import inotify
+from claude_lan_manager.config import FRAGMENT_DIR_NAME, AppConfig
+from claude_lan_manager.reload import ConfigWatchSet, apply_diff, diff_configs, template_keys
+from claude_lan_manager.templates import TEMPLATE_DIR_NAME
+
+
+class ConfigWatcher(QObject):
+    """Reloads the configuration when its file changes.
+
+    Emits reloaded(new_config, diff) after affected spaces were regenerated,
+    and failed(message) when the new file could not be loaded.
+    """
+
+    reloaded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, config: AppConfig, use_cache: bool = True, debounce_ms: int = 200, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self._templates = template_keys(config)
+        self._use_cache = use_cache
+        self._inotify = None
+        self._notifier = None
+        self._fs_watcher = None
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._reload)
+
+        if config.config_path is not None:
+            self._start(config.config_path.resolve())
+
+    def _start(self, config_path):
+        self._config_path = config_path
+        if inotify.is_available():
+            self._inotify = inotify.Inotify()
+            self._watch_set = ConfigWatchSet(self._inotify, config_path)
+            self._notifier = QSocketNotifier(self._inotify.fileno(), QSocketNotifier.Type.Read, self)
+            self._notifier.activated.connect(self._on_inotify)
+        else:
+            # Non-Linux fallback
+            paths = [str(config_path), str(config_path.parent)]
+            for name in (FRAGMENT_DIR_NAME, TEMPLATE_DIR_NAME):
+                if (config_path.parent / name).is_dir():
+                    paths.append(str(config_path.parent / name))
+            self._fs_watcher = QFileSystemWatcher(paths, self)
+            self._fs_watcher.fileChanged.connect(lambda _path: self._debounce.start())
+            self._fs_watcher.directoryChanged.connect(lambda _path: self._debounce.start())
+
+    def _on_inotify(self, *_args):
+        if self._watch_set.is_relevant(self._inotify.read_events()):
+            self._debounce.start()
+
+    def _reload(self):
+        if not self._config_path.exists():
+            return
+        if self._fs_watcher is not None and str(self._config_path) not in self._fs_watcher.files():
+            # Replaced by rename; re-add so further edits are seen
+            self._fs_watcher.addPath(str(self._config_path))
+
+        try:
+            new_config = AppConfig.load(self._config_path, use_cache=self._use_cache)
+        except Exception as e:
+            self.failed.emit(f"Config reload failed: {e}")
+            return
+
+        diff = diff_configs(self.config, new_config, self._templates)
+        self.config, self._templates = new_config, template_keys(new_config)
+        if diff.is_empty():
+            return
+
+        try:
+            apply_diff(new_config, diff)
+        except OSError as e:
+            self.failed.emit(f"Regenerating spaces failed: {e}")
+        self.reloaded.emit(new_config, diff)
+
+    def close(self):
+        """Stop watching."""
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,223 @@
+"""Discovery of MCP servers on the local network.
+
+`claude-lan-manager-setup discover` scans every address of a network on a
+few ports. A TCP connect rules out the (many) closed or unused addresses
+within the connect timeout; where something listens, an MCP `initialize`
+POST to /mcp confirms it's an MCP server and tells us its name and version.
+Up to `concurrency` probes are in flight at once, so a /24 on three ports
+takes about as long as a couple of connect timeouts.
+
+Results, including the addresses where nothing answered, are cached for
+`ttl` seconds: scanning the same network again only probes what's stale.
+Found servers are turned into `devices:` and `spaces:` entries that can be
+merged into config.yaml or dropped into config.d/ as they are.
+"""
+
+import asyncio
+import ipaddress
+import re
+import resource
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from claude_lan_manager.cache import load_snapshot, make_key, store_snapshot
+from claude_lan_manager.config import AppConfig
+from claude_lan_manager.mcp_client import McpConnection, McpError
+
+DEFAULT_PORTS = (3000, 3001, 8000)
+DEFAULT_CONCURRENCY = 512
+CONNECT_TIMEOUT = 1.0  # Seconds until an address counts as having nothing on a port
+INITIALIZE_TIMEOUT = 3.0  # Seconds an open port has to answer initialize
+CACHE_TTL = 600
+
+# Largest network scanned (a /16)
+MAX_ADDRESSES = 65536
+
+# File descriptors left for everything but the probes
+RESERVED_FDS = 64
+
+CACHE_NAME = "discovery"
+CACHE_KEY = make_key(CACHE_NAME, 1)
+
+
+@dataclass(slots=True)
+class DiscoveredServer:
+    """An MCP server that answered initialize."""
+    ip: str
+    port: int
+    name: str = ""  # serverInfo.name
+    version: str = ""  # serverInfo.version
+    protocol_version: str = ""
+
+    @property
+    def mcp_url(self) -> str:
+        return f"http://{self.ip}:{self.port}/mcp"
+
+
+@dataclass
+class ScanResult:
+    servers: list[DiscoveredServer]
+    probed: int  # Endpoints probed on the network
+    cached: int  # Endpoints whose cached result was still fresh
+    seconds: float
+
+
+def parse_ports(text: str) -> list[int]:
+    """Parse "3000,8000-8002" into ports."""
+    ports = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        start, end = int(first), int(last or first)
+        if not 0 < start <= end <= 65535:
+            raise ValueError(f"Invalid port range: {part}")
+        ports.extend(range(start, end + 1))
+    return sorted(set(ports))
+
+
+def network_hosts(cidr: str) -> list[str]:
+    """Addresses to scan in a network such as 10.0.0.0/24 (a single address is fine too)."""
+    network = ipaddress.ip_network(cidr, strict=False)
+    if network.num_addresses > MAX_ADDRESSES:
+        raise ValueError(f"{cidr} has {network.num_addresses} addresses; scan at most a /16 at a time")
+    return [str(address) for address in network.hosts()]
+
+
+def _max_concurrency(requested: int) -> int:
+    """Don't run out of file descriptors: each probe holds a socket."""
+    soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - RESERVED_FDS))
+
+
+async def probe_endpoint(
+    ip: str,
+    port: int,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    timeout: float = INITIALIZE_TIMEOUT,
+) -> Optional[DiscoveredServer]:
+    """Check whether an MCP server listens on ip:port; None if not."""
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), connect_timeout)
+    except (OSError, TimeoutError):
+        return None
+    writer.close()
+
+    connection = McpConnection(ip, port, timeout=timeout)
+    try:
+        result = await connection.initialize()
+    except McpError:
+        return None
+    finally:
+        await connection.close()
+    info = connection.server_info
+    return DiscoveredServer(
+        ip, port,
+        name=str(info.get("name", "")),
+        version=str(info.get("version", "")),
+        protocol_version=str(result.get("protocolVersion", "")),
+    )
+
+
+async def scan_endpoints(
+    endpoints: list[tuple[str, int]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    timeout: float = INITIALIZE_TIMEOUT,
+) -> dict[tuple[str, int], Optional[DiscoveredServer]]:
+    """Probe endpoints, at most `concurrency` at a time."""
+    results: dict[tuple[str, int], Optional[DiscoveredServer]] = {}
+    pending = iter(endpoints)
+
+    async def worker():
+        # Workers share one iterator, so only `concurrency` probes ever exist
+        for ip, port in pending:
+            results[ip, port] = await probe_endpoint(ip, port, connect_timeout, timeout)
+
+    workers = min(_max_concurrency(concurrency), len(endpoints))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
+
+
+def discover(
+    hosts: Iterable[str],
+    ports: Iterable[int],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    timeout: float = INITIALIZE_TIMEOUT,
+    ttl: float = CACHE_TTL,
+) -> ScanResult:
+    """Find the MCP servers on the given hosts and ports (ttl=0 ignores the cache)."""
+    start = time.perf_counter()
+    now = time.time()
+    endpoints = [(host, port) for host in hosts for port in ports]
+
+    # {(ip, port): (checked_at, server or None)}
+    cache = load_snapshot(CACHE_NAME, CACHE_KEY) or {}
+    stale = [
+        endpoint for endpoint in endpoints
+        if endpoint not in cache or now - cache[endpoint][0] >= ttl
+    ]
+    if stale:
+        results = asyncio.run(scan_endpoints(stale, concurrency, connect_timeout, timeout))
+        cache.update((endpoint, (now, server)) for endpoint, server in results.items())
+        store_snapshot(CACHE_NAME, CACHE_KEY, {
+            endpoint: entry for endpoint, entry in cache.items()
+            if now - entry[0] < max(ttl, CACHE_TTL)
+        })
+
+    servers = [cache[endpoint][1] for endpoint in endpoints if cache[endpoint][1] is not None]
+    return ScanResult(servers, len(stale), len(endpoints) - len(stale), time.perf_counter() - start)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def suggest_config(servers: list[DiscoveredServer], config: Optional[AppConfig] = None) -> dict:
+    """Device and individual space entries for servers not configured yet.
+
+    Devices are named after the server (the example server calls itself
+    "<hostname>-mcp"), falling back to the address; IDs never clash with
+    the configuration's.
+    """
+    device_ids = set(config.devices) if config is not None else set()
+    space_ids = set(config.spaces) if config is not None else set()
+    known = {(d.ip, d.mcp_port) for d in config.devices.values()} if config is not None else set()
+
+    def unique(base: str, taken: set) -> str:
+        candidate, n = base, 2
+        while candidate in taken:
+            candidate, n = f"{base}-{n}", n + 1
+        taken.add(candidate)
+        return candidate
+
+    devices, spaces = [], []
+    for server in servers:
+        if (server.ip, server.port) in known:
+            continue
+        hostname = _slug(server.name.removesuffix("-mcp")) if server.name else ""
+        device_id = unique(hostname or f"host-{_slug(server.ip)}", device_ids)
+        name = hostname.replace("-", " ").title() if hostname else server.ip
+        description = f"Discovered {server.name or 'MCP server'}"
+        if server.version:
+            description += f" {server.version}"
+        devices.append({
+            "id": device_id,
+            "name": name,
+            "ip": server.ip,
+            "mcp_port": server.port,
+            "description": description,
+        })
+        spaces.append({
+            "id": unique(f"{device_id}-manager", space_ids),
+            "name": f"{name} Manager",
+            "devices": [device_id],
+            "category": "individual",
+            "description": f"Manage {name} ({server.ip})",
+        })
+    return {"devices": devices, "spaces": spaces}
@@ -0,0 +1,575 @@
+"""Local MCP gateway: one endpoint per space in front of its devices' servers.
+
+Claude opens one MCP connection per `.mcp.json` entry and handshakes with
+every one of them before it starts, so a consolidated space with dozens of
+devices used to mean dozens of connections, and a dead device held up the
+whole start. Spaces with `gateway.min_devices` or more devices get a single
+entry instead, pointing at this process (`claude-lan-manager-gateway`),
+which serves every space at
+
+    http://127.0.0.1:8765/spaces/<space id>/mcp
+
+over Streamable HTTP (JSON responses, plus a GET event stream for
+notifications). The space's tools are listed as `<device id>__<tool>`
+straight from the cached tool catalogs (see claude_lan_manager.capabilities),
+so listing them doesn't touch the devices unless a device's tools were never
+listed. Such a device gets LIST_TIMEOUT seconds to answer; if it answers
+later, clients are sent `notifications/tools/list_changed` and list the
+tools again. A device is only connected to
+when one of its tools is first called; its MCP sessions are then kept alive
+in a small pool, `gateway.connections` per device, and closed after
+`gateway.idle_timeout` seconds unused. Results of tools such as
+`get_system_info` and `read_file` are reused for a while (see
+claude_lan_manager.response_cache); `claude-lan-manager-gateway --stats`
+shows how often.
+
+The gateway picks up config changes by itself: it checks the config files'
+mtimes and loads them again on a worker thread when they change. Launching
+a space that uses it starts it if it isn't running (see
+claude_lan_manager.launcher).
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from claude_lan_manager import __version__
+from claude_lan_manager.capabilities import GATEWAY_TOOL_SEPARATOR, ToolInfo, endpoint_of, load_catalogs
+from claude_lan_manager.capabilities_probe import refresh_catalogs_async
+from claude_lan_manager.config import FRAGMENT_DIR_NAME, AppConfig, Device, GatewaySettings, Space, find_fragments
+from claude_lan_manager.mcp_client import McpConnection, McpError, read_body, read_headers
+from claude_lan_manager.response_cache import ResponseCache
+
+# Between the device ID and the tool name in the gateway's tool names (CLAUDE.md uses them too)
+TOOL_SEPARATOR = GATEWAY_TOOL_SEPARATOR
+
+# Oldest first; the newest is offered to clients asking for something else
+PROTOCOL_VERSIONS = ("2024-11-05", "2025-03-26", "2025-06-18")
+SERVER_INFO = {"name": "claude-lan-manager-gateway", "version": __version__}
+
+# Seconds tools/list waits for devices whose tools were never listed
+LIST_TIMEOUT = 3.0
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_PING_INTERVAL = 30.0
+
+LIST_CHANGED = {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}
+
+# Seconds a device has to open an MCP session
+INITIALIZE_TIMEOUT = 5.0
+
+# Seconds calls to a device fail right away after it couldn't be reached
+DOWN_FOR = 10.0
+
+# Seconds between checks whether the config files changed, and between closing idle connections
+RELOAD_INTERVAL = 2.0
+REAP_INTERVAL = 30.0
+
+# Browsers may only reach the gateway from local pages (no DNS rebinding)
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+SPACE_PATH = re.compile(r"^/spaces/([^/]+)/mcp/?$")
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+class RpcError(Exception):
+    """A request the gateway answers with a JSON-RPC error."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class BackendPool:
+    """Kept-alive MCP sessions with the devices, opened on first use."""
+
+    def __init__(self, settings: GatewaySettings):
+        self.settings = settings
+        self._idle: dict[str, list[tuple[float, McpConnection]]] = {}  # Most recently used last
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._down: dict[str, tuple[float, str]] = {}  # endpoint -> (until, why)
+
+    async def request(self, device: Device, method: str, params: Optional[dict] = None) -> Any:
+        """Send a request to a device over a pooled session; raises McpError."""
+        endpoint = endpoint_of(device)
+        down = self._down.get(endpoint)
+        if down is not None and time.monotonic() < down[0]:
+            raise McpError(down[1])
+
+        slots = self._slots.get(endpoint)
+        if slots is None:
+            slots = self._slots[endpoint] = asyncio.Semaphore(self.settings.connections)
+        async with slots:
+            idle = self._idle.setdefault(endpoint, [])
+            if idle:
+                connection = idle.pop()[1]
+            else:
+                connection = McpConnection(device.ip, device.mcp_port, timeout=INITIALIZE_TIMEOUT)
+                try:
+                    await connection.initialize()
+                except McpError as e:
+                    await connection.close()
+                    if e.code is None:
+                        self._down[endpoint] = (time.monotonic() + DOWN_FOR, str(e))
+                    raise
+                self._down.pop(endpoint, None)
+
+            try:
+                result = await self._request(connection, method, params)
+            except McpError as e:
+                if e.code is None:
+                    # Transport or session trouble: don't hand this connection out again
+                    await connection.close()
+                    raise
+                idle.append((time.monotonic(), connection))
+                raise
+            idle.append((time.monotonic(), connection))
+            return result
+
+    async def _request(self, connection: McpConnection, method: str, params: Optional[dict]) -> Any:
+        connection.timeout = self.settings.timeout
+        try:
+            return await connection.request(method, params)
+        except McpError:
+            if connection.initialized:
+                raise
+        # The device restarted and forgot our session: open a new one and try
+        # again, once. The request was refused, not run, so that's safe.
+        connection.timeout = INITIALIZE_TIMEOUT
+        await connection.initialize()
+        connection.timeout = self.settings.timeout
+        return await connection.request(method, params)
+
+    async def reap(self, max_idle: Optional[float] = None) -> int:
+        """Close connections unused for `max_idle` seconds (idle_timeout by default)."""
+        max_idle = self.settings.idle_timeout if max_idle is None else max_idle
+        cutoff = time.monotonic() - max_idle
+        expired = []
+        for idle in self._idle.values():
+            expired.extend(connection for used_at, connection in idle if used_at <= cutoff)
+            idle[:] = [(used_at, connection) for used_at, connection in idle if used_at > cutoff]
+        await asyncio.gather(*(connection.close() for connection in expired))
+        return len(expired)
+
+    def open_connections(self) -> int:
+        return sum(len(idle) for idle in self._idle.values())
+
+
+def _config_stamp(config_path: Optional[Path]) -> tuple:
+    """Sizes and mtimes of a config file, its config.d directory and fragments."""
+    if config_path is None:
+        return ()
+    stamp = []
+    for path in (config_path, config_path.parent / FRAGMENT_DIR_NAME, *find_fragments(config_path)):
+        try:
+            st = path.stat()
+        except OSError:
+            stamp.append((str(path), None))
+        else:
+            stamp.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+@lru_cache(maxsize=65536)
+def _gateway_tool(device_id: str, device_name: str, tool: ToolInfo) -> dict:
+    """A device's tool as the gateway lists it (not to be modified)."""
+    definition = json.loads(tool.definition) if tool.definition else {
+        "name": tool.name, "description": tool.description, "inputSchema": {"type": "object"},
+    }
+    definition["name"] = f"{device_id}{TOOL_SEPARATOR}{tool.name}"
+    definition["description"] = f"[{device_name}] {definition.get('description') or tool.name}"
+    return definition
+
+
+class Gateway:
+    """Serves every space of a configuration, reloading it when it changes."""
+
+    def __init__(self, config: AppConfig):
+        self.config = config
+        self.pool = BackendPool(config.gateway)
+        self.cache = ResponseCache(config.response_cache)
+        self._checked_config = time.monotonic()
+        self._config_stamp = _config_stamp(config.config_path)
+        self._refresh: Optional[asyncio.Task] = None
+        self._late_probes: dict[frozenset[str], asyncio.Future] = {}  # endpoints -> probe
+        self._announcing: set[frozenset[str]] = set()  # late probes whose result will be announced
+        self._streams: dict[str, set[asyncio.Queue]] = {}  # space ID -> open event streams
+
+    async def current_config(self) -> AppConfig:
+        """The configuration, loaded again (off the event loop) when its files changed."""
+        if time.monotonic() - self._checked_config < RELOAD_INTERVAL:
+            return self.config
+        self._checked_config = time.monotonic()
+        stamp = _config_stamp(self.config.config_path)
+        if stamp == self._config_stamp:
+            return self.config
+        self._config_stamp = stamp
+        try:
+            self.config = await asyncio.to_thread(AppConfig.load, self.config.config_path)
+        except Exception as e:
+            print(f"Config error, keeping the previous config: {e}", file=sys.stderr)
+        self.pool.settings = self.config.gateway
+        self.cache.configure(self.config.response_cache)
+        return self.config
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one client connection until it closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _version = request_line.decode("latin-1").split(None, 2)
+                headers = await read_headers(reader)
+                body = await read_body(reader, headers, until_eof=False)
+                if method == "GET" and "text/event-stream" in headers.get("accept", ""):
+                    # Holds the connection until the client goes away
+                    await self.stream_events(target, headers, reader, writer)
+                    break
+                status, extra_headers, payload = await self.handle(method, target, headers, body)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                lines = [
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                    f"Content-Length: {len(payload)}",
+                    *(f"{name}: {value}" for name, value in extra_headers.items()),
+                ]
+                if payload:
+                    lines.append("Content-Type: application/json")
+                if not keep_alive:
+                    lines.append("Connection: close")
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (OSError, EOFError, ValueError, McpError):
+            pass  # Client went away or didn't speak HTTP
+        finally:
+            writer.close()
+
+    async def handle(self, method: str, target: str, headers: dict, body: bytes) -> tuple[int, dict, bytes]:
+        """Answer one HTTP request: (status, headers, body)."""
+        path = urlsplit(target).path
+        if path == "/health" and method == "GET":
+            config = await self.current_config()
+            return 200, {}, json.dumps({
+                "status": "ok",
+                "config": str(config.config_path) if config.config_path else None,
+                "connections": self.pool.open_connections(),
+                "cache": self.cache.stats(),
+            }).encode()
+
+        match = SPACE_PATH.match(path)
+        if match is None:
+            return 404, {}, b""
+        origin = headers.get("origin")
+        if origin and urlsplit(origin).hostname not in LOCAL_HOSTS:
+            return 403, {}, b""
+        space = (await self.current_config()).spaces.get(match.group(1))
+        if space is None:
+            return 404, {}, b""
+
+        if method == "DELETE":
+            return 200, {}, b""  # Sessions hold no state here
+        if method != "POST":
+            # A GET only makes sense as an event stream (see stream_events())
+            return 405, {"Allow": "POST, DELETE"}, b""
+
+        try:
+            messages = json.loads(body)
+        except ValueError:
+            return 400, {}, json.dumps(_error(None, PARSE_ERROR, "Parse error")).encode()
+        batch = isinstance(messages, list)
+        replies = await asyncio.gather(*(
+            self.dispatch(space, message) for message in (messages if batch else [messages])
+        ))
+        replies = [reply for reply in replies if reply is not None]
+        if not replies:
+            return 202, {}, b""  # Only notifications (or responses)
+
+        extra_headers = {}
+        if not batch and isinstance(messages, dict) and messages.get("method") == "initialize":
+            extra_headers["Mcp-Session-Id"] = uuid.uuid4().hex
+        return 200, extra_headers, json.dumps(replies if batch else replies[0]).encode()
+
+    async def stream_events(
+        self, target: str, headers: dict, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Send a space's notifications as server-sent events until the client leaves."""
+        match = SPACE_PATH.match(urlsplit(target).path)
+        origin = headers.get("origin")
+        space = (await self.current_config()).spaces.get(match.group(1)) if match else None
+        if space is None or (origin and urlsplit(origin).hostname not in LOCAL_HOSTS):
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+        )
+        await writer.drain()
+        queue: asyncio.Queue = asyncio.Queue()
+        streams = self._streams.setdefault(space.id, set())
+        streams.add(queue)
+        # The client sends nothing more on this connection; reading ends when it hangs up
+        closed = asyncio.ensure_future(reader.read(1))
+        try:
+            while not closed.done():
+                get = asyncio.ensure_future(queue.get())
+                await asyncio.wait((get, closed), timeout=STREAM_PING_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+                if get.done():
+                    writer.write(f"event: message\ndata: {json.dumps(get.result())}\n\n".encode())
+                elif closed.done():
+                    get.cancel()
+                    break
+                else:
+                    get.cancel()
+                    writer.write(b": ping\n\n")
+                await writer.drain()
+        finally:
+            closed.cancel()
+            streams.discard(queue)
+            if not streams:
+                self._streams.pop(space.id, None)
+
+    def notify(self, space_ids: set[str], message: dict) -> None:
+        """Send a notification to the open event streams of some spaces."""
+        for space_id in space_ids:
+            for queue in self._streams.get(space_id, ()):
+                queue.put_nowait(message)
+
+    async def dispatch(self, space: Space, message: Any) -> Optional[dict]:
+        """Handle one JSON-RPC message; the reply, or None for notifications."""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0":
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        if "method" not in message:
+            return None  # A response; the gateway never asks the client anything
+        notification = "id" not in message
+        params = message.get("params")
+        try:
+            result = await self._call(space, message["method"], params if isinstance(params, dict) else {})
+        except RpcError as e:
+            return None if notification else _error(message["id"], e.code, str(e), e.data)
+        if notification:
+            return None
+        return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+    async def _call(self, space: Space, method: str, params: dict) -> Any:
+        if method == "initialize":
+            requested = params.get("protocolVersion")
+            return {
+                "protocolVersion": requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[-1],
+                "capabilities": {"tools": {"listChanged": True}},
+                "serverInfo": SERVER_INFO,
+                "instructions": (
+                    f"Tools of the devices in {space.name}, named "
+                    f"<device id>{TOOL_SEPARATOR}<tool>."
+                ),
+            }
+        if method == "ping" or method.startswith("notifications/"):
+            return {}
+        if method == "tools/list":
+            return {"tools": await self.list_tools(space)}
+        if method == "tools/call":
+            return await self.call_tool(space, params)
+        raise RpcError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    async def list_tools(self, space: Space) -> list[dict]:
+        """The space's tools, from the catalogs; only devices never listed are asked.
+
+        Devices that answer after LIST_TIMEOUT are announced with a
+        list_changed notification to the spaces that have them.
+        """
+        # handle() brought the config up to date for this request
+        devices = self.config.get_devices_for_space(space)
+        catalogs = load_catalogs()
+        missing = [device for device in devices if endpoint_of(device) not in catalogs]
+        if missing:
+            endpoints = frozenset(map(endpoint_of, missing))
+            probe = self._late_probes.get(endpoints)
+            if probe is None:
+                probe = self._late_probes[endpoints] = asyncio.ensure_future(refresh_catalogs_async(missing))
+                probe.add_done_callback(lambda _probe: self._late_probes.pop(endpoints, None))
+            try:
+                # Keeps going in the background if it takes longer than the client should wait
+                await asyncio.wait_for(asyncio.shield(probe), LIST_TIMEOUT)
+            except TimeoutError:
+                if endpoints not in self._announcing:
+                    self._announcing.add(endpoints)
+                    probe.add_done_callback(lambda _probe: self._announce(endpoints))
+            catalogs = load_catalogs()
+        if self._refresh is None or self._refresh.done():
+            # Stale catalogs are served as they are and refreshed for next time
+            self._refresh = asyncio.ensure_future(refresh_catalogs_async(devices))
+
+        tools = []
+        for device in devices:
+            catalog = catalogs.get(endpoint_of(device))
+            if catalog is not None and catalog.listed_at:
+                tools.extend(_gateway_tool(device.id, device.name, tool) for tool in catalog.tools)
+        return tools
+
+    def _announce(self, endpoints: frozenset[str]) -> None:
+        """Tell the spaces of devices listed late that their tools changed."""
+        self._announcing.discard(endpoints)
+        catalogs = load_catalogs()
+        if not any(catalogs.get(endpoint) is not None and catalogs[endpoint].listed_at for endpoint in endpoints):
+            return  # Nothing new to list
+        config = self.config
+        space_ids = {
+            space.id for space in config.spaces.values()
+            if any(endpoint_of(device) in endpoints for device in config.get_devices_for_space(space))
+        }
+        self.notify(space_ids, LIST_CHANGED)
+
+    async def call_tool(self, space: Space, params: dict) -> dict:
+        name = params.get("name")
+        if not isinstance(name, str):
+            raise RpcError(INVALID_PARAMS, "Missing tool name")
+        device, tool = self._resolve_tool(space, name)
+        arguments = params.get("arguments")
+        arguments = arguments if isinstance(arguments, dict) else {}
+        endpoint = endpoint_of(device)
+        cached = self.cache.lookup(endpoint, tool, arguments)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.begin(endpoint, tool, arguments)
+        try:
+            result = await self.pool.request(device, "tools/call", {"name": tool, "arguments": arguments})
+        except McpError as e:
+            # A write that failed half way may still have changed something
+            self.cache.finish(endpoint, tool, arguments, {"isError": True}, generation)
+            if e.code is not None:
+                raise RpcError(e.code, str(e), e.data) from None
+            # A tool error, so Claude sees why rather than a failed request
+            return {
+                "content": [{"type": "text", "text": f"{device.name} ({endpoint}): {e}"}],
+                "isError": True,
+            }
+        if isinstance(result, dict):
+            self.cache.finish(endpoint, tool, arguments, result, generation)
+        return result
+
+    def _resolve_tool(self, space: Space, name: str) -> tuple[Device, str]:
+        """Split "<device id>__<tool>" (device IDs may contain the separator too)."""
+        devices = self.config.devices
+        start = 0
+        while (position := name.find(TOOL_SEPARATOR, start)) > 0:
+            device_id, tool = name[:position], name[position + len(TOOL_SEPARATOR):]
+            if tool and device_id in devices and device_id in space.devices:
+                return devices[device_id], tool
+            start = position + 1
+        raise RpcError(INVALID_PARAMS, f"Unknown tool: {name}")
+
+
+def _error(message_id: Any, code: int, message: str, data: Any = None) -> dict:
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": message_id, "error": error}
+
+
+async def serve(gateway: Gateway, host: str, port: int) -> None:
+    server = await asyncio.start_server(gateway.handle_connection, host, port)
+    url = GatewaySettings(host=host, port=port).url
+    print(f"Gateway for {len(gateway.config.spaces)} spaces at {url}/spaces/<space id>/mcp", file=sys.stderr)
+
+    async def reap():
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            await gateway.pool.reap()
+
+    reaper = asyncio.ensure_future(reap())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        reaper.cancel()
+        await gateway.pool.reap(max_idle=0)
+
+
+def print_stats(settings: GatewaySettings) -> int:
+    """Print what a running gateway reports on /health."""
+    from urllib.error import URLError
+    from urllib.request import urlopen
+
+    try:
+        with urlopen(f"{settings.url}/health", timeout=5) as response:
+            health = json.load(response)
+    except (URLError, OSError, ValueError) as e:
+        print(f"No gateway at {settings.url}: {e}", file=sys.stderr)
+        return 1
+    cache = health["cache"]
+    lookups = cache["hits"] + cache["misses"]
+    print(f"Gateway at {settings.url} ({health['config'] or 'no config file'})")
+    print(f"  Device connections open: {health['connections']}")
+    print(
+        f"  Response cache: {cache['entries']} results, "
+        f"{cache['bytes'] / 1024:.0f} of {cache['max_bytes'] / 1024:.0f} KiB"
+    )
+    print(
+        f"  Hits: {cache['hits']}/{lookups}"
+        + (f" ({cache['hits'] / lookups:.0%})" if lookups else "")
+        + f", evictions: {cache['evictions']}, invalidations: {cache['invalidations']}"
+    )
+    for tool, counts in sorted(cache["tools"].items()):
+        print(f"    {tool:<24} {counts['hits']} hits, {counts['misses']} misses")
+    return 0
+
+
+def main() -> int:
+    """Entry point of claude-lan-manager-gateway."""
+    parser = argparse.ArgumentParser(description="Local MCP gateway for Claude LAN Manager spaces")
+    parser.add_argument("--config", "-c", type=Path, help="Path to config file")
+    parser.add_argument("--host", help="Address to listen on (default: gateway.host)")
+    parser.add_argument("--port", type=int, help="Port to listen on (default: gateway.port)")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the running gateway's connection and response cache counters, then exit",
+    )
+    args = parser.parse_args()
+
+    config = AppConfig.load(args.config)
+    if args.stats:
+        return print_stats(GatewaySettings(
+            host=args.host or config.gateway.host, port=args.port or config.gateway.port
+        ))
+    gateway = Gateway(config)
+    try:
+        asyncio.run(serve(gateway, args.host or config.gateway.host, args.port or config.gateway.port))
+    except OSError as e:
+        print(f"Error: can't listen: {e.strerror or e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
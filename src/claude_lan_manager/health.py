@@ -0,0 +1,65 @@
+"""Health of the devices' MCP endpoints, as shown by the GUIs.
+
+A device is:
+
+- online: its MCP server answered, in less than `health.slow` seconds
+- degraded: it took the connection but answered slowly, with a server
+  error, with something that isn't HTTP, or not at all within the timeout
+- offline: the connection was refused, unreachable or timed out
+
+The probes themselves are in claude_lan_manager.health_probe.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+STATE_UNKNOWN = "unknown"
+STATE_ONLINE = "online"
+STATE_DEGRADED = "degraded"
+STATE_OFFLINE = "offline"
+
+
+@dataclass(slots=True)
+class DeviceHealth:
+    """Outcome of a device's latest probe."""
+    state: str = STATE_UNKNOWN
+    latency: Optional[float] = None  # Seconds until the device answered, if it did
+    error: str = ""  # Why the device isn't online
+    checked_at: float = 0.0  # time.time() of the probe
+    failures: int = 0  # Probes in a row that got no answer
+    next_check: float = 0.0  # time.monotonic() when the device is due again
+
+    def describe(self) -> str:
+        if self.state == STATE_UNKNOWN:
+            return "not checked yet"
+        text = self.state
+        if self.latency is not None:
+            text += f" · {format_latency(self.latency)}"
+        if self.error:
+            text += f" ({self.error})"
+        return text
+
+
+def format_latency(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms" if seconds < 10 else f"{seconds:.0f} s"
+
+
+def summarize_health(health: dict[str, DeviceHealth], device_ids: list[str]) -> Optional[tuple]:
+    """Collapse a space's device health into (state, slowest latency, devices not online).
+
+    The state is online when every checked device is, offline when none
+    answers and degraded in between; None until a device has been checked.
+    """
+    states = [health[device_id] for device_id in device_ids if device_id in health]
+    checked = [h for h in states if h.state != STATE_UNKNOWN]
+    if not checked:
+        return None
+    down = sum(h.state != STATE_ONLINE for h in checked)
+    if down == 0:
+        state = STATE_ONLINE
+    elif all(h.state == STATE_OFFLINE for h in checked):
+        state = STATE_OFFLINE
+    else:
+        state = STATE_DEGRADED
+    latencies = [h.latency for h in checked if h.latency is not None]
+    return state, max(latencies) if latencies else None, down
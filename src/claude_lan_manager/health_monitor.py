@@ -0,0 +1,146 @@
+"""Qt integration for the device health checks.
+
+The probes (see claude_lan_manager.health_probe) run on an event loop of their
+own, on a worker thread, so a thousand of them in flight never touch the GUI
+thread. A timer asks the loop every second to check whichever devices are
+due, and the windows are sent every device's health after each check that
+probed something.
+
+The same loop keeps the devices' tool catalogs (see
+claude_lan_manager.capabilities) fresh, so the space tooltips and the
+CLAUDE.md files written at launch list current tools.
+"""
+
+import asyncio
+import threading
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from claude_lan_manager.capabilities_probe import refresh_catalogs_async
+from claude_lan_manager.config import AppConfig
+from claude_lan_manager.health_probe import HealthChecker
+
+# How often due devices are looked for, in milliseconds
+TICK_INTERVAL_MS = 1000
+
+# How often stale tool catalogs are looked for, in milliseconds
+CATALOG_INTERVAL_MS = 60_000
+
+
+class HealthMonitor(QObject):
+    """Emits updated({device_id: DeviceHealth}) after every check that probed a device."""
+
+    updated = pyqtSignal(object)
+
+    def __init__(self, config: AppConfig, parent=None):
+        super().__init__(parent)
+        self.health: dict = {}
+        self._busy = False
+        self._refreshing = False
+        self._devices: list = []
+        self._checker = HealthChecker(config.health)
+
+        loop = self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, name="health-monitor", daemon=True)
+        self._thread.start()
+        self.destroyed.connect(lambda: loop.call_soon_threadsafe(loop.stop))
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(TICK_INTERVAL_MS)
+        self._timer.timeout.connect(self.check)
+        self._catalog_timer = QTimer(self)
+        self._catalog_timer.setInterval(CATALOG_INTERVAL_MS)
+        self._catalog_timer.timeout.connect(self.refresh_catalogs)
+
+        self._results = _Results(self)
+        self._results.done.connect(self._on_done)
+        self._results.refreshed.connect(self._on_refreshed)
+        self.apply_config(config)
+
+    def apply_config(self, config: AppConfig, _diff=None):
+        checker, settings, devices = self._checker, config.health, list(config.devices.values())
+        self._devices = devices
+
+        def update():
+            checker.settings = settings
+            checker.set_devices(devices)
+
+        self._loop.call_soon_threadsafe(update)
+        if settings.enabled:
+            # Everything at once when (re)started, not just what's due
+            restarted = not self._timer.isActive()
+            self._timer.start()
+            self._catalog_timer.start()
+            self.check(force=restarted)
+            self.refresh_catalogs()
+        elif self._timer.isActive():
+            self._timer.stop()
+            self._catalog_timer.stop()
+            self.health = {}
+            self.updated.emit(self.health)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop checking, cancel the probes in flight and wait for the worker thread."""
+        self._timer.stop()
+        self._catalog_timer.stop()
+        loop = self._loop
+
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        self._thread.join(timeout)
+
+    def check(self, force: bool = False):
+        """Probe the devices that are due (all with force), in the background.
+
+        Skipped while a check runs.
+        """
+        if self._busy:
+            return
+        self._busy = True
+        checker, results = self._checker, self._results
+
+        async def work():
+            snapshot = None
+            try:
+                if await checker.check(force):
+                    snapshot = dict(checker.health)
+            finally:
+                results.done.emit(snapshot)
+
+        asyncio.run_coroutine_threadsafe(work(), self._loop)
+
+    def refresh_catalogs(self):
+        """Ask the devices whose tool catalog is stale for their tools, in the background."""
+        if self._refreshing:
+            return
+        self._refreshing = True
+        devices, results = self._devices, self._results
+
+        async def work():
+            try:
+                await refresh_catalogs_async(devices)
+            finally:
+                results.refreshed.emit()
+
+        asyncio.run_coroutine_threadsafe(work(), self._loop)
+
+    def _on_refreshed(self):
+        self._refreshing = False
+
+    def _on_done(self, health):
+        self._busy = False
+        # Nothing was due, or checks were turned off meanwhile
+        if health is not None and self._timer.isActive():
+            self.health = health
+            self.updated.emit(health)
+
+
+class _Results(QObject):
+    done = pyqtSignal(object)
+    refreshed = pyqtSignal()
@@ -0,0 +1,131 @@
+"""Reachability probes of the devices' MCP endpoints.
+
+A probe connects to a device's MCP port and asks for /mcp with a bare HTTP
+GET; whatever the status, an HTTP answer means the server is up (MCP servers
+answer a GET without a session with 4xx, and no session is started). See
+claude_lan_manager.health for what makes a device online, degraded or
+offline.
+
+All devices are probed concurrently on one event loop, at most
+`health.concurrency` at a time, so a cycle over a thousand devices takes
+about as long as the slowest few probes. Devices that don't answer are checked
+less and less often (exponential backoff, with jitter so they don't all come
+due together), so a dead subnet doesn't keep hundreds of probes waiting for
+their timeouts every cycle.
+"""
+
+import asyncio
+import random
+import time
+from typing import Iterable, Optional
+
+from claude_lan_manager.config import Device, HealthSettings
+from claude_lan_manager.health import (
+    STATE_DEGRADED,
+    STATE_OFFLINE,
+    STATE_ONLINE,
+    DeviceHealth,
+)
+
+# Longest wait between checks of a device that is down, in seconds
+MAX_BACKOFF = 60.0
+
+
+def _connect_error(error: BaseException) -> str:
+    if isinstance(error, TimeoutError):
+        return "no answer"
+    if isinstance(error, ConnectionRefusedError):
+        return "connection refused"
+    if isinstance(error, OSError) and error.strerror:
+        return error.strerror
+    return str(error)
+
+
+async def probe(host: str, port: int, timeout: float, slow: float) -> tuple[str, Optional[float], str]:
+    """Probe one MCP endpoint; returns (state, latency, error)."""
+    start = time.monotonic()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, TimeoutError) as e:
+        return STATE_OFFLINE, None, _connect_error(e)
+
+    try:
+        writer.write(
+            f"GET /mcp HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            "Accept: application/json\r\nConnection: close\r\n\r\n".encode()
+        )
+        remaining = max(0.0, timeout - (time.monotonic() - start))
+        status_line = await asyncio.wait_for(reader.readline(), remaining)
+    except (OSError, TimeoutError):
+        return STATE_DEGRADED, None, "no HTTP answer"
+    finally:
+        writer.close()
+    latency = time.monotonic() - start
+
+    parts = status_line.split()
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+        return STATE_DEGRADED, latency, "not an HTTP server"
+    status = int(parts[1])
+    if status >= 500:
+        return STATE_DEGRADED, latency, f"HTTP {status}"
+    if latency > slow:
+        return STATE_DEGRADED, latency, "slow"
+    return STATE_ONLINE, latency, ""
+
+
+class HealthChecker:
+    """Probes devices when they are due, remembering how each one did.
+
+    Not thread-safe: use it from the thread running its event loop.
+    """
+
+    def __init__(self, settings: HealthSettings, devices: Iterable[Device] = ()):
+        self.settings = settings
+        self.health: dict[str, DeviceHealth] = {}
+        self._endpoints: dict[str, tuple[str, int]] = {}
+        self.set_devices(devices)
+
+    def set_devices(self, devices: Iterable[Device]):
+        """Check these devices from now on; a device whose endpoint moved starts over."""
+        endpoints = {device.id: (device.ip, device.mcp_port) for device in devices}
+        for device_id, endpoint in endpoints.items():
+            if self._endpoints.get(device_id) != endpoint:
+                self.health[device_id] = DeviceHealth()
+        for device_id in self.health.keys() - endpoints.keys():
+            del self.health[device_id]
+        self._endpoints = endpoints
+
+    async def check(self, force: bool = False) -> list[str]:
+        """Probe the devices that are due (all of them with force); returns their IDs."""
+        now = time.monotonic()
+        due = [
+            device_id for device_id, health in self.health.items()
+            if force or health.next_check <= now
+        ]
+        if due:
+            semaphore = asyncio.Semaphore(self.settings.concurrency)
+            await asyncio.gather(*(self._check_one(device_id, semaphore) for device_id in due))
+        return due
+
+    async def _check_one(self, device_id: str, semaphore: asyncio.Semaphore):
+        endpoint = self._endpoints[device_id]
+        async with semaphore:
+            state, latency, error = await probe(*endpoint, self.settings.timeout, self.settings.slow)
+        if self._endpoints.get(device_id) != endpoint:
+            return  # The device was removed or moved while we were probing it
+
+        failures = self.health[device_id].failures + 1 if latency is None else 0
+        delay = self.settings.interval
+        if failures:
+            delay = min(delay * 2 ** (failures - 1), MAX_BACKOFF) * random.uniform(0.9, 1.1)
+        # Immutable once stored, so snapshots can be handed to other threads
+        self.health[device_id] = DeviceHealth(
+            state, latency, error, time.time(), failures, time.monotonic() + delay
+        )
+
+
+def check_devices(devices: Iterable[Device], settings: HealthSettings) -> dict[str, DeviceHealth]:
+    """Probe every device once."""
+    checker = HealthChecker(settings, devices)
+    asyncio.run(checker.check(force=True))
+    return checker.health
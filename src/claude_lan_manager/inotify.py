@@ -0,0 +1,139 @@
+"""Minimal ctypes binding for Linux inotify.
+
+Used to watch the config file and space log directories without polling.
+The file descriptor is non-blocking, so it can be driven either by a Qt
+QSocketNotifier or by select() in the CLI.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+IN_ACCESS = 0x00000001
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _get_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return _libc
+
+
+def is_available() -> bool:
+    """Check whether inotify can be used on this system."""
+    try:
+        return hasattr(_get_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+def get_max_user_watches(default: int = 8192) -> int:
+    """Read the kernel's per-user inotify watch limit."""
+    try:
+        return int(Path("/proc/sys/fs/inotify/max_user_watches").read_text())
+    except (OSError, ValueError):
+        return default
+
+
+@dataclass(slots=True)
+class InotifyEvent:
+    """A single inotify event."""
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+class Inotify:
+    """A non-blocking inotify instance."""
+
+    def __init__(self):
+        libc = _get_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        """Watch a path and return its watch descriptor."""
+        wd = _get_libc().inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching a descriptor. Already-removed watches are ignored."""
+        _get_libc().inotify_rm_watch(self._fd, wd)
+
+    def read_events(self) -> list[InotifyEvent]:
+        """Read all currently queued events without blocking."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            if not buf:
+                return events
+
+            offset = 0
+            while offset < len(buf):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(name)))
+
+    def wait(self, timeout: Optional[float] = None) -> list[InotifyEvent]:
+        """Block until events are available (or the timeout expires) and read them."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return self.read_events() if ready else []
+
+    def events(self) -> Iterator[InotifyEvent]:
+        """Iterate over events forever."""
+        while True:
+            yield from self.wait()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,63 @@
+"""Inventory index for fast device/space lookups.
+
+Built once when a configuration is loaded so that the GUIs and CLI never have
+to rescan every space to answer simple questions.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from claude_lan_manager.config import Device, Space
+
+# Known space categories, in display order. Anything else is treated as individual.
+CATEGORIES = ("consolidated", "group", "individual")
+
+
+def normalize_category(category: str) -> str:
+    """Map a configured category onto one of the known CATEGORIES."""
+    return category if category in CATEGORIES else "individual"
+
+
+@dataclass(slots=True)
+class InventoryIndex:
+    """Precomputed lookups over a configuration's devices and spaces."""
+    by_category: dict[str, list["Space"]] = field(default_factory=dict)
+    space_devices: dict[str, tuple["Device", ...]] = field(default_factory=dict)
+    spaces_by_device: dict[str, list["Space"]] = field(default_factory=dict)
+    device_by_endpoint: dict[tuple[str, int], "Device"] = field(default_factory=dict)
+    devices_by_ip: dict[str, list["Device"]] = field(default_factory=dict)
+    dangling: dict[str, list[str]] = field(default_factory=dict)  # space_id -> unknown device IDs
+
+    @classmethod
+    def build(cls, devices: dict[str, "Device"], spaces: dict[str, "Space"]) -> "InventoryIndex":
+        """Build the index from device and space mappings."""
+        index = cls(by_category={category: [] for category in CATEGORIES})
+
+        for device in devices.values():
+            index.device_by_endpoint[(device.ip, device.mcp_port)] = device
+            index.devices_by_ip.setdefault(device.ip, []).append(device)
+
+        for space in spaces.values():
+            index.by_category[normalize_category(space.category)].append(space)
+
+            resolved = []
+            for dev_id in space.devices:
+                device = devices.get(dev_id)
+                if device is None:
+                    index.dangling.setdefault(space.id, []).append(dev_id)
+                    continue
+                resolved.append(device)
+                members = index.spaces_by_device.setdefault(dev_id, [])
+                if not members or members[-1] is not space:
+                    members.append(space)
+            index.space_devices[space.id] = tuple(resolved)
+
+        return index
+
+    def find_device(self, ip: str, port: Optional[int] = None) -> Optional["Device"]:
+        """Find a device by IP, or by IP and MCP port."""
+        if port is not None:
+            return self.device_by_endpoint.get((ip, port))
+        matches = self.devices_by_ip.get(ip)
+        return matches[0] if matches else None
@@ -0,0 +1,167 @@
+"""Qt launch queue.
+
+Launching a space writes its generated files, may talk to tmux and forks a
+terminal; on a slow or network-mounted home directory that takes long enough
+to freeze the window. The executor runs launches on a small private
+QThreadPool and reports back through signals, which Qt delivers on the GUI
+thread. A space that is already queued or launching is not queued again, so
+impatient repeat clicks start one session, not several.
+
+Bulk launches (a whole category at once) are additionally staggered: their
+launches are handed to the pool one at a time on a timer, so dozens of
+terminals and Node processes don't all start in the same instant.
+
+The time a launch spends waiting here is recorded as its "queue" phase, and
+the launch function is given the trace to record the rest in.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from claude_lan_manager.config import AppConfig, Space
+from claude_lan_manager.launch_trace import LaunchTrace
+
+# Launches running at once; more are queued
+DEFAULT_MAX_THREADS = 4
+
+
+class _LaunchTask(QRunnable):
+    def __init__(
+        self,
+        executor: "LaunchExecutor",
+        launch: Callable,
+        config: AppConfig,
+        space: Space,
+        queued_at: Optional[float] = None,
+    ):
+        super().__init__()
+        self._executor = executor
+        self._launch = launch
+        self._config = config
+        self._space = space
+        self._queued_at = queued_at or time.time()
+
+    def run(self):
+        space_id = self._space.id
+        trace = LaunchTrace(space_id)
+        trace.add("queue", self._queued_at, time.time())
+        self._executor.started.emit(space_id)
+        try:
+            result = self._launch(self._config, self._space, trace=trace)
+        except Exception as e:
+            self._executor._finished.emit(space_id, None, str(e) or type(e).__name__)
+        else:
+            self._executor._finished.emit(space_id, result, "")
+
+
+class LaunchExecutor(QObject):
+    """Runs launch(config, space, trace=trace) calls off the GUI thread, one per space at a time.
+
+    Signals (all delivered on the thread the executor lives in):
+        queued(space_id): A launch was accepted
+        started(space_id): A worker began the launch
+        launched(space_id, result): launch() returned result
+        failed(space_id, message): launch() raised
+    """
+
+    queued = pyqtSignal(str)
+    started = pyqtSignal(str)
+    launched = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+    # Internal: worker -> GUI thread, so bookkeeping happens in one thread only
+    _finished = pyqtSignal(str, object, str)
+
+    def __init__(
+        self,
+        launch: Callable[..., Any],
+        max_threads: int = DEFAULT_MAX_THREADS,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._launch = launch
+        self._pending: set[str] = set()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._finished.connect(self._on_finished)
+
+        # Staggered launches waiting for their turn
+        self._staggered: deque[tuple[AppConfig, Space, float]] = deque()
+        self._stagger_timer = QTimer(self)
+        self._stagger_timer.timeout.connect(self._start_next)
+
+    def set_max_threads(self, max_threads: int) -> None:
+        self._pool.setMaxThreadCount(max(1, max_threads))
+
+    @property
+    def pending(self) -> set[str]:
+        """IDs of spaces queued or launching."""
+        return set(self._pending)
+
+    def is_pending(self, space_id: str) -> bool:
+        return space_id in self._pending
+
+    def submit(self, config: AppConfig, space: Space) -> bool:
+        """Queue a launch.
+
+        Returns:
+            False if the space already has a launch queued or in flight
+        """
+        if space.id in self._pending:
+            return False
+        self._pending.add(space.id)
+        self._pool.start(_LaunchTask(self, self._launch, config, space))
+        self.queued.emit(space.id)
+        return True
+
+    def submit_many(self, config: AppConfig, spaces: Iterable[Space], stagger: float = 0.0) -> list[str]:
+        """Queue launches of several spaces, starting at most one per stagger seconds.
+
+        Returns:
+            IDs of the spaces that were queued (others were already pending)
+        """
+        accepted = []
+        for space in spaces:
+            if space.id in self._pending:
+                continue
+            self._pending.add(space.id)
+            self._staggered.append((config, space, time.time()))
+            self.queued.emit(space.id)
+            accepted.append(space.id)
+
+        self._stagger_timer.setInterval(int(stagger * 1000))
+        if accepted and not self._stagger_timer.isActive():
+            self._start_next()
+            if self._staggered:
+                self._stagger_timer.start()
+        return accepted
+
+    def _start_next(self):
+        if not self._staggered:
+            self._stagger_timer.stop()
+            return
+        config, space, queued_at = self._staggered.popleft()
+        self._pool.start(_LaunchTask(self, self._launch, config, space, queued_at))
+
+    def _on_finished(self, space_id: str, result: object, error: str):
+        self._pending.discard(space_id)
+        if error:
+            self.failed.emit(space_id, error)
+        else:
+            self.launched.emit(space_id, result)
+
+    def cancel_staggered(self) -> int:
+        """Drop bulk launches that haven't started yet; returns how many."""
+        self._stagger_timer.stop()
+        dropped = len(self._staggered)
+        while self._staggered:
+            _config, space, _queued_at = self._staggered.popleft()
+            self._pending.discard(space.id)
+        return dropped
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until all started launches finished (mainly for shutdown)."""
+        return self._pool.waitForDone(msecs)
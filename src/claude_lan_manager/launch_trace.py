@@ -0,0 +1,319 @@
+"""Launch latency tracing.
+
+Every launch records how long each of its phases took as spans in a local
+JSONL trace (``$XDG_CACHE_HOME/claude-lan-manager/launch-trace.jsonl``), one
+line per span:
+
+    {"launch": "3f2a9c1e07b4", "space": "router-manager", "phase": "spawn",
+     "start": 1760000000.123, "ms": 41.7}
+
+Phases, in order:
+
+- config_load: loading config.yaml (once per CLI run or GUI start)
+- queue: click to launch start, while waiting for a free launch worker
+- session_check: looking for a running session (and checking max_sessions)
+- ensure_space: writing the space's CLAUDE.md and .mcp.json (and starting
+  the MCP gateway, if the space uses it and it isn't running)
+- pool_claim: taking a warm session from the session pool
+- spawn: starting the terminal (Popen) or creating the tmux window
+- window: the terminal started the session's shell
+- claude_start: the shell became the claude process
+- claude_ready: claude's CPU use settled, i.e. it is waiting at its prompt
+
+The last three happen after launching returns; a watcher thread follows the
+new processes in /proc until they settle. `claude-lan-manager-setup launch
+--profile-launch` prints p50/p95 per phase over recent launches.
+
+Set CLAUDE_LAN_MANAGER_NO_LAUNCH_TRACE=1 to turn tracing off.
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from claude_lan_manager import proc
+from claude_lan_manager.cache import get_cache_dir
+
+TRACE_NAME = "launch-trace.jsonl"
+
+# The trace is cut back to its newer half when it grows past this
+MAX_TRACE_BYTES = 1024 * 1024
+
+# Launches summarized by --profile-launch
+RECENT_LAUNCHES = 50
+
+PHASES = (
+    "config_load",
+    "queue",
+    "session_check",
+    "ensure_space",
+    "pool_claim",
+    "spawn",
+    "window",
+    "claude_start",
+    "claude_ready",
+)
+
+# Startup watching: poll interval, and how long claude may take to appear
+WATCH_INTERVAL = 0.05
+WATCH_TIMEOUT = 30
+
+# claude counts as ready once it used less than this share of a CPU for SETTLE_TIME seconds
+SETTLE_CPU_SHARE = 0.05
+SETTLE_TIME = 0.3
+
+_lock = threading.Lock()
+
+# Launches the startup watcher follows, and the watcher thread while it runs
+_startups: list["_Startup"] = []
+_watcher: Optional[threading.Thread] = None
+
+
+def tracing_enabled() -> bool:
+    return not os.environ.get("CLAUDE_LAN_MANAGER_NO_LAUNCH_TRACE")
+
+
+def get_trace_path() -> Path:
+    return get_cache_dir() / TRACE_NAME
+
+
+@dataclass
+class Span:
+    """One timed phase of a launch."""
+    launch: str
+    space: Optional[str]
+    phase: str
+    start: float  # Unix timestamp
+    ms: float
+
+    @property
+    def end(self) -> float:
+        return self.start + self.ms / 1000
+
+
+class LaunchTrace:
+    """Spans of one launch, appended to the trace file as they are recorded."""
+
+    def __init__(self, space_id: Optional[str] = None, path: Optional[Path] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.space_id = space_id
+        self.path = path or get_trace_path()
+        self.spans: list[Span] = []
+
+    def add(self, phase: str, start: float, end: float) -> Span:
+        """Record a phase that ran from start to end (Unix timestamps)."""
+        span = Span(self.id, self.space_id, phase, round(start, 6), round(max(end - start, 0.0) * 1000, 3))
+        self.spans.append(span)
+        if tracing_enabled():
+            try:
+                append_spans(self.path, [span])
+            except OSError:
+                pass  # tracing must never break a launch
+        return span
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Record the enclosed block as a phase."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(phase, start, time.time())
+
+
+def append_spans(path: Path, spans: list[Span]) -> None:
+    """Append spans to a trace file, trimming it when it grows too large."""
+    lines = "".join(json.dumps(span.__dict__) + "\n" for span in spans)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock, open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(lines)
+        f.flush()
+        if f.tell() > MAX_TRACE_BYTES:
+            f.seek(0)
+            existing = f.readlines()
+            kept = existing[len(existing) // 2:]
+            f.seek(0)
+            f.truncate()
+            f.writelines(kept)
+
+
+def load_spans(path: Optional[Path] = None) -> list[Span]:
+    """Read every span from a trace file, skipping lines that don't parse."""
+    spans = []
+    try:
+        with open(path or get_trace_path()) as f:
+            for line in f:
+                try:
+                    spans.append(Span(**json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+    except OSError:
+        pass
+    return spans
+
+
+@dataclass(eq=False)
+class _Startup:
+    """A cold-started session the startup watcher is following."""
+    trace: LaunchTrace
+    mcp_config: str
+    spawned_at: float
+    deadline: float  # time.monotonic()
+    pid: Optional[int] = None
+    found_at: float = 0.0
+    previous: Optional[proc.ProcStat] = None
+    checked_at: float = 0.0  # time.monotonic() of previous
+    quiet_since: Optional[float] = None
+
+
+def watch_startup(trace: LaunchTrace, mcp_config: str, spawned_at: float) -> Optional[threading.Thread]:
+    """Follow a cold-started session in the background, recording its startup phases.
+
+    One watcher thread follows every pending launch, so parallel launches
+    share each /proc scan.
+
+    Args:
+        trace: Trace of the launch
+        mcp_config: The session's --mcp-config path, which identifies its claude process
+        spawned_at: When the terminal (or tmux window) was started
+    """
+    global _watcher
+    if not tracing_enabled():
+        return None
+    with _lock:
+        _startups.append(_Startup(trace, mcp_config, spawned_at, time.monotonic() + WATCH_TIMEOUT))
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch, name="launch-trace", daemon=True)
+            _watcher.start()
+        return _watcher
+
+
+def _watch() -> None:
+    global _watcher
+    # Imported here: the registry imports the launcher's modules
+    from claude_lan_manager.sessions import find_claude_processes
+
+    while True:
+        with _lock:
+            now = time.monotonic()
+            _startups[:] = [startup for startup in _startups if now <= startup.deadline]
+            if not _startups:
+                _watcher = None
+                return
+            startups = list(_startups)
+
+        done = [startup for startup in startups if startup.pid is not None and _settled(startup)]
+        searching = [startup for startup in startups if startup.pid is None]
+        if searching:
+            # One scan for every launch whose claude hasn't appeared yet
+            stats = proc.snapshot()
+            found = find_claude_processes(stats, {startup.mcp_config for startup in searching})
+            for startup in searching:
+                _find(startup, stats, found.get(startup.mcp_config, []))
+
+        if done:
+            with _lock:
+                _startups[:] = [startup for startup in _startups if startup not in done]
+        time.sleep(WATCH_INTERVAL)
+
+
+def _find(startup: _Startup, stats: dict[int, proc.ProcStat], candidates: list[int]) -> None:
+    """Look for the launch's claude process among the candidates."""
+    for candidate in candidates:
+        # Clock ticks are 10 ms; allow for rounding
+        forked_at = proc.started_at(stats[candidate])
+        if forked_at >= startup.spawned_at - 0.02:
+            startup.pid, startup.found_at = candidate, time.time()
+            startup.previous, startup.checked_at = stats[candidate], time.monotonic()
+            startup.trace.add("window", startup.spawned_at, max(forked_at, startup.spawned_at))
+            startup.trace.add("claude_start", max(forked_at, startup.spawned_at), startup.found_at)
+            return
+
+
+def _settled(startup: _Startup) -> bool:
+    """Follow the claude process until it goes quiet after its startup burst.
+
+    True once it is ready (or gone) and no longer needs following.
+    """
+    stat = proc.read_stat(startup.pid)
+    if stat is None or stat.starttime != startup.previous.starttime:
+        return True
+    now, checked_at = time.monotonic(), startup.checked_at
+    busy = (
+        now > checked_at
+        and (stat.cpu_ticks - startup.previous.cpu_ticks) / proc.CLK_TCK / (now - checked_at) >= SETTLE_CPU_SHARE
+    )
+    startup.previous, startup.checked_at = stat, now
+    if busy:
+        startup.quiet_since = None
+    elif startup.quiet_since is None:
+        startup.quiet_since = time.time()
+    elif time.time() - startup.quiet_since >= SETTLE_TIME:
+        startup.trace.add("claude_ready", startup.found_at, startup.quiet_since)
+        return True
+    return False
+
+
+def wait_for_watchers(timeout: float = WATCH_TIMEOUT) -> None:
+    """Wait for the startup watcher to finish (the CLI would otherwise exit first)."""
+    with _lock:
+        watcher = _watcher
+    if watcher is not None:
+        watcher.join(timeout)
+
+
+@dataclass
+class PhaseStats:
+    phase: str
+    count: int
+    p50: float  # milliseconds
+    p95: float
+    mean: float
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(share * len(ordered) + 0.5) - 1))]
+
+
+def summarize(spans: list[Span], recent: int = RECENT_LAUNCHES) -> list[PhaseStats]:
+    """Per-phase latency over the most recent launches, plus their total.
+
+    A launch's total runs from its first span's start to its last span's end.
+    """
+    launches: dict[str, list[Span]] = {}
+    for span in sorted(spans, key=lambda s: s.start):
+        launches.setdefault(span.launch, []).append(span)
+    kept = list(launches.values())[-recent:]
+
+    by_phase: dict[str, list[float]] = {}
+    totals = []
+    for launch_spans in kept:
+        for span in launch_spans:
+            by_phase.setdefault(span.phase, []).append(span.ms)
+        if launch_spans[0].space is not None:
+            totals.append((max(s.end for s in launch_spans) - launch_spans[0].start) * 1000)
+
+    order = [phase for phase in PHASES if phase in by_phase]
+    order += sorted(set(by_phase) - set(PHASES))
+    if totals:
+        by_phase["total"] = totals
+        order.append("total")
+    return [
+        PhaseStats(
+            phase, len(by_phase[phase]),
+            percentile(by_phase[phase], 0.50),
+            percentile(by_phase[phase], 0.95),
+            sum(by_phase[phase]) / len(by_phase[phase]),
+        )
+        for phase in order
+    ]
@@ -1,112 +1,235 @@
 """Terminal launcher for Claude Code with MCP isolation."""
 
-import os
-import subprocess
 import shutil
-from pathlib import Path
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from claude_lan_manager.artifacts import CLAUDE_MD, MCP_JSON, sync_space
+from claude_lan_manager.cache import get_cache_dir
+from claude_lan_manager.config import AppConfig, GatewaySettings, Space
+from claude_lan_manager.launch_trace import LaunchTrace, watch_startup
+from claude_lan_manager.limits import check_session_limit, limit_command
+from claude_lan_manager.session_pool import SessionPool
+from claude_lan_manager.sessions import SessionRegistry
+from claude_lan_manager.terminals import LaunchedSession, TerminalBackend, get_backend
+
+# Seconds to wait for a gateway we started to accept connections
+GATEWAY_START_TIMEOUT = 5.0
+
+# Where the gateway's output goes, in the cache directory
+GATEWAY_LOG = "gateway.log"
 
-from claude_lan_manager.config import AppConfig, Space
+_gateway_lock = threading.Lock()
+_gateway_process: Optional[subprocess.Popen] = None
+
+
+class GatewayError(RuntimeError):
+    """Raised when a space needs the MCP gateway and it can't be started."""
 
 
 def ensure_space_exists(config: AppConfig, space: Space) -> None:
-    """Ensure the space directory and required files exist."""
-    from claude_lan_manager.config import generate_mcp_json, generate_claude_md
-    import json
+    """Ensure the space directory and required files exist.
+
+    CLAUDE.md is only created when missing (it may have been customized);
+    .mcp.json is kept current but only rewritten when its contents change.
+    If the space reaches its devices through the MCP gateway, the gateway
+    is started unless it's running.
+    """
+    sync_space(config, space, names=(CLAUDE_MD, MCP_JSON), overwrite=(MCP_JSON,))
+    if config.gateway_url(space) is not None:
+        ensure_gateway(config)
 
-    # Create directory structure
-    space.path.mkdir(parents=True, exist_ok=True)
-    space.logs_path.mkdir(exist_ok=True)
 
-    # Get devices for this space
-    devices = config.get_devices_for_space(space)
+def _gateway_accepts(gateway: GatewaySettings, timeout: float) -> bool:
+    try:
+        socket.create_connection((gateway.host, gateway.port), timeout).close()
+    except OSError:
+        return False
+    return True
 
-    # Generate CLAUDE.md if it doesn't exist
-    if not space.claude_md_path.exists():
-        content = generate_claude_md(space, devices)
-        space.claude_md_path.write_text(content)
 
-    # Always regenerate .mcp.json to ensure it's current
-    mcp_config = generate_mcp_json(devices)
-    with open(space.mcp_json_path, "w") as f:
-        json.dump(mcp_config, f, indent=2)
+def ensure_gateway(config: AppConfig) -> None:
+    """Start claude-lan-manager-gateway in the background unless something listens on its port.
 
+    Raises:
+        GatewayError: It didn't start accepting connections in time
+    """
+    global _gateway_process
+    gateway = config.gateway
+    with _gateway_lock:
+        if _gateway_accepts(gateway, 0.5):
+            return
+        # Reaps the previous one if it exited
+        if _gateway_process is None or _gateway_process.poll() is not None:
+            command = [sys.executable, "-m", "claude_lan_manager.gateway"]
+            if config.config_path is not None:
+                command += ["--config", str(config.config_path)]
+            log_path = get_cache_dir() / GATEWAY_LOG
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, "ab") as log:
+                _gateway_process = subprocess.Popen(
+                    command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=log,
+                    start_new_session=True,  # Outlives the GUI; serves every later launch
+                )
+
+        deadline = time.monotonic() + GATEWAY_START_TIMEOUT
+        while time.monotonic() < deadline and _gateway_process.poll() is None:
+            if _gateway_accepts(gateway, 0.5):
+                return
+            time.sleep(0.05)
+        raise GatewayError(
+            f"The MCP gateway didn't start on {gateway.url}; see {get_cache_dir() / GATEWAY_LOG}"
+        )
+
+
+def claim_warm_session(config: AppConfig, space: Space) -> Optional[str]:
+    """Take a ready session for the space from the session pool, if enabled.
+
+    The pool is topped back up in the background either way.
+
+    Returns:
+        Name of the tmux session running Claude, or None to cold-start
+    """
+    pool = SessionPool(config)
+    if not pool.enabled:
+        return None
+
+    pool.record_launch(space)
+    session = pool.claim(space)
+    pool.maintain_in_background([space])
+    return session
 
-def launch_claude_in_terminal(config: AppConfig, space: Space) -> subprocess.Popen:
-    """Launch Claude Code in a terminal at the space directory.
+
+def launch_claude_in_terminal(
+    config: AppConfig,
+    space: Space,
+    backend: Optional[TerminalBackend] = None,
+    reuse: bool = True,
+    trace: Optional[LaunchTrace] = None,
+) -> LaunchedSession:
+    """Launch Claude Code for a space in the configured terminal backend.
 
     The key here is MCP isolation - we want Claude to ONLY use the MCPs
     defined in the space's .mcp.json, not any user-level MCPs.
 
     We use --strict-mcp-config with --mcp-config to ensure ONLY the space's
     MCP configuration is used, ignoring user-level and project-level MCPs.
+    Pre-warmed sessions from the session pool are started the same way.
+
+    If the space already has a running (or starting) session, it is focused
+    instead and returned with reused=True, unless reuse is False.
+
+    Each phase is recorded in `trace` (a new one if not given); a cold start
+    is then followed in the background until Claude is at its prompt.
+
+    Raises:
+        SessionLimitError: The space's max_sessions are running, or its
+            memory_max can't be enforced on this system
     """
+    trace = trace or LaunchTrace(space.id)
+    registry = SessionRegistry(config)
+    with trace.span("session_check"):
+        running = registry.refresh().get(space.id, [])
+    if reuse and running:
+        registry.focus(running[0])
+        return running[0].as_launched()
+    check_session_limit(space, len(running))
+    command = limit_command(space, config.claude_command(space))
+
     # Ensure space directory and files exist
-    ensure_space_exists(config, space)
-
-    terminal = config.terminal_emulator
-    claude_cmd = config.claude_code_cmd
-    space_path = space.path
-    mcp_json_path = space.mcp_json_path
-
-    # Build environment
-    env = os.environ.copy()
-
-    # Build the Claude command with MCP isolation flags
-    # --strict-mcp-config: Only use MCP servers from --mcp-config, ignoring all other MCP configurations
-    # --mcp-config: Load MCP servers from the space's .mcp.json file
-    claude_full_cmd = f'{claude_cmd} --strict-mcp-config --mcp-config "{mcp_json_path}"'
-
-    # Build the command based on terminal emulator
-    if terminal == "konsole":
-        # Konsole command: open new window, set working directory, run claude
-        cmd = [
-            "konsole",
-            "--new-tab",
-            "--workdir", str(space_path),
-            "-e", "bash", "-c", claude_full_cmd,
-        ]
-    elif terminal == "gnome-terminal":
-        cmd = [
-            "gnome-terminal",
-            "--working-directory", str(space_path),
-            "--", "bash", "-c", claude_full_cmd,
-        ]
-    elif terminal == "xterm":
-        cmd = [
-            "xterm",
-            "-e", f"cd {space_path} && {claude_full_cmd}",
-        ]
-    elif terminal == "kitty":
-        cmd = [
-            "kitty",
-            "--directory", str(space_path),
-            "bash", "-c", claude_full_cmd,
-        ]
-    elif terminal == "alacritty":
-        cmd = [
-            "alacritty",
-            "--working-directory", str(space_path),
-            "-e", "bash", "-c", claude_full_cmd,
-        ]
-    else:
-        # Generic fallback - try to use the terminal directly
-        cmd = [
-            terminal,
-            "-e", f"cd {space_path} && {claude_full_cmd}",
-        ]
-
-    # Launch the terminal
-    process = subprocess.Popen(
-        cmd,
-        env=env,
-        start_new_session=True,  # Detach from parent process
-    )
-
-    return process
+    with trace.span("ensure_space"):
+        ensure_space_exists(config, space)
+
+    with trace.span("pool_claim"):
+        warm_session = claim_warm_session(config, space)
+    backend = backend or get_backend(config)
+    spawned_at = time.time()
+    with trace.span("spawn"):
+        launched = backend.open(config, space, command, warm_session)
+    registry.register(space, launched)
+    if warm_session is None:
+        watch_startup(trace, str(space.mcp_json_path), spawned_at)
+    return launched
+
+
+@dataclass
+class LaunchResult:
+    """Outcome of one launch in a bulk launch."""
+    space_id: str
+    session: Optional[LaunchedSession] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def launch_many(
+    config: AppConfig,
+    spaces: Iterable[Space],
+    concurrency: Optional[int] = None,
+    stagger: Optional[float] = None,
+    launch: Callable[[AppConfig, Space], LaunchedSession] = launch_claude_in_terminal,
+    on_result: Optional[Callable[[LaunchResult], None]] = None,
+) -> list[LaunchResult]:
+    """Launch several spaces with bounded concurrency.
+
+    Launch starts are spaced at least `stagger` seconds apart, so a whole
+    group doesn't fork dozens of terminals and Node processes in the same
+    instant.
+
+    Args:
+        config: Application configuration
+        spaces: Spaces to launch
+        concurrency: Launches in flight at once (default: config.bulk_launch)
+        stagger: Minimum seconds between launch starts (default: config.bulk_launch)
+        launch: Function that launches one space
+        on_result: Called (from a worker thread) as each launch finishes
+
+    Returns:
+        One result per space, in the given order
+    """
+    spaces = list(spaces)
+    concurrency = max(1, concurrency or config.bulk_launch.concurrency)
+    stagger = config.bulk_launch.stagger if stagger is None else max(0.0, stagger)
+    # Resolve the inventory index up front rather than racing to build it in workers
+    config.index
+
+    slot_lock = threading.Lock()
+    next_slot = [time.monotonic()]
+
+    def work(space: Space) -> LaunchResult:
+        # Claim the next start slot, then wait for it
+        with slot_lock:
+            slot = max(next_slot[0], time.monotonic())
+            next_slot[0] = slot + stagger
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        start = time.perf_counter()
+        result = LaunchResult(space.id)
+        try:
+            result.session = launch(config, space)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.seconds = time.perf_counter() - start
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, max(1, len(spaces)))) as pool:
+        return list(pool.map(work, spaces))
 
 
 def check_terminal_available(terminal: str) -> bool:
-    """Check if the specified terminal emulator is available."""
+    """Check if the specified terminal emulator (or tmux) is available."""
     return shutil.which(terminal) is not None
 
 
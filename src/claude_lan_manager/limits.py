@@ -0,0 +1,134 @@
+"""Per-space session limits.
+
+Two optional settings of a space in config.yaml:
+
+- max_sessions: how many sessions of the space may run at once. Starting
+  another one fails with SessionLimitError (focusing a running session is
+  still allowed).
+- memory_max: a memory cap such as "4G" for each session's whole process
+  tree, enforced by the kernel through a cgroup. Where a user systemd
+  instance runs, the session gets its own transient scope
+  (`systemd-run --user --scope -p MemoryMax=...`); otherwise, when cgroup v2
+  delegates the memory controller to us (as in many containers), it is moved
+  into a child cgroup of ours with memory.max set.
+"""
+
+import functools
+import os
+import re
+import shlex
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+from claude_lan_manager.config import Space, parse_size
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Child cgroup (of ours) holding one cgroup per memory-capped session
+CGROUP_NAME = "claude-lan-manager"
+
+# Empty session cgroups younger than this may still be waiting for their process
+CGROUP_GRACE = 60
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when a space's limits don't allow starting a session."""
+
+
+def check_session_limit(space: Space, running: int) -> None:
+    """Refuse to start a session when the space already runs max_sessions."""
+    if space.max_sessions is not None and running >= space.max_sessions:
+        raise SessionLimitError(
+            f"{space.name} already has {running} running session{'s' if running != 1 else ''} "
+            f"(max_sessions: {space.max_sessions})"
+        )
+
+
+@functools.cache
+def systemd_scopes_available() -> bool:
+    """Check systemd-run can create scopes in the user's systemd instance."""
+    if shutil.which("systemd-run") is None:
+        return False
+    runtime_dir = Path(os.environ.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}")
+    return (runtime_dir / "systemd" / "private").exists() or (runtime_dir / "bus").exists()
+
+
+def delegated_cgroup() -> Optional[Path]:
+    """Our cgroup v2 directory, if we may create memory-capped cgroups below it."""
+    if not (CGROUP_ROOT / "cgroup.controllers").exists():
+        return None  # not a cgroup v2 (unified) hierarchy
+    try:
+        lines = Path("/proc/self/cgroup").read_text().splitlines()
+        relative = next(line[3:] for line in lines if line.startswith("0::"))
+        base = CGROUP_ROOT / relative.lstrip("/")
+        controllers = (base / "cgroup.controllers").read_text().split()
+    except (OSError, StopIteration):
+        return None
+    if "memory" not in controllers or not os.access(base, os.W_OK):
+        return None
+    return base
+
+
+def _enable_memory_controller(cgroup: Path) -> None:
+    control = cgroup / "cgroup.subtree_control"
+    if "memory" not in control.read_text().split():
+        control.write_text("+memory")
+
+
+def _session_cgroup(base: Path, space: Space, limit: int) -> Path:
+    """Create a cgroup capped at limit bytes for one session of a space."""
+    group = base / CGROUP_NAME
+    _enable_memory_controller(base)
+    group.mkdir(exist_ok=True)
+    _enable_memory_controller(group)
+
+    # Remove cgroups of sessions that have exited (the kernel refuses non-empty ones)
+    now = time.time_ns()
+    for old in group.iterdir():
+        created = old.name.rpartition("-")[2]
+        if old.is_dir() and created.isdigit() and now - int(created) > CGROUP_GRACE * 10**9:
+            try:
+                old.rmdir()
+            except OSError:
+                pass
+
+    session = group / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', space.id)}-{now}"
+    session.mkdir()
+    (session / "memory.max").write_text(str(limit))
+    return session
+
+
+def limit_command(space: Space, command: str) -> str:
+    """Wrap a shell command so the session it starts runs under the space's memory cap.
+
+    Raises:
+        SessionLimitError: memory_max is set but can't be enforced here
+    """
+    if space.memory_max is None:
+        return command
+    limit = parse_size(space.memory_max)
+
+    if systemd_scopes_available():
+        prefix = [
+            "systemd-run", "--user", "--scope", "--quiet", "--collect",
+            f"--description=Claude space {space.id}",
+            "-p", f"MemoryMax={limit}",
+            "--",
+        ]
+        return f"{shlex.join(prefix)} {command}"
+
+    base = delegated_cgroup()
+    if base is not None:
+        try:
+            cgroup = _session_cgroup(base, space, limit)
+        except OSError as e:
+            raise SessionLimitError(f"Can't create a memory-capped cgroup for {space.name}: {e}") from e
+        # The shell moves itself into the cgroup, then becomes Claude
+        return f"echo $$ > {shlex.quote(str(cgroup / 'cgroup.procs'))} && exec {command}"
+
+    raise SessionLimitError(
+        f"Can't apply memory_max to {space.name}: it needs systemd-run with a user "
+        "systemd instance, or a delegated cgroup v2 memory controller"
+    )
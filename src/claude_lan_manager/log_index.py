@@ -0,0 +1,315 @@
+"""Full-text search over every space's logs/ directory.
+
+Log files are split into small chunks (at markdown headings, or every few
+dozen lines) and stored in an SQLite FTS5 table under the spaces base path.
+Updates are incremental: files are tracked by inode, size and mtime, files
+that only grew get just their appended tail indexed, and only files that
+were rewritten are re-indexed from scratch.
+"""
+
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from claude_lan_manager.config import AppConfig
+
+INDEX_NAME = ".logs-index.sqlite"
+SCHEMA_VERSION = 1
+
+# File types worth indexing inside logs/
+LOG_SUFFIXES = (".md", ".txt", ".log")
+
+# Chunks start at markdown headings, and are capped at this many lines
+MAX_CHUNK_LINES = 40
+
+# Bytes at the end of the indexed content used to detect rewrites
+TAIL_PROBE = 256
+
+# Chunk rowids are file_id << CHUNK_BITS | sequence, so a file's chunks can be
+# deleted by rowid range instead of scanning the whole FTS table
+CHUNK_BITS = 24
+
+
+@dataclass
+class LogHit:
+    """A search result pointing back to a space's log file."""
+    space_id: str
+    path: Path
+    line: int
+    snippet: str
+    score: float
+
+
+@dataclass
+class IndexStats:
+    """What an index update did."""
+    scanned: int = 0
+    added: int = 0
+    appended: int = 0
+    reindexed: int = 0
+    removed: int = 0
+
+
+def get_index_path(config: AppConfig) -> Path:
+    return config.spaces_base_path / INDEX_NAME
+
+
+def connect(config: AppConfig) -> sqlite3.Connection:
+    """Open (creating if needed) the log index database."""
+    path = get_index_path(config)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.executescript("""
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS chunks;
+            CREATE TABLE files (
+                id INTEGER PRIMARY KEY,
+                space_id TEXT NOT NULL,
+                path TEXT NOT NULL UNIQUE,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                lines INTEGER NOT NULL,
+                tail_hash TEXT NOT NULL,
+                next_chunk INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE VIRTUAL TABLE chunks USING fts5(
+                body,
+                file_id UNINDEXED,
+                line UNINDEXED,
+                tokenize = 'porter unicode61'
+            );
+        """)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def iter_log_files(config: AppConfig) -> Iterator[tuple[str, Path, os.stat_result]]:
+    """Yield (space_id, path, stat) for every indexable log file."""
+    for space in config.spaces.values():
+        logs_path = space.logs_path
+        stack = [logs_path]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.name.endswith(LOG_SUFFIXES) and entry.is_file():
+                    yield space.id, Path(entry.path), entry.stat()
+
+
+def _tail_hash(data: bytes) -> str:
+    return hashlib.blake2b(data[-TAIL_PROBE:], digest_size=16).hexdigest()
+
+
+def _chunks(text: str, first_line: int) -> Iterator[tuple[int, str]]:
+    """Split text into (line number, chunk) pairs."""
+    start = first_line
+    lines: list[str] = []
+    for number, line in enumerate(text.splitlines(), first_line):
+        if lines and (line.startswith("#") or len(lines) >= MAX_CHUNK_LINES):
+            yield start, "\n".join(lines)
+            start, lines = number, []
+        lines.append(line)
+    if lines:
+        yield start, "\n".join(lines)
+
+
+def _insert_chunks(
+    conn: sqlite3.Connection, file_id: int, text: str, first_line: int, first_seq: int
+) -> int:
+    """Index text of a file and return the next free chunk sequence number."""
+    rows = [
+        ((file_id << CHUNK_BITS) | seq, body, file_id, line)
+        for seq, (line, body) in enumerate(
+            ((line, body) for line, body in _chunks(text, first_line) if body.strip()),
+            first_seq,
+        )
+    ]
+    conn.executemany("INSERT INTO chunks (rowid, body, file_id, line) VALUES (?, ?, ?, ?)", rows)
+    return first_seq + len(rows)
+
+
+def _delete_chunks(conn: sqlite3.Connection, file_id: int) -> None:
+    conn.execute(
+        "DELETE FROM chunks WHERE rowid BETWEEN ? AND ?",
+        (file_id << CHUNK_BITS, ((file_id + 1) << CHUNK_BITS) - 1),
+    )
+
+
+def update_index(config: AppConfig, conn: Optional[sqlite3.Connection] = None) -> IndexStats:
+    """Bring the index up to date with the log files on disk.
+
+    Args:
+        config: Application configuration
+        conn: Open index connection (one is opened and closed if omitted)
+
+    Returns:
+        Counts of what changed
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(config)
+
+    stats = IndexStats()
+    try:
+        known = {
+            row[1]: row
+            for row in conn.execute(
+                "SELECT id, path, inode, size, mtime_ns, lines, tail_hash, next_chunk FROM files"
+            )
+        }
+        seen = set()
+
+        with conn:
+            for space_id, path, st in iter_log_files(config):
+                stats.scanned += 1
+                key = str(path)
+                seen.add(key)
+                row = known.get(key)
+
+                if row is not None and (row[2], row[3], row[4]) == (st.st_ino, st.st_size, st.st_mtime_ns):
+                    continue
+
+                try:
+                    with open(path, "rb") as f:
+                        if row is not None and row[2] == st.st_ino and st.st_size > row[3]:
+                            # Same file that grew: if the old tail is intact, index only the new bytes
+                            probe_start = max(0, row[3] - TAIL_PROBE)
+                            f.seek(probe_start)
+                            head = f.read(row[3] - probe_start)
+                            if _tail_hash(head) == row[6]:
+                                appended = f.read()
+                                text = appended.decode("utf-8", errors="replace")
+                                next_chunk = _insert_chunks(conn, row[0], text, row[5] + 1, row[7])
+                                conn.execute(
+                                    "UPDATE files SET size = ?, mtime_ns = ?, lines = ?, tail_hash = ?, "
+                                    "next_chunk = ? WHERE id = ?",
+                                    (
+                                        row[3] + len(appended),
+                                        st.st_mtime_ns,
+                                        row[5] + text.count("\n"),
+                                        _tail_hash(head + appended),
+                                        next_chunk,
+                                        row[0],
+                                    ),
+                                )
+                                stats.appended += 1
+                                continue
+                            f.seek(0)
+                        data = f.read()
+                except OSError:
+                    continue
+
+                text = data.decode("utf-8", errors="replace")
+                if row is not None:
+                    file_id = row[0]
+                    _delete_chunks(conn, file_id)
+                    stats.reindexed += 1
+                else:
+                    file_id = conn.execute(
+                        "INSERT INTO files (space_id, path, inode, size, mtime_ns, lines, tail_hash) "
+                        "VALUES (?, ?, 0, 0, 0, 0, '')",
+                        (space_id, key),
+                    ).lastrowid
+                    stats.added += 1
+
+                next_chunk = _insert_chunks(conn, file_id, text, 1, 0)
+                conn.execute(
+                    "UPDATE files SET space_id = ?, inode = ?, size = ?, mtime_ns = ?, lines = ?, "
+                    "tail_hash = ?, next_chunk = ? WHERE id = ?",
+                    (
+                        space_id,
+                        st.st_ino,
+                        len(data),
+                        st.st_mtime_ns,
+                        text.count("\n"),
+                        _tail_hash(data),
+                        next_chunk,
+                        file_id,
+                    ),
+                )
+
+            for key, row in known.items():
+                if key not in seen:
+                    _delete_chunks(conn, row[0])
+                    conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+                    stats.removed += 1
+    finally:
+        if own_conn:
+            conn.close()
+
+    return stats
+
+
+def _quote_terms(query: str) -> str:
+    """Turn free text into an FTS5 query that ANDs every term."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+def search_logs(
+    config: AppConfig,
+    query: str,
+    limit: int = 20,
+    space_id: Optional[str] = None,
+    update: bool = True,
+) -> list[LogHit]:
+    """Search all spaces' logs, best matches first.
+
+    Args:
+        config: Application configuration
+        query: FTS5 query (plain words are ANDed; quotes, OR, NEAR and
+            prefix* work too). Falls back to literal terms if the query
+            is not valid FTS5 syntax.
+        limit: Maximum number of hits
+        space_id: Only search this space's logs
+        update: Bring the index up to date before searching
+
+    Returns:
+        Ranked hits pointing at the space, file and line
+    """
+    if not query.strip():
+        return []
+
+    conn = connect(config)
+    try:
+        if update:
+            update_index(config, conn)
+
+        sql = """
+            SELECT files.space_id, files.path, chunks.line,
+                   snippet(chunks, 0, '[', ']', '…', 12), bm25(chunks)
+            FROM chunks JOIN files ON files.id = chunks.file_id
+            WHERE chunks MATCH ?
+        """
+        params: list = []
+        if space_id is not None:
+            sql += " AND files.space_id = ?"
+            params.append(space_id)
+        sql += " ORDER BY bm25(chunks) LIMIT ?"
+        params.append(limit)
+
+        try:
+            rows = conn.execute(sql, [query, *params]).fetchall()
+        except sqlite3.OperationalError:
+            rows = conn.execute(sql, [_quote_terms(query), *params]).fetchall()
+    finally:
+        conn.close()
+
+    return [
+        LogHit(space_id=row[0], path=Path(row[1]), line=row[2], snippet=row[3], score=-row[4])
+        for row in rows
+    ]
@@ -0,0 +1,337 @@
+"""Live, merged tail of every space's logs/ directory.
+
+Driven entirely by inotify: each watched logs/ folder reports appended
+writes, and only the new bytes are read from the last known offset of each
+file. Lines come out in the order the kernel reported the writes, prefixed
+with their space ID.
+
+The number of inotify watches is bounded. When there are more spaces than
+watches, the most recently active logs/ folders are watched and the least
+recently active ones are evicted as new activity appears. The folders left
+unwatched are checked for new writes every RESCAN_INTERVAL seconds; an active
+one takes the watch of the least recently active folder, and its files are
+followed from where they were last read.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from claude_lan_manager import inotify
+from claude_lan_manager.config import AppConfig
+from claude_lan_manager.log_index import LOG_SUFFIXES
+
+DEFAULT_MAX_WATCHES = 4096
+
+# Largest read per file per event batch, so one chatty file can't starve the rest
+MAX_READ = 256 * 1024
+
+# Seconds between mtime scans of the spaces that don't fit in the watch budget
+RESCAN_INTERVAL = 5.0
+
+LOGS_MASK = (
+    inotify.IN_MODIFY
+    | inotify.IN_CREATE
+    | inotify.IN_MOVED_TO
+    | inotify.IN_DELETE_SELF
+    | inotify.IN_MOVE_SELF
+    | inotify.IN_ONLYDIR
+)
+DIR_MASK = inotify.IN_CREATE | inotify.IN_MOVED_TO | inotify.IN_ONLYDIR
+
+
+@dataclass(slots=True)
+class TailLine:
+    """One line appended to a space's log."""
+    space_id: str
+    path: Path
+    text: str
+    timestamp: float
+
+    def format(self) -> str:
+        return f"[{self.space_id}] {self.path.name}: {self.text}"
+
+
+@dataclass(slots=True)
+class _FileState:
+    inode: int
+    offset: int
+    partial: bytes = b""
+
+
+class LogTailer:
+    """Follows appends to log files across many spaces."""
+
+    def __init__(
+        self,
+        config: AppConfig,
+        space_ids: Optional[Iterable[str]] = None,
+        max_watches: Optional[int] = None,
+    ):
+        self.config = config
+        self._spaces = {
+            space.id: space for space in config.spaces.values()
+            if space_ids is None or space.id in space_ids
+        }
+
+        # Leave room for other inotify users (editors, file managers, ...)
+        limit = max(16, inotify.get_max_user_watches() // 2)
+        self.max_watches = min(max_watches or DEFAULT_MAX_WATCHES, limit)
+
+        self._inotify = inotify.Inotify()
+        self._logs_wds: OrderedDict[int, str] = OrderedDict()  # wd -> space_id, LRU order
+        self._space_wds: dict[int, str] = {}  # space dirs waiting for logs/ to appear
+        self._files: dict[Path, _FileState] = {}
+        self._backlog: dict[Path, str] = {}  # files with more appended data than one read
+        self.unwatched: set[str] = set()
+        self._scanned_at = time.time()  # wall clock, compared with mtimes
+        self._next_rescan = time.monotonic() + RESCAN_INTERVAL
+
+        self._base_wd = None
+        try:
+            self._base_wd = self._inotify.add_watch(config.spaces_base_path, DIR_MASK)
+        except OSError:
+            pass
+
+        # Watch the most recently active logs folders first
+        candidates = []
+        for space_id, space in self._spaces.items():
+            try:
+                candidates.append((space.logs_path.stat().st_mtime, space_id))
+            except OSError:
+                self._watch_space_dir(space_id)
+        candidates.sort(reverse=True)
+
+        for _mtime, space_id in candidates:
+            if len(self._logs_wds) >= self.max_watches:
+                self.unwatched.add(space_id)
+                # Know where the files end, to resume there when the space becomes active
+                self._track_files(space_id, from_end=True)
+                continue
+            self._watch_logs(space_id, from_end=True)
+
+    def fileno(self) -> int:
+        return self._inotify.fileno()
+
+    @property
+    def watched_count(self) -> int:
+        return len(self._logs_wds)
+
+    def _watch_space_dir(self, space_id: str) -> None:
+        """Wait for a space's logs/ folder to be created."""
+        if len(self._logs_wds) + len(self._space_wds) >= self.max_watches:
+            self.unwatched.add(space_id)
+            return
+        try:
+            wd = self._inotify.add_watch(self._spaces[space_id].path, DIR_MASK)
+        except OSError:
+            return  # the base path watch will tell us when the space appears
+        self._space_wds[wd] = space_id
+
+    def _watch_logs(self, space_id: str, from_end: bool) -> None:
+        logs_path = self._spaces[space_id].logs_path
+        if len(self._logs_wds) >= self.max_watches:
+            # Evict the least recently active folder; its offsets are kept for rescan()
+            old_wd, old_space = self._logs_wds.popitem(last=False)
+            self._inotify.rm_watch(old_wd)
+            self.unwatched.add(old_space)
+
+        try:
+            wd = self._inotify.add_watch(logs_path, LOGS_MASK)
+        except OSError:
+            return
+        self._logs_wds[wd] = space_id
+        self.unwatched.discard(space_id)
+        self._track_files(space_id, from_end)
+
+    def _track_files(self, space_id: str, from_end: bool) -> None:
+        """Note a space's log files; files seen before resume at their last offset.
+
+        Other files start at their end (existing content is history) or, with
+        from_end=False, at the start. Data past the offsets is read on the
+        next process() call.
+        """
+        logs_path = self._spaces[space_id].logs_path
+        previous = {path: self._files.pop(path) for path in [p for p in self._files if p.parent == logs_path]}
+        try:
+            entries = list(os.scandir(logs_path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.endswith(LOG_SUFFIXES) and entry.is_file():
+                path = Path(entry.path)
+                st = entry.stat()
+                state = previous.get(path)
+                if state is None or state.inode != st.st_ino or st.st_size < state.offset:
+                    state = _FileState(st.st_ino, st.st_size if from_end else 0)
+                self._files[path] = state
+                if st.st_size > state.offset:
+                    self._backlog[path] = space_id
+
+    def _unwatch_logs(self, wd: int) -> None:
+        """Forget a logs/ folder that was deleted or moved away, and wait for a new one."""
+        space_id = self._logs_wds.pop(wd)
+        logs_path = self._spaces[space_id].logs_path
+        for path in [p for p in self._files if p.parent == logs_path]:
+            del self._files[path]
+            self._backlog.pop(path, None)
+        if logs_path.is_dir():
+            # Replaced before we got here
+            self._watch_logs(space_id, from_end=False)
+        else:
+            self._watch_space_dir(space_id)
+
+    def rescan(self) -> None:
+        """Watch the unwatched spaces that were written to since the last scan.
+
+        Each one takes the watch of the least recently active folder.
+        """
+        since, self._scanned_at = self._scanned_at, time.time()
+        self._next_rescan = time.monotonic() + RESCAN_INTERVAL
+        active = []
+        for space_id in self.unwatched:
+            mtime = self._last_write(space_id)
+            # Allow for the coarse clock file times are taken from
+            if mtime is not None and mtime > since - 0.05:
+                active.append((mtime, space_id))
+        active.sort(reverse=True)
+        for _mtime, space_id in active[:self.max_watches]:
+            self._watch_logs(space_id, from_end=False)
+
+    def _last_write(self, space_id: str) -> Optional[float]:
+        """Latest mtime of a space's logs/ folder and its log files."""
+        logs_path = self._spaces[space_id].logs_path
+        try:
+            latest = logs_path.stat().st_mtime
+            with os.scandir(logs_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(LOG_SUFFIXES):
+                        latest = max(latest, entry.stat().st_mtime)
+        except OSError:
+            return None
+        return latest
+
+    def _read_appended(self, space_id: str, path: Path, now: float) -> list[TailLine]:
+        try:
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                state = self._files.get(path)
+                if state is None or state.inode != st.st_ino or st.st_size < state.offset:
+                    # New, replaced or truncated file: follow it from the start
+                    state = _FileState(st.st_ino, 0)
+                    self._files[path] = state
+                if st.st_size == state.offset:
+                    return []
+                f.seek(state.offset)
+                data = f.read(min(st.st_size - state.offset, MAX_READ))
+        except OSError:
+            return []
+
+        state.offset += len(data)
+        if state.offset < st.st_size:
+            self._backlog[path] = space_id
+        data = state.partial + data
+        *complete, state.partial = data.split(b"\n")
+        if len(state.partial) > MAX_READ:
+            # Don't buffer an endless line forever
+            complete.append(state.partial)
+            state.partial = b""
+        return [
+            TailLine(space_id, path, line.decode("utf-8", errors="replace").rstrip("\r"), now)
+            for line in complete
+        ]
+
+    def process(self, events: list[inotify.InotifyEvent]) -> list[TailLine]:
+        """Turn a batch of inotify events into the lines that were appended."""
+        lines: list[TailLine] = []
+        now = time.time()
+        # Coalesce repeated writes to the same file; continue partially read files first
+        pending: dict[Path, str] = self._backlog
+        self._backlog = {}
+
+        for event in events:
+            if event.mask & inotify.IN_Q_OVERFLOW:
+                # Events were dropped: check every followed file
+                for path in self._files:
+                    space_id = self._space_for_logs(path.parent)
+                    if space_id is not None:
+                        pending[path] = space_id
+                continue
+
+            if event.wd == self._base_wd:
+                space_id = event.name
+                if space_id in self._spaces and event.mask & inotify.IN_ISDIR:
+                    if self._spaces[space_id].logs_path.is_dir():
+                        self._watch_logs(space_id, from_end=False)
+                    else:
+                        self._watch_space_dir(space_id)
+                continue
+
+            if event.wd in self._space_wds:
+                if event.mask & inotify.IN_IGNORED:
+                    # The space folder itself is gone; the base path watch reports a new one
+                    del self._space_wds[event.wd]
+                elif event.name == "logs" and event.mask & inotify.IN_ISDIR:
+                    space_id = self._space_wds.pop(event.wd)
+                    self._inotify.rm_watch(event.wd)
+                    self._watch_logs(space_id, from_end=False)
+                continue
+
+            space_id = self._logs_wds.get(event.wd)
+            if space_id is None:
+                continue
+            if event.mask & (inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF | inotify.IN_IGNORED):
+                if event.mask & inotify.IN_MOVE_SELF:
+                    # A moved folder keeps its watch; deleted ones drop it themselves
+                    self._inotify.rm_watch(event.wd)
+                self._unwatch_logs(event.wd)
+                continue
+
+            self._logs_wds.move_to_end(event.wd)
+            if event.name.endswith(LOG_SUFFIXES):
+                pending[self._spaces[space_id].logs_path / event.name] = space_id
+
+        # Including existing data of folders that were just watched
+        pending.update(self._backlog)
+        self._backlog = {}
+        for path, space_id in pending.items():
+            lines.extend(self._read_appended(space_id, path, now))
+        return lines
+
+    def _space_for_logs(self, logs_path: Path) -> Optional[str]:
+        space_id = logs_path.parent.name
+        space = self._spaces.get(space_id)
+        return space_id if space is not None and space.logs_path == logs_path else None
+
+    @property
+    def has_backlog(self) -> bool:
+        """True when some file had more appended data than a single read takes."""
+        return bool(self._backlog)
+
+    def _rescan_due(self) -> Optional[float]:
+        """Rescan if it's time; returns the seconds until the next one, if any."""
+        if not self.unwatched:
+            return None
+        remaining = self._next_rescan - time.monotonic()
+        if remaining <= 0:
+            self.rescan()
+            remaining = RESCAN_INTERVAL
+        return remaining
+
+    def read(self) -> list[TailLine]:
+        """Read whatever is available without blocking."""
+        self._rescan_due()
+        return self.process(self._inotify.read_events())
+
+    def poll(self, timeout: Optional[float] = None) -> list[TailLine]:
+        """Wait up to timeout seconds for new lines."""
+        remaining = self._rescan_due()
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+        return self.process(self._inotify.wait(0 if self._backlog else timeout))
+
+    def close(self) -> None:
+        self._inotify.close()
@@ -0,0 +1,204 @@
+"""GUI views over space logs."""
+
+import threading
+
+from PyQt6.QtCore import QObject, QSocketNotifier, Qt, QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import QDesktopServices, QFont
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDockWidget,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPlainTextEdit,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from claude_lan_manager.config import AppConfig
+from claude_lan_manager.log_index import search_logs, update_index
+from claude_lan_manager.log_tail import RESCAN_INTERVAL, LogTailer
+from claude_lan_manager.styles import set_role
+
+# Lines kept in the live tail view
+TAIL_MAX_LINES = 5000
+
+
+class _IndexSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class LogSearchDialog(QDialog):
+    """Ranked full-text search over every space's logs/ folder."""
+
+    def __init__(self, config: AppConfig, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self._indexing = False
+
+        self.setWindowTitle("Search Logs")
+        self.resize(760, 480)
+
+        layout = QVBoxLayout(self)
+
+        self.query = QLineEdit()
+        self.query.setPlaceholderText('Search all space logs, e.g. router firewall or "dns" OR dhcp')
+        self.query.setClearButtonEnabled(True)
+        layout.addWidget(self.query)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["Space", "File", "Line", "Match"])
+        self.results.setRootIsDecorated(False)
+        self.results.setUniformRowHeights(True)
+        self.results.header().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.results.itemActivated.connect(self._open_hit)
+        layout.addWidget(self.results)
+
+        self.status = QLabel("")
+        set_role(self.status, "status")
+        layout.addWidget(self.status)
+
+        # Search as you type, once typing pauses
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(250)
+        self._debounce.timeout.connect(self._search)
+        self.query.textChanged.connect(self._debounce.start)
+        self.query.returnPressed.connect(self._search)
+
+        self._signals = _IndexSignals(self)
+        self._signals.finished.connect(self._on_indexed)
+        self._signals.failed.connect(self.status.setText)
+        self.refresh_index()
+
+    def refresh_index(self):
+        """Bring the index up to date in the background."""
+        if self._indexing:
+            return
+        self._indexing = True
+        self.status.setText("Indexing logs...")
+        config, signals = self.config, self._signals
+
+        def work():
+            try:
+                signals.finished.emit(update_index(config))
+            except Exception as e:
+                signals.failed.emit(f"Indexing failed: {e}")
+
+        threading.Thread(target=work, name="log-indexer", daemon=True).start()
+
+    def _on_indexed(self, stats):
+        self._indexing = False
+        self.status.setText(
+            f"{stats.scanned} log files indexed "
+            f"({stats.added + stats.appended + stats.reindexed} updated)"
+        )
+        if self.query.text().strip():
+            self._search()
+
+    def _search(self):
+        text = self.query.text().strip()
+        self.results.clear()
+        if not text:
+            return
+
+        try:
+            hits = search_logs(self.config, text, limit=200, update=False)
+        except Exception as e:
+            self.status.setText(f"Search failed: {e}")
+            return
+
+        for hit in hits:
+            item = QTreeWidgetItem([
+                hit.space_id,
+                hit.path.name,
+                str(hit.line),
+                " ".join(hit.snippet.split()),
+            ])
+            item.setData(0, Qt.ItemDataRole.UserRole, str(hit.path))
+            item.setToolTip(1, str(hit.path))
+            self.results.addTopLevelItem(item)
+
+        if not self._indexing:
+            self.status.setText(f"{len(hits)} matches")
+
+    def _open_hit(self, item: QTreeWidgetItem, _column: int):
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
+    def apply_config(self, config: AppConfig, _diff=None):
+        self.config = config
+
+
+class LogTailDock(QDockWidget):
+    """Dock showing a merged live feed of lines appended to any space's logs."""
+
+    def __init__(self, config: AppConfig, parent=None):
+        super().__init__("Live Logs", parent)
+        self.setObjectName("LiveLogsDock")
+        self._tailer = None
+        self._notifier = None
+
+        body = QWidget()
+        layout = QVBoxLayout(body)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setMaximumBlockCount(TAIL_MAX_LINES)
+        self.view.setFont(QFont("Monospace", 9))
+        self.view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.view)
+
+        self.status = QLabel("")
+        set_role(self.status, "status")
+        layout.addWidget(self.status)
+
+        # Spaces beyond the watch budget are only noticed by rescans
+        self._rescan = QTimer(self)
+        self._rescan.setInterval(int(RESCAN_INTERVAL * 1000))
+        self._rescan.timeout.connect(self._drain)
+
+        self.setWidget(body)
+        self.apply_config(config)
+
+    def apply_config(self, config: AppConfig, _diff=None):
+        """(Re)start following the logs of the configured spaces."""
+        self.stop()
+        try:
+            self._tailer = LogTailer(config)
+        except OSError as e:
+            self.status.setText(f"Live logs unavailable: {e}")
+            return
+
+        self._notifier = QSocketNotifier(self._tailer.fileno(), QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._drain)
+
+        message = f"Following {self._tailer.watched_count} spaces"
+        if self._tailer.unwatched:
+            message += f" ({len(self._tailer.unwatched)} inactive spaces checked every {RESCAN_INTERVAL:.0f} s)"
+        self.status.setText(message)
+        self._rescan.start()
+
+    def _drain(self, *_args):
+        if self._tailer is None:
+            return
+        lines = self._tailer.read()
+        if lines:
+            self.view.appendPlainText("\n".join(line.format() for line in lines))
+        if self._tailer.has_backlog:
+            # Give the event loop a turn before reading more of a busy file
+            QTimer.singleShot(0, self._drain)
+
+    def stop(self):
+        self._rescan.stop()
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if self._tailer is not None:
+            self._tailer.close()
+            self._tailer = None
@@ -0,0 +1,268 @@
+"""A minimal MCP client for the Streamable HTTP transport.
+
+Just enough of the protocol to talk to device servers without a dependency:
+JSON-RPC messages are POSTed to the endpoint over a kept-alive HTTP/1.1
+connection, and the answer comes back either as a JSON body or as an SSE
+stream carrying the response. Server-initiated requests and standalone GET
+streams aren't supported; device servers don't use them.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from claude_lan_manager import __version__
+
+PROTOCOL_VERSION = "2025-03-26"
+CLIENT_INFO = {"name": "claude-lan-manager", "version": __version__}
+
+# Largest response body accepted, in bytes
+MAX_BODY = 16 * 1024 * 1024
+
+
+class McpError(Exception):
+    """The server couldn't be reached, didn't speak MCP or returned an error."""
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code  # JSON-RPC error code, when the server sent one
+        self.data = data
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    status: int
+    headers: dict[str, str]  # Lower-cased names
+    body: bytes
+
+
+async def read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    """Read header lines up to the blank line that ends them."""
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+        if line in (b"\r\n", b"\n"):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def read_body(reader: asyncio.StreamReader, headers: dict[str, str], until_eof: bool) -> bytes:
+    """Read a message body framed as its headers say (chunked, sized, or up to EOF)."""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await read_headers(reader)  # Trailers
+                return bytes(body)
+            if len(body) + size > MAX_BODY:
+                raise McpError("response too large")
+            body += await reader.readexactly(size)
+            await reader.readline()
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > MAX_BODY:
+            raise McpError("response too large")
+        return await reader.readexactly(length)
+    return await reader.read(MAX_BODY) if until_eof else b""
+
+
+async def read_response(reader: asyncio.StreamReader) -> HttpResponse:
+    """Read one HTTP/1.1 response (skipping any 1xx interim responses)."""
+    while True:
+        status_line = await reader.readline()
+        parts = status_line.split(None, 2)
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+            raise McpError("not an HTTP server")
+        status = int(parts[1])
+        headers = await read_headers(reader)
+        if status >= 200:
+            break
+    body = b"" if status in (204, 304) else await read_body(reader, headers, until_eof=True)
+    return HttpResponse(status, headers, body)
+
+
+def parse_sse(body: bytes) -> list[str]:
+    """Data of each event in an SSE stream."""
+    events, data = [], []
+    for line in body.decode("utf-8", "replace").splitlines():
+        if not line:
+            if data:
+                events.append("\n".join(data))
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+    if data:
+        events.append("\n".join(data))
+    return events
+
+
+def response_messages(response: HttpResponse) -> list[dict]:
+    """JSON-RPC messages in a POST response, whether JSON or an SSE stream."""
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        if content_type == "text/event-stream":
+            payloads = [json.loads(event) for event in parse_sse(response.body)]
+        else:
+            payloads = [json.loads(response.body)]
+    except ValueError:
+        raise McpError("invalid JSON-RPC response") from None
+    messages = []
+    for payload in payloads:
+        messages.extend(payload if isinstance(payload, list) else [payload])
+    return [message for message in messages if isinstance(message, dict)]
+
+
+class McpConnection:
+    """A session with one MCP server, over one kept-alive HTTP connection.
+
+    Requests are sent one at a time; the connection is re-opened when the
+    server closes it between requests.
+    """
+
+    def __init__(self, host: str, port: int, path: str = "/mcp", timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+        self.session_id: Optional[str] = None
+        self.protocol_version: Optional[str] = None
+        self.server_info: dict = {}
+        self.initialized = False
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._next_id = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def initialize(self) -> dict:
+        """Open the MCP session; returns the server's initialize result."""
+        result = await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO,
+        })
+        if not isinstance(result, dict):
+            raise McpError("invalid initialize result")
+        self.protocol_version = result.get("protocolVersion")
+        self.server_info = result.get("serverInfo") or {}
+        await self.notify("notifications/initialized")
+        self.initialized = True
+        return result
+
+    async def request(self, method: str, params: Optional[dict] = None) -> Any:
+        """Send a request and return its result; raises McpError on any failure."""
+        self._next_id += 1
+        message_id = self._next_id
+        message = {"jsonrpc": "2.0", "id": message_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        response = await self._post(message)
+        if response.status == 404 and self.session_id is not None:
+            self.session_id = None
+            self.initialized = False
+            raise McpError("session expired")
+        if response.status != 200:
+            raise McpError(f"HTTP {response.status}")
+        for reply in response_messages(response):
+            if reply.get("id") != message_id:
+                continue
+            if "error" in reply:
+                error = reply["error"] if isinstance(reply["error"], dict) else {}
+                raise McpError(str(error.get("message", "error")), error.get("code"), error.get("data"))
+            return reply.get("result")
+        raise McpError(f"no response to {method}")
+
+    async def notify(self, method: str, params: Optional[dict] = None) -> None:
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        response = await self._post(message)
+        if response.status not in (200, 202, 204):
+            raise McpError(f"HTTP {response.status}")
+
+    async def close(self) -> None:
+        """End the session (best effort) and close the connection."""
+        if self.session_id is not None and self.connected:
+            try:
+                await self._exchange("DELETE", b"")
+            except (McpError, OSError, EOFError, TimeoutError):
+                pass
+        self.session_id = None
+        self.initialized = False
+        self._disconnect()
+
+    async def _post(self, message: dict) -> HttpResponse:
+        return await self._exchange("POST", json.dumps(message).encode())
+
+    async def _exchange(self, method: str, body: bytes) -> HttpResponse:
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    return await self._exchange_once(method, body)
+            except TimeoutError:
+                self._disconnect()
+                raise McpError("timed out") from None
+            except EOFError:
+                self._disconnect()
+                raise McpError("connection closed") from None
+            except OSError as e:
+                self._disconnect()
+                raise McpError(f"connection failed: {e.strerror or e}") from None
+            except McpError:
+                self._disconnect()
+                raise
+
+    async def _exchange_once(self, method: str, body: bytes) -> HttpResponse:
+        reused = self.connected
+        if not reused:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        headers = [
+            f"{method} {self.path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json, text/event-stream",
+            f"Content-Length: {len(body)}",
+        ]
+        if body:
+            headers.append("Content-Type: application/json")
+        if self.session_id is not None:
+            headers.append(f"Mcp-Session-Id: {self.session_id}")
+        if self.protocol_version is not None:
+            headers.append(f"MCP-Protocol-Version: {self.protocol_version}")
+        request = ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+        try:
+            self._writer.write(request)
+            response = await read_response(self._reader)
+        except (OSError, EOFError):
+            if not reused:
+                raise
+            # Nothing came back on a kept-alive connection: the server closed it
+            # while idle, before reading the request. Try once on a fresh one.
+            self._disconnect()
+            return await self._exchange_once(method, body)
+
+        headers = response.headers
+        if "mcp-session-id" in headers:
+            self.session_id = headers["mcp-session-id"]
+        framed = "content-length" in headers or "chunked" in headers.get("transfer-encoding", "").lower()
+        if headers.get("connection", "").lower() == "close" or not framed:
+            self._disconnect()
+        return response
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
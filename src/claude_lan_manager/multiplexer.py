@@ -1,237 +1,184 @@
 """Terminal multiplexer GUI for Claude LAN Manager.
 
-Orchestrates Konsole tabs - each target opens a new tab running Claude Code
-in the appropriate space with isolated MCP configuration.
+A single window: the targets in a sidebar on the left, and on the right a
+tiled terminal pane per opened target, running Claude Code in the
+appropriate space with isolated MCP configuration (see
+claude_lan_manager.terminal_pane). Clicking a target that already has a
+pane focuses it.
+
+With --external, targets are opened in terminal tabs (or tmux windows, see
+claude_lan_manager.terminals) instead, and the window is just the sidebar.
 """
 
-import subprocess
 import sys
 from functools import partial
 
 from PyQt6.QtWidgets import (
     QApplication,
-    QMainWindow,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
-    QPushButton,
     QLabel,
-    QFrame,
-    QScrollArea,
-    QSizePolicy,
 )
-from PyQt6.QtCore import Qt, QProcess
+from PyQt6.QtCore import QProcess, QTimer
 from PyQt6.QtGui import QFont
 
+from claude_lan_manager.app import build_parser, parse_args, watch_config
 from claude_lan_manager.config import AppConfig, Space
-
-
-class TargetButton(QPushButton):
-    """Button for a target in the sidebar."""
-
-    def __init__(self, space: Space, parent=None):
-        super().__init__(parent)
-        self.space = space
-
-        device_count = len(space.devices)
-        self.setText(f"{space.name}\n{device_count} device{'s' if device_count != 1 else ''}")
-
-        self.setMinimumHeight(50)
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
-        if space.description:
-            self.setToolTip(space.description)
-
-        self._apply_style()
-
-    def _apply_style(self):
-        """Apply styling based on category."""
-        if self.space.category == "consolidated":
-            color = "#4a90d9"
-            hover = "#5a9fe8"
-        elif self.space.category == "group":
-            color = "#26a69a"
-            hover = "#2ebfb1"
-        else:
-            color = "#6c8ebf"
-            hover = "#7c9ecf"
-
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {color};
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 14px;
-                text-align: left;
-                font-weight: 600;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {hover};
-            }}
-            QPushButton:pressed {{
-                background-color: {color};
-            }}
-        """)
-
-
-class MultiplexerWindow(QMainWindow):
-    """Main window that orchestrates Konsole tabs."""
-
-    def __init__(self, config: AppConfig):
-        super().__init__()
-        self.config = config
+from claude_lan_manager.launch_trace import LaunchTrace
+from claude_lan_manager.launcher import launch_claude_in_terminal
+from claude_lan_manager.terminals import EmbeddedBackend, TmuxBackend, get_backend
+from claude_lan_manager.reload import ConfigDiff
+from claude_lan_manager.spaces_window import SpacesWindow
+from claude_lan_manager.styles import STYLESHEET, set_role
+from claude_lan_manager.terminal_pane import PaneGrid
+
+SECTION_TITLES = {
+    "consolidated": "LAN Manager",
+    "group": "Groups",
+    "individual": "Devices",
+}
+
+SIDEBAR_WIDTH = 300
+
+
+class MultiplexerWindow(SpacesWindow):
+    """Main window: targets in a sidebar, their sessions in terminal panes (or tabs)."""
+
+    def __init__(self, config: AppConfig, embedded: bool = True):
+        launch = launch_claude_in_terminal
+        if embedded:
+            launch = partial(launch_claude_in_terminal, backend=EmbeddedBackend())
+        super().__init__(config, SECTION_TITLES, launch)
+        self.embedded = embedded
         self.active_sessions: dict[str, int] = {}  # space_id -> PID
 
-        self.setWindowTitle("Claude LAN Manager")
-        self.setMinimumSize(280, 500)
-        self.setMaximumWidth(320)
-
-        # Central widget
-        central = QWidget()
-        self.setCentralWidget(central)
-        layout = QVBoxLayout(central)
+        # Sidebar
+        sidebar = QWidget()
+        layout = QVBoxLayout(sidebar)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
+        if embedded:
+            # Sessions are tiled next to the sidebar
+            self._panes = PaneGrid("Click a target to open Claude here")
+            self._panes.pane_closed.connect(self._on_pane_closed)
+            central = QWidget()
+            outer = QHBoxLayout(central)
+            outer.setContentsMargins(0, 0, 6, 6)
+            outer.setSpacing(0)
+            sidebar.setFixedWidth(SIDEBAR_WIDTH)
+            outer.addWidget(sidebar)
+            outer.addWidget(self._panes, 1)
+            self.setCentralWidget(central)
+            self.setMinimumSize(900, 560)
+        else:
+            self._panes = None
+            self.setCentralWidget(sidebar)
+            self.setMinimumSize(280, 500)
+            self.setMaximumWidth(320)
 
         # Header
         header = QLabel("Claude LAN Manager")
         header.setFont(QFont("Sans", 16, QFont.Weight.Bold))
-        header.setStyleSheet("color: #333; padding-bottom: 4px;")
-        layout.addWidget(header)
-
-        subtitle = QLabel("Click to open Claude in Konsole")
-        subtitle.setStyleSheet("color: #666; font-size: 11px; padding-bottom: 8px;")
-        layout.addWidget(subtitle)
-
-        # Scroll area for targets
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        scroll.setStyleSheet("background-color: transparent;")
-        layout.addWidget(scroll)
-
-        scroll_content = QWidget()
-        scroll_content.setStyleSheet("background-color: transparent;")
-        scroll.setWidget(scroll_content)
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-        scroll_layout.setSpacing(6)
-
-        # Group by category
-        consolidated = []
-        groups = []
-        individual = []
-
-        for space in config.spaces.values():
-            if space.category == "consolidated":
-                consolidated.append(space)
-            elif space.category == "group":
-                groups.append(space)
-            else:
-                individual.append(space)
-
-        # Add sections
-        if consolidated:
-            self._add_section(scroll_layout, "LAN Manager", consolidated)
-        if groups:
-            self._add_section(scroll_layout, "Groups", groups)
-        if individual:
-            self._add_section(scroll_layout, "Devices", individual)
-
-        scroll_layout.addStretch()
-
-        # Status bar
-        self.statusBar().showMessage("Ready")
-
-    def _add_section(self, layout: QVBoxLayout, title: str, spaces: list[Space]):
-        """Add a section of targets."""
-        header = QLabel(title)
-        header.setStyleSheet("""
-            color: #555;
-            font-size: 11px;
-            font-weight: bold;
-            padding: 12px 0 6px 0;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        """)
+        set_role(header, "title")
         layout.addWidget(header)
 
-        for space in spaces:
-            btn = TargetButton(space)
-            btn.clicked.connect(partial(self._launch_space, space))
-            layout.addWidget(btn)
+        self._subtitle = QLabel()
+        set_role(self._subtitle, "subtitle")
+        self._update_subtitle()
+        layout.addWidget(self._subtitle)
+
+        layout.addWidget(self._targets)
+
+    def apply_config(self, config: AppConfig, diff: ConfigDiff):
+        """Update the window for a config change."""
+        super().apply_config(config, diff)
+        self._update_subtitle()
+
+    def _update_subtitle(self):
+        if self.embedded:
+            self._subtitle.setText("Click to open Claude in a pane")
+            return
+        backend = get_backend(self.config)
+        if isinstance(backend, TmuxBackend):
+            self._subtitle.setText("Click to open Claude in a tmux window")
+        else:
+            self._subtitle.setText(f"Click to open Claude in {backend.name}")
 
     def _launch_space(self, space: Space):
-        """Launch Claude in a new Konsole tab for this space."""
-        # Build the claude command
-        mcp_config = space.mcp_json_path
-
-        claude_cmd = (
-            f'cd "{space.path}" && '
-            f'{self.config.claude_code_cmd} '
-            f'--strict-mcp-config '
-            f'--mcp-config "{mcp_config}"'
-        )
-
-        # Launch in Konsole with a named tab
-        try:
-            subprocess.Popen([
-                "konsole",
-                "--new-tab",
-                "-p", f"tabtitle={space.name}",
-                "-e", "bash", "-c", claude_cmd
-            ])
-            self.statusBar().showMessage(f"Opened: {space.name}")
-        except FileNotFoundError:
-            # Fallback: try generic x-terminal-emulator
-            try:
-                subprocess.Popen([
-                    "x-terminal-emulator",
-                    "-e", "bash", "-c", claude_cmd
-                ])
-                self.statusBar().showMessage(f"Opened: {space.name}")
-            except FileNotFoundError:
-                self.statusBar().showMessage("Error: No terminal emulator found")
+        """Launch Claude for this space in the background (or focus its pane)."""
+        pane = self._panes.pane(space.id) if self._panes is not None else None
+        if pane is not None and pane.running:
+            self._panes.focus(space.id)
+            self.statusBar().showMessage(f"Already open: {space.name}")
+            return
+        if not self._launcher.submit(self.config, space):
+            self.statusBar().showMessage(f"Already opening: {space.name}")
+
+    def _on_launch_started(self, space_id: str):
+        self.statusBar().showMessage(f"Opening: {self._space_name(space_id)}...")
+
+    def _on_launched(self, space_id: str, session):
+        if session.pty is not None:
+            self._panes.add(space_id, self._space_name(space_id), session.pty)
+        if session.reused:
+            self.statusBar().showMessage(f"Already open: {self._space_name(space_id)} in {session.describe()}")
+        else:
+            self.statusBar().showMessage(f"Opened: {self._space_name(space_id)} in {session.describe()}")
+        if self._sessions is not None:
+            self._sessions.refresh()
+
+    def _on_sessions_updated(self, sessions: dict):
+        self.active_sessions = {
+            space_id: records[0].pid or records[0].launcher_pid
+            for space_id, records in sessions.items()
+        }
+        super()._on_sessions_updated(sessions)
+
+    def _on_launch_failed(self, space_id: str, message: str):
+        self.statusBar().showMessage(f"Error: {message}")
+
+    def _on_pane_closed(self, space_id: str):
+        self.statusBar().showMessage(f"Closed: {self._space_name(space_id)}")
+        if self._sessions is not None:
+            self._sessions.refresh()
+
+    def closeEvent(self, event):
+        # Hang up the sessions in our panes, as closing a terminal window would
+        if self._panes is not None:
+            self._panes.close_all()
+        super().closeEvent(event)
 
 
 def main():
     """Main entry point."""
-    config = AppConfig.load()
+    parser = build_parser("Claude LAN Manager multiplexer")
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help="Open sessions with the configured terminal_emulator instead of in panes"
+    )
+    args, qt_args = parse_args(parser=parser)
+    with LaunchTrace().span("config_load"):
+        config = AppConfig.load(use_cache=not args.no_config_cache)
 
     if not config.spaces:
         print("No spaces configured. Please create a config file.")
         print("See config/config.example.yaml for an example.")
         sys.exit(1)
 
-    app = QApplication(sys.argv)
+    app = QApplication([sys.argv[0], *qt_args])
     app.setApplicationName("Claude LAN Manager")
     app.setApplicationVersion("0.1.0")
 
     # Light theme
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #f5f5f5;
-        }
-        QWidget {
-            background-color: #f5f5f5;
-            color: #333;
-        }
-        QStatusBar {
-            background-color: #e8e8e8;
-            color: #666;
-            border-top: 1px solid #ddd;
-            font-size: 11px;
-        }
-        QScrollArea {
-            background-color: transparent;
-        }
-    """)
+    app.setStyleSheet(STYLESHEET)
 
-    window = MultiplexerWindow(config)
+    window = MultiplexerWindow(config, embedded=not args.external)
     window.show()
 
+    QTimer.singleShot(0, partial(watch_config, window, config, use_cache=not args.no_config_cache))
+
     sys.exit(app.exec())
 
 
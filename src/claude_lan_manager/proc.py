@@ -0,0 +1,200 @@
+"""Minimal readers for Linux /proc.
+
+Just enough to find Claude processes, follow their process trees, tell a
+live process from a recycled PID and add up what a tree uses, without
+depending on psutil.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Whether the kernel lists a task's children (CONFIG_PROC_CHILDREN); without
+# it, following a process tree takes a snapshot() of every process
+HAS_CHILDREN = os.path.exists(f"/proc/self/task/{os.getpid()}/children")
+
+
+@dataclass(slots=True)
+class ProcStat:
+    """The fields of /proc/<pid>/stat we use."""
+    pid: int
+    ppid: int
+    state: str
+    utime: int  # clock ticks
+    stime: int  # clock ticks
+    starttime: int  # clock ticks after boot; with pid, identifies a process
+    rss_pages: int
+
+    @property
+    def cpu_ticks(self) -> int:
+        return self.utime + self.stime
+
+    @property
+    def rss_bytes(self) -> int:
+        return self.rss_pages * PAGE_SIZE
+
+
+def read_stat(pid: int) -> Optional[ProcStat]:
+    """Read /proc/<pid>/stat, or None if the process is gone."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses; it ends at the last ')'
+    fields = data[data.rindex(b")") + 2:].split()
+    return ProcStat(
+        pid=pid,
+        ppid=int(fields[1]),
+        state=fields[0].decode(),
+        utime=int(fields[11]),
+        stime=int(fields[12]),
+        starttime=int(fields[19]),
+        rss_pages=int(fields[21]),
+    )
+
+
+def started_at(stat: ProcStat) -> float:
+    """When a process started, as a Unix timestamp (to the clock tick).
+
+    /proc/stat's boot time is rounded to the second, so this goes through the
+    boot-time clock instead.
+    """
+    uptime = time.clock_gettime(time.CLOCK_BOOTTIME)
+    return time.time() - uptime + stat.starttime / CLK_TCK
+
+
+def read_cmdline(pid: int) -> list[str]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    return [arg.decode(errors="replace") for arg in data.split(b"\0")[:-1]]
+
+
+def count_fds(pid: int) -> int:
+    """Number of open file descriptors (0 if the process is gone or not ours)."""
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return 0
+
+
+def iter_pids() -> Iterator[int]:
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return
+    for entry in entries:
+        if entry.isdigit():
+            yield int(entry)
+
+
+def is_alive(pid: int, starttime: Optional[int] = None) -> bool:
+    """Check a process exists (and, given its start time, that the PID wasn't reused)."""
+    stat = read_stat(pid)
+    if stat is None or stat.state == "Z":
+        return False
+    return starttime is None or stat.starttime == starttime
+
+
+def pid_exists(pid: int) -> bool:
+    """Check a PID is in use, without reading /proc."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # someone else's process
+    return True
+
+
+def read_children(pid: int) -> list[int]:
+    """Direct children of a process (see HAS_CHILDREN)."""
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return []
+    children = []
+    for tid in tasks:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children", "rb") as f:
+                children.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass  # the thread exited
+    return children
+
+
+def process_tree(pid: int, starttime: Optional[int] = None) -> dict[int, ProcStat]:
+    """Stat a process and its descendants, without scanning every process.
+
+    Empty if the process is gone, a zombie or (given its start time) a recycled
+    PID. Needs HAS_CHILDREN to find the descendants.
+    """
+    if not pid_exists(pid):
+        return {}
+    stat = read_stat(pid)
+    if stat is None or stat.state == "Z" or (starttime is not None and stat.starttime != starttime):
+        return {}
+    stats = {pid: stat}
+    tree = [pid]
+    for parent in tree:
+        for child in read_children(parent):
+            if child not in stats and (child_stat := read_stat(child)) is not None:
+                stats[child] = child_stat
+                tree.append(child)
+    return stats
+
+
+def snapshot() -> dict[int, ProcStat]:
+    """Stat every process on the system."""
+    stats = {}
+    for pid in iter_pids():
+        stat = read_stat(pid)
+        if stat is not None:
+            stats[pid] = stat
+    return stats
+
+
+def children_map(stats: dict[int, ProcStat]) -> dict[int, list[int]]:
+    children: dict[int, list[int]] = {}
+    for stat in stats.values():
+        children.setdefault(stat.ppid, []).append(stat.pid)
+    return children
+
+
+def descendants(pid: int, children: dict[int, list[int]]) -> list[int]:
+    """A process and all its descendants, parents first."""
+    tree = [pid]
+    for parent in tree:
+        tree.extend(children.get(parent, ()))
+    return tree
+
+
+def ancestors(pid: int, stats: dict[int, ProcStat]) -> Iterator[int]:
+    """Parents of a process, nearest first."""
+    seen = {pid}
+    stat = stats.get(pid)
+    while stat is not None and stat.ppid not in seen and stat.ppid > 1:
+        seen.add(stat.ppid)
+        yield stat.ppid
+        stat = stats.get(stat.ppid)
+
+
+def boot_time() -> float:
+    """System boot time as a Unix timestamp."""
+    try:
+        with open("/proc/stat") as f:
+            for line in f:
+                if line.startswith("btime "):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
@@ -0,0 +1,219 @@
+"""A program running on a pseudo-terminal, for the embedded terminal panes.
+
+Each session owns a pty and a `vt.Screen`, and one I/O thread that does all
+reads and writes on the pty master: output is read in bounded chunks and
+fed to the screen a slice at a time under the session lock, so a view can
+paint between slices and nothing waits on the GUI thread. Keystrokes queued
+by write() are sent by the same thread once the pty can take them, so a big
+paste never blocks the caller either.
+
+Sessions are independent: a program flooding its terminal only keeps its
+own thread busy, and the view is told about new output at most once until it
+collects the damage (see take_damage()), however much arrives in between.
+"""
+
+import codecs
+import fcntl
+import os
+import select
+import signal
+import struct
+import subprocess
+import termios
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from claude_lan_manager.vt import SCROLLBACK_LINES, Screen
+
+# Largest read from the pty at once
+READ_CHUNK = 64 * 1024
+
+# Characters fed to the screen per lock hold, so painting never waits long
+FEED_SLICE = 4096
+
+# Largest write to the pty at once
+WRITE_CHUNK = 4096
+
+
+def _set_controlling_tty():
+    """Make the pty (our stdin) the controlling terminal of the new session."""
+    fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+
+
+class PtySession:
+    """A program on a pseudo-terminal, its screen and the thread serving both."""
+
+    def __init__(
+        self,
+        argv: list[str],
+        cwd: Optional[Path] = None,
+        env: Optional[dict[str, str]] = None,
+        cols: int = 80,
+        rows: int = 24,
+        scrollback: int = SCROLLBACK_LINES,
+    ):
+        self.screen = Screen(cols, rows, scrollback)
+        self.lock = threading.Lock()
+        self.exit_status: Optional[int] = None
+
+        # Called from the I/O thread: on_output when there is new damage to
+        # collect, on_exit with the exit status once the program is gone
+        self.on_output: Optional[Callable[[], None]] = None
+        self.on_exit: Optional[Callable[[int], None]] = None
+
+        env = dict(os.environ if env is None else env)
+        env["TERM"] = "xterm-256color"
+        env["COLORTERM"] = "truecolor"
+        env.pop("COLUMNS", None)
+        env.pop("LINES", None)
+
+        master, slave = os.openpty()
+        try:
+            self._set_size(master, cols, rows)
+            self.process = subprocess.Popen(
+                argv,
+                stdin=slave,
+                stdout=slave,
+                stderr=slave,
+                cwd=cwd,
+                env=env,
+                start_new_session=True,
+                preexec_fn=_set_controlling_tty,
+            )
+        except BaseException:
+            os.close(master)
+            raise
+        finally:
+            os.close(slave)
+        self.pid = self.process.pid
+        self._master = master
+        os.set_blocking(master, False)
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._outgoing = bytearray()
+        self._notified = False
+        self._closing = False
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._thread = threading.Thread(target=self._run, name=f"pty-{self.pid}", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self.exit_status is None
+
+    @staticmethod
+    def _set_size(fd: int, cols: int, rows: int) -> None:
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+
+    def take_damage(self) -> set[int]:
+        """Rows changed since the last call; re-arms on_output."""
+        with self.lock:
+            self._notified = False
+            return self.screen.take_damage()
+
+    def write(self, data: bytes) -> None:
+        """Send input to the program (queued; never blocks)."""
+        if not data or not self.running:
+            return
+        with self.lock:
+            self._outgoing += data
+        self._wake()
+
+    def resize(self, cols: int, rows: int) -> None:
+        """Resize the screen and the pty; the program gets SIGWINCH."""
+        with self.lock:
+            if (cols, rows) == (self.screen.cols, self.screen.rows):
+                return
+            self.screen.resize(cols, rows)
+            if self._master >= 0:
+                try:
+                    self._set_size(self._master, cols, rows)
+                except OSError:
+                    pass
+        self._notify()
+
+    def terminate(self) -> None:
+        """Hang up the terminal, like closing a terminal window (SIGHUP to its programs)."""
+        if self.running:
+            try:
+                os.killpg(self.pid, signal.SIGHUP)
+            except OSError:
+                pass
+        self._closing = True
+        self._wake()
+
+    def _wake(self) -> None:
+        with self.lock:
+            if self._wake_write < 0:
+                return
+            try:
+                os.write(self._wake_write, b"\0")
+            except OSError:
+                pass
+
+    def _notify(self) -> None:
+        with self.lock:
+            if self._notified:
+                return
+            self._notified = True
+        callback = self.on_output
+        if callback is not None:
+            callback()
+
+    def _run(self) -> None:
+        master = self._master
+        try:
+            while not self._closing:
+                writing = [master] if self._outgoing else []
+                readable, writable, _ = select.select([master, self._wake_read], writing, [])
+                if self._wake_read in readable:
+                    try:
+                        os.read(self._wake_read, 4096)
+                    except OSError:
+                        pass
+                if writable:
+                    with self.lock:
+                        chunk = bytes(self._outgoing[:WRITE_CHUNK])
+                    try:
+                        written = os.write(master, chunk)
+                    except BlockingIOError:
+                        written = 0
+                    except OSError:
+                        break
+                    with self.lock:
+                        del self._outgoing[:written]
+                if master in readable:
+                    try:
+                        data = os.read(master, READ_CHUNK)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        break  # EIO: every program on the terminal has exited
+                    if not data:
+                        break
+                    self._feed(self._decoder.decode(data))
+        finally:
+            with self.lock:
+                for fd in (master, self._wake_read, self._wake_write):
+                    os.close(fd)
+                self._master = self._wake_write = -1
+            status = self.process.wait()
+            self.exit_status = status
+            self._notify()
+            callback = self.on_exit
+            if callback is not None:
+                callback(status)
+
+    def _feed(self, text: str) -> None:
+        screen = self.screen
+        for start in range(0, len(text), FEED_SLICE):
+            with self.lock:
+                screen.feed(text[start:start + FEED_SLICE])
+        with self.lock:
+            replies = screen.take_replies()
+            if replies:
+                self._outgoing += replies.encode()
+        self._notify()
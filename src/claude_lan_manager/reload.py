@@ -0,0 +1,285 @@
+"""Config hot-reload: structural diffs and targeted space regeneration."""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from claude_lan_manager import inotify
+from claude_lan_manager.artifacts import ARTIFACT_NAMES, MCP_JSON, SpaceManifest, sync_space
+from claude_lan_manager.config import FRAGMENT_DIR_NAME, AppConfig, Space
+from claude_lan_manager.inventory import CATEGORIES, normalize_category
+from claude_lan_manager.templates import TEMPLATE_DIR_NAME, get_template
+
+# Events on the config file's directory that may mean the file changed.
+# Editors often save by writing a temp file and renaming it over the original.
+CONFIG_EVENT_MASK = (
+    inotify.IN_CLOSE_WRITE
+    | inotify.IN_MOVED_TO
+    | inotify.IN_CREATE
+    | inotify.IN_DELETE
+    | inotify.IN_MOVED_FROM
+)
+
+
+@dataclass
+class ConfigDiff:
+    """Structural difference between two configurations."""
+    added_devices: list[str] = field(default_factory=list)
+    removed_devices: list[str] = field(default_factory=list)
+    changed_devices: list[str] = field(default_factory=list)
+    added_spaces: list[str] = field(default_factory=list)
+    removed_spaces: list[str] = field(default_factory=list)
+    changed_spaces: list[str] = field(default_factory=list)
+    # Categories whose CLAUDE.md template changed
+    changed_templates: list[str] = field(default_factory=list)
+    # Spaces whose generated CLAUDE.md/.mcp.json would differ
+    regenerate: list[str] = field(default_factory=list)
+    settings_changed: bool = False
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_devices or self.removed_devices or self.changed_devices
+            or self.added_spaces or self.removed_spaces or self.changed_spaces
+            or self.changed_templates or self.settings_changed
+        )
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        parts = []
+        for label, items in (
+            ("+dev", self.added_devices),
+            ("-dev", self.removed_devices),
+            ("~dev", self.changed_devices),
+            ("+space", self.added_spaces),
+            ("-space", self.removed_spaces),
+            ("~space", self.changed_spaces),
+            ("~template", self.changed_templates),
+        ):
+            if items:
+                parts.append(f"{label} {len(items)}")
+        if self.settings_changed:
+            parts.append("settings")
+        return ", ".join(parts) if parts else "no changes"
+
+
+def template_keys(config: AppConfig) -> dict[str, tuple]:
+    """Source key of each category's CLAUDE.md template; changes with the template file."""
+    return {category: get_template(category, config.template_dir).key for category in CATEGORIES}
+
+
+def diff_configs(
+    old: AppConfig,
+    new: AppConfig,
+    old_templates: Optional[dict[str, tuple]] = None,
+) -> ConfigDiff:
+    """Compute the structural difference between two configurations.
+
+    Args:
+        old: Previously active configuration
+        new: Newly loaded configuration
+        old_templates: template_keys() of the old configuration when it became
+            active, to notice edited template files (by default only a moved
+            template directory is noticed)
+    """
+    diff = ConfigDiff()
+
+    diff.settings_changed = (
+        old.spaces_base_path != new.spaces_base_path
+        or old.terminal_emulator != new.terminal_emulator
+        or old.claude_code_cmd != new.claude_code_cmd
+        or old.network != new.network
+        or old.session_pool != new.session_pool
+        or old.bulk_launch != new.bulk_launch
+        or old.health != new.health
+        or old.gateway != new.gateway
+        or old.response_cache != new.response_cache
+    )
+
+    for dev_id, device in new.devices.items():
+        previous = old.devices.get(dev_id)
+        if previous is None:
+            diff.added_devices.append(dev_id)
+        elif previous != device:
+            diff.changed_devices.append(dev_id)
+    diff.removed_devices = [dev_id for dev_id in old.devices if dev_id not in new.devices]
+
+    # Device IDs whose resolved Device differs between configs
+    touched_devices = set(diff.added_devices) | set(diff.removed_devices) | set(diff.changed_devices)
+
+    templates = template_keys(new)
+    previous_templates = template_keys(old) if old_templates is None else old_templates
+    diff.changed_templates = [
+        category for category in CATEGORIES if templates[category] != previous_templates.get(category)
+    ]
+
+    regenerate = []
+    for space_id, space in new.spaces.items():
+        previous = old.spaces.get(space_id)
+        if previous is None:
+            diff.added_spaces.append(space_id)
+            regenerate.append(space_id)
+            continue
+
+        if previous != space:
+            diff.changed_spaces.append(space_id)
+
+        # CLAUDE.md and .mcp.json depend on every field of the space, its resolved
+        # devices, its template and whether it goes through the gateway (the
+        # same inputs as artifacts.space_fingerprint())
+        if (
+            previous != space
+            or old.network != new.network
+            or old.gateway != new.gateway
+            or normalize_category(space.category) in diff.changed_templates
+            or not touched_devices.isdisjoint(space.devices)
+        ):
+            regenerate.append(space_id)
+
+    diff.removed_spaces = [space_id for space_id in old.spaces if space_id not in new.spaces]
+    diff.regenerate = regenerate
+    return diff
+
+
+def regenerate_space(config: AppConfig, space: Space) -> list[str]:
+    """Bring a space's CLAUDE.md and .mcp.json in line with the current config.
+
+    .mcp.json is always replaced. CLAUDE.md (and the logs README) are only
+    replaced if the manifest shows nobody edited them since they were generated.
+
+    Returns:
+        Names of the files that actually had to be rewritten
+    """
+    manifest = SpaceManifest(space)
+    overwrite = [
+        name for name in ARTIFACT_NAMES
+        if name == MCP_JSON or manifest.is_untouched(name, space.path / name)
+    ]
+    return sync_space(config, space, overwrite=overwrite)
+
+
+def apply_diff(config: AppConfig, diff: ConfigDiff) -> list[str]:
+    """Regenerate artifacts for the spaces affected by a diff.
+
+    Only spaces that already exist on disk are touched (plus newly added
+    spaces); spaces that were never initialized are left for `init`.
+
+    Returns:
+        List of regenerated space IDs
+    """
+    added = set(diff.added_spaces)
+    regenerated = []
+    for space_id in diff.regenerate:
+        space = config.spaces[space_id]
+        if space_id in added or space.exists():
+            regenerate_space(config, space)
+            regenerated.append(space_id)
+    return regenerated
+
+
+class ConfigWatchSet:
+    """inotify watches covering a config file, its config.d fragments and templates."""
+
+    def __init__(self, watcher: inotify.Inotify, config_path: Path):
+        self._watcher = watcher
+        self.config_path = config_path.resolve()
+        self._fragment_dir = self.config_path.parent / FRAGMENT_DIR_NAME
+        self._fragment_wd = None
+        self._template_dir = self.config_path.parent / TEMPLATE_DIR_NAME
+        self._template_wd = None
+
+        self._config_wd = watcher.add_watch(
+            self.config_path.parent, CONFIG_EVENT_MASK | inotify.IN_ONLYDIR
+        )
+        self._watch_fragments()
+        self._watch_templates()
+
+    def _watch_fragments(self) -> None:
+        if self._fragment_wd is None and self._fragment_dir.is_dir():
+            self._fragment_wd = self._watcher.add_watch(
+                self._fragment_dir, CONFIG_EVENT_MASK | inotify.IN_ONLYDIR
+            )
+
+    def _watch_templates(self) -> None:
+        if self._template_wd is None and self._template_dir.is_dir():
+            self._template_wd = self._watcher.add_watch(
+                self._template_dir, CONFIG_EVENT_MASK | inotify.IN_ONLYDIR
+            )
+
+    def is_relevant(self, events: list[inotify.InotifyEvent]) -> bool:
+        """Check whether any of the events may have changed the configuration."""
+        relevant = False
+        for event in events:
+            if event.mask & inotify.IN_Q_OVERFLOW:
+                relevant = True
+            elif event.wd == self._config_wd:
+                if event.name == self.config_path.name:
+                    relevant = True
+                elif event.name == FRAGMENT_DIR_NAME:
+                    # config.d appeared or went away
+                    if event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                        self._fragment_wd = None
+                    self._watch_fragments()
+                    relevant = True
+                elif event.name == TEMPLATE_DIR_NAME:
+                    # templates/ appeared or went away
+                    if event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                        self._template_wd = None
+                    self._watch_templates()
+                    relevant = True
+            elif event.wd == self._fragment_wd:
+                if event.mask & inotify.IN_IGNORED:
+                    self._fragment_wd = None
+                elif Path(event.name).suffix in (".yaml", ".yml") and not event.name.startswith("."):
+                    relevant = True
+            elif event.wd == self._template_wd:
+                if event.mask & inotify.IN_IGNORED:
+                    self._template_wd = None
+                elif event.name.endswith(".md") and not event.name.startswith("."):
+                    relevant = True
+        return relevant
+
+
+def watch_config(
+    config: AppConfig,
+    on_reload: Callable[[AppConfig, ConfigDiff], None],
+    debounce: float = 0.2,
+    use_cache: bool = True,
+    stop: Optional[Callable[[], bool]] = None,
+) -> None:
+    """Block and call on_reload whenever the config file, a fragment or a template changes.
+
+    Args:
+        config: Currently active configuration (must have a config_path)
+        on_reload: Called with the new config and its diff against the previous one
+        debounce: Seconds to wait for a burst of events to settle
+        use_cache: Whether reloads may use the config snapshot cache
+        stop: Optional predicate checked between events to end the loop
+    """
+    if config.config_path is None:
+        raise ValueError("Configuration was not loaded from a file")
+
+    with inotify.Inotify() as watcher:
+        watch_set = ConfigWatchSet(watcher, config.config_path)
+        config_path = watch_set.config_path
+        templates = template_keys(config)
+        while stop is None or not stop():
+            if not watch_set.is_relevant(watcher.wait(timeout=1.0)):
+                continue
+
+            # Let editors finish their write/rename dance
+            time.sleep(debounce)
+            watch_set.is_relevant(watcher.read_events())
+            if not config_path.exists():
+                continue
+
+            try:
+                new_config = AppConfig.load(config_path, use_cache=use_cache)
+            except Exception as e:
+                print(f"Config reload failed: {e}")
+                continue
+
+            diff = diff_configs(config, new_config, templates)
+            config, templates = new_config, template_keys(new_config)
+            if not diff.is_empty():
+                on_reload(new_config, diff)
@@ -0,0 +1,145 @@
+"""Reuse of tool results in the MCP gateway.
+
+Claude asks the same device for `get_system_info` or the same file over and
+over within a session, and every call runs shell commands on the device.
+The gateway (see claude_lan_manager.gateway) keeps successful results of the
+tools that `response_cache.tools` gives a TTL, keyed by device, tool and the
+arguments named in the policy's `key`, and answers repeated calls from memory
+until the TTL runs out.
+
+Results live in one LRU list under a byte budget (their size as JSON). A
+call of a tool whose policy `invalidates` other tools drops their results on
+the same device: a `write_file` drops the cached `read_file` of the same path,
+and a `run_command`, which may change anything, drops them all. A result
+that was being fetched while such a call ran isn't stored, since it may be
+from before the change.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from claude_lan_manager.config import CachePolicy, ResponseCacheSettings
+
+# Key of a cached result: (endpoint, tool, key arguments as JSON)
+CacheKey = tuple[str, str, str]
+
+
+def _key(endpoint: str, tool: str, arguments: dict, fields: Optional[tuple[str, ...]]) -> CacheKey:
+    values = arguments if fields is None else {name: arguments.get(name) for name in fields}
+    return endpoint, tool, json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResponseCache:
+    """LRU cache of tool results with per-tool TTLs and invalidation."""
+
+    def __init__(self, settings: ResponseCacheSettings):
+        self.settings = settings
+        self._entries: OrderedDict[CacheKey, tuple[float, int, dict]] = OrderedDict()  # (expires, size, result)
+        self._generation: dict[str, int] = {}  # endpoint -> invalidating calls started or finished
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._by_tool: dict[str, list[int]] = {}  # tool -> [hits, misses]
+
+    def configure(self, settings: ResponseCacheSettings) -> None:
+        """Use new settings; results cached under other policies are dropped."""
+        if settings == self.settings:
+            return
+        if settings.tools != self.settings.tools or not settings.enabled:
+            self._entries.clear()
+            self.size = 0
+        self.settings = settings
+        self._evict()
+
+    def _policy(self, tool: str) -> Optional[CachePolicy]:
+        return self.settings.tools.get(tool) if self.settings.enabled else None
+
+    def lookup(self, endpoint: str, tool: str, arguments: dict) -> Optional[dict]:
+        """A fresh cached result of the call, or None."""
+        policy = self._policy(tool)
+        if policy is None or policy.ttl <= 0:
+            return None
+        counts = self._by_tool.setdefault(tool, [0, 0])
+        key = _key(endpoint, tool, arguments, policy.key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            counts[0] += 1
+            return entry[2]
+        if entry is not None:
+            self._drop(key)
+        self.misses += 1
+        counts[1] += 1
+        return None
+
+    def begin(self, endpoint: str, tool: str, arguments: dict) -> int:
+        """Note that a call is sent; returns the generation to pass to finish()."""
+        policy = self._policy(tool)
+        if policy is not None and policy.invalidates:
+            self._invalidate(endpoint, policy, arguments)
+        return self._generation.get(endpoint, 0)
+
+    def finish(self, endpoint: str, tool: str, arguments: dict, result: dict, generation: int) -> None:
+        """Note that a call returned: drop what it may have changed, or cache its result."""
+        policy = self._policy(tool)
+        if policy is None:
+            return
+        if policy.invalidates:
+            # Again, in case a read was answered while this call ran
+            self._invalidate(endpoint, policy, arguments)
+        if (
+            policy.ttl <= 0
+            or result.get("isError")
+            or self._generation.get(endpoint, 0) != generation
+        ):
+            return
+        size = len(json.dumps(result, separators=(",", ":")))
+        if size > self.settings.max_bytes:
+            return
+        key = _key(endpoint, tool, arguments, policy.key)
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + policy.ttl, size, result)
+        self.size += size
+        self._evict()
+
+    def _invalidate(self, endpoint: str, policy: CachePolicy, arguments: dict) -> None:
+        self._generation[endpoint] = self._generation.get(endpoint, 0) + 1
+        for tool in policy.invalidates:
+            target = self.settings.tools.get(tool)
+            if target is not None and target.key is not None and all(name in arguments for name in target.key):
+                # The same path (or whatever the key is) on the same device
+                keys = [_key(endpoint, tool, arguments, target.key)]
+            else:
+                keys = [key for key in self._entries if key[0] == endpoint and key[1] == tool]
+            for key in keys:
+                if key in self._entries:
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def _drop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def _evict(self) -> None:
+        while self.size > self.settings.max_bytes and self._entries:
+            _expires, size, _result = self._entries.popitem(last=False)[1]
+            self.size -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.settings.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "tools": {tool: {"hits": hits, "misses": misses} for tool, (hits, misses) in self._by_tool.items()},
+        }
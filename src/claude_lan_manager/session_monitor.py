@@ -0,0 +1,119 @@
+"""Qt integration for the session registry.
+
+Periodically reconciles the registry with running processes on a worker
+thread (a /proc scan is cheap, but not free with many processes) and tells
+the windows which spaces have starting, live or idle sessions, and what
+those sessions use (see SessionRegistry.refresh()).
+"""
+
+import threading
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from claude_lan_manager.config import AppConfig
+from claude_lan_manager.sessions import (
+    STATE_IDLE,
+    STATE_LIVE,
+    STATE_STARTING,
+    ResourceUsage,
+    SessionRegistry,
+)
+
+# How often session states are refreshed, in milliseconds
+REFRESH_INTERVAL_MS = 3000
+
+# Button badge per session state
+STATE_LABELS = {
+    STATE_STARTING: "◌ starting",
+    STATE_LIVE: "● live",
+    STATE_IDLE: "○ idle",
+}
+
+
+def summarize(records: list) -> tuple[str, int]:
+    """Collapse a space's sessions into (most active state, session count)."""
+    states = {record.state for record in records}
+    for state in (STATE_LIVE, STATE_IDLE, STATE_STARTING):
+        if state in states:
+            return state, len(records)
+    return "", 0
+
+
+def total_usage(records: list) -> Optional[ResourceUsage]:
+    """Add up the resource usage of a space's sessions (None if none was sampled)."""
+    sampled = [record.usage for record in records if record.usage is not None]
+    return sum(sampled, ResourceUsage()) if sampled else None
+
+
+class SessionMonitor(QObject):
+    """Emits updated({space_id: [SessionRecord, ...]}) after every refresh."""
+
+    updated = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, config: AppConfig, interval_ms: int = REFRESH_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.sessions: dict = {}
+        self._busy = False
+        self._again = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
+        self._results = _Results(self)
+        self._results.done.connect(self._on_done)
+        self._results.failed.connect(self._on_failed)
+        self.refresh()
+
+    def apply_config(self, config: AppConfig, _diff=None):
+        self.config = config
+        self.refresh()
+
+    def refresh(self):
+        """Refresh in the background (coalescing requests while one is running)."""
+        if self._busy:
+            self._again = True
+            return
+        self._busy = True
+        registry, results = SessionRegistry(self.config), self._results
+
+        def work():
+            try:
+                results.done.emit(registry.refresh())
+            except Exception as e:
+                results.failed.emit(f"Session refresh failed: {e}")
+
+        self._thread = threading.Thread(target=work, name="session-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop refreshing and wait for a refresh in progress."""
+        self._timer.stop()
+        self._again = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _finish(self):
+        self._busy = False
+        if self._again:
+            self._again = False
+            self.refresh()
+
+    def _on_done(self, sessions: dict):
+        self.sessions = sessions
+        self._finish()
+        self.updated.emit(sessions)
+
+    def _on_failed(self, message: str):
+        self._finish()
+        self.failed.emit(message)
+
+
+class _Results(QObject):
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
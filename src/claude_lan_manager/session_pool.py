@@ -0,0 +1,235 @@
+"""Pool of pre-warmed Claude sessions.
+
+Starting a session means forking a terminal, a shell and the claude CLI,
+then waiting for Node to start and every MCP server to handshake. For pinned
+and frequently launched spaces the pool keeps a few sessions already running,
+detached in the private tmux server (see claude_lan_manager.tmux), so a click
+only has to attach a terminal to one.
+
+Warm sessions are tagged with a fingerprint of everything the claude process
+read at startup (CLAUDE.md, .mcp.json inputs and the claude command); a
+session whose fingerprint no longer matches is discarded rather than handed
+out. Spaces that haven't been launched for ``idle_timeout`` seconds lose
+their warm sessions, unless pinned.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from claude_lan_manager import tmux
+from claude_lan_manager.artifacts import atomic_write, space_fingerprint
+from claude_lan_manager.cache import get_cache_dir
+from claude_lan_manager.config import AppConfig, Space
+from claude_lan_manager.limits import SessionLimitError, limit_command
+
+STATS_NAME = "launch-stats.json"
+
+# How often a running GUI evicts idle sessions and refills the pool, in seconds
+MAINTENANCE_INTERVAL = 60
+
+STATE_WARM = "warm"
+STATE_LIVE = "live"
+
+# Serializes pool maintenance within this process; tmux itself rejects
+# duplicate session names across processes
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+@dataclass
+class PoolStatus:
+    """What maintenance did, plus what is warm afterwards."""
+    started: list[str] = field(default_factory=list)
+    evicted: list[str] = field(default_factory=list)
+    warm: dict[str, int] = field(default_factory=dict)  # space_id -> ready sessions
+    errors: list[str] = field(default_factory=list)
+
+
+class SessionPool:
+    """Warm sessions for one configuration, kept in the private tmux server."""
+
+    def __init__(self, config: AppConfig):
+        self.config = config
+        self.settings = config.session_pool
+        self.stats_path = get_cache_dir() / STATS_NAME
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.enabled and tmux.is_available()
+
+    # -- launch statistics ---------------------------------------------------
+
+    def _load_stats(self) -> dict[str, dict]:
+        try:
+            data = json.loads(self.stats_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def record_launch(self, space: Space) -> None:
+        """Count a launch of a space; frequent spaces are kept warm."""
+        with _stats_lock:
+            stats = self._load_stats()
+            entry = stats.setdefault(space.id, {"count": 0, "last": 0})
+            entry["count"] = entry.get("count", 0) + 1
+            entry["last"] = time.time()
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.stats_path, json.dumps(stats, indent=2, sort_keys=True).encode())
+
+    def target_spaces(self) -> list[Space]:
+        """Spaces that should have warm sessions: pinned, plus recently used frequent ones."""
+        spaces = self.config.spaces
+        targets = [spaces[space_id] for space_id in self.settings.pinned if space_id in spaces]
+
+        cutoff = time.time() - self.settings.idle_timeout
+        recent = [
+            (entry.get("count", 0), space_id)
+            for space_id, entry in self._load_stats().items()
+            if space_id in spaces and entry.get("last", 0) >= cutoff
+        ]
+        recent.sort(reverse=True)
+        for _count, space_id in recent[:self.settings.frequent]:
+            if spaces[space_id] not in targets:
+                targets.append(spaces[space_id])
+        return targets
+
+    # -- sessions ------------------------------------------------------------
+
+    def fingerprint(self, space: Space) -> str:
+        """Identify the inputs a warm session for the space was started from."""
+        inputs = (space_fingerprint(self.config, space), self.config.claude_code_cmd)
+        return hashlib.sha256(repr(inputs).encode()).hexdigest()[:16]
+
+    def warm_sessions(self) -> list[tmux.TmuxSession]:
+        return [s for s in tmux.list_sessions() if s.state == STATE_WARM]
+
+    def _start(self, space: Space, existing: set[str]) -> str:
+        n = 1
+        while f"warm-{tmux.session_name(space.id)}-{n}" in existing:
+            n += 1
+        name = f"warm-{tmux.session_name(space.id)}-{n}"
+        existing.add(name)
+        tmux.new_session(
+            name,
+            str(space.path),
+            limit_command(space, self.config.claude_command(space)),
+            {
+                tmux.OPTION_SPACE: space.id,
+                tmux.OPTION_STATE: STATE_WARM,
+                tmux.OPTION_FINGERPRINT: self.fingerprint(space),
+            },
+        )
+        return name
+
+    def claim(self, space: Space) -> Optional[str]:
+        """Take a ready session for a space out of the pool.
+
+        Returns:
+            Name of the (now live) tmux session to attach to, or None if no
+            current warm session was available
+        """
+        if not self.enabled:
+            return None
+
+        fingerprint = self.fingerprint(space)
+        sessions = tmux.list_sessions()
+        names = {s.name for s in sessions}
+        candidates = [
+            s for s in sessions
+            if s.state == STATE_WARM and s.space_id == space.id
+            and s.options.get(tmux.OPTION_FINGERPRINT) == fingerprint
+        ]
+
+        # Oldest first: it has had the longest to finish starting up
+        for session in sorted(candidates, key=lambda s: s.created):
+            base = tmux.session_name(space.id)
+            live_name, n = base, 1
+            while live_name in names:
+                n += 1
+                live_name = f"{base}-{n}"
+            try:
+                # Renaming is atomic, so two launchers can't claim the same session
+                tmux.rename_session(session.name, live_name)
+            except tmux.TmuxError:
+                continue
+            tmux.set_options(live_name, {tmux.OPTION_STATE: STATE_LIVE})
+            return live_name
+        return None
+
+    def maintain(self, spaces: Optional[Iterable[Space]] = None) -> PoolStatus:
+        """Evict stale and idle warm sessions and top the pool back up.
+
+        Args:
+            spaces: Only refill these spaces (eviction always covers the whole pool)
+        """
+        status = PoolStatus()
+        if not self.enabled:
+            return status
+
+        # Imported here: the launcher itself draws sessions from the pool
+        from claude_lan_manager.launcher import GatewayError, ensure_space_exists
+
+        with _lock:
+            targets = {space.id: space for space in self.target_spaces()}
+            sessions = tmux.list_sessions()
+            names = {s.name for s in sessions}
+
+            ready: dict[str, int] = {}
+            for session in sessions:
+                if session.state != STATE_WARM:
+                    continue
+                space = targets.get(session.space_id)
+                keep = (
+                    space is not None
+                    and ready.get(space.id, 0) < self.settings.size
+                    and session.options.get(tmux.OPTION_FINGERPRINT) == self.fingerprint(space)
+                )
+                if keep:
+                    ready[space.id] = ready.get(space.id, 0) + 1
+                    continue
+                try:
+                    tmux.kill_session(session.name)
+                    status.evicted.append(session.name)
+                except tmux.TmuxError:
+                    pass  # already gone (exited or claimed meanwhile)
+
+            refill = targets.values() if spaces is None else [
+                space for space in spaces if space.id in targets
+            ]
+            for space in refill:
+                missing = self.settings.size - ready.get(space.id, 0)
+                if missing <= 0:
+                    continue
+                try:
+                    ensure_space_exists(self.config, space)
+                    for _ in range(missing):
+                        status.started.append(self._start(space, names))
+                        ready[space.id] = ready.get(space.id, 0) + 1
+                except (OSError, tmux.TmuxError, SessionLimitError, GatewayError) as e:
+                    status.errors.append(f"{space.id}: {e}")
+
+            status.warm = ready
+        return status
+
+    def maintain_in_background(self, spaces: Optional[Iterable[Space]] = None) -> threading.Thread:
+        """Run maintain() on a daemon thread."""
+        spaces = None if spaces is None else list(spaces)
+        thread = threading.Thread(target=self.maintain, args=(spaces,), name="session-pool", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self) -> list[str]:
+        """Kill every warm session."""
+        killed = []
+        with _lock:
+            for session in self.warm_sessions():
+                try:
+                    tmux.kill_session(session.name)
+                    killed.append(session.name)
+                except tmux.TmuxError:
+                    pass
+        return killed
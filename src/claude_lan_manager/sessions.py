@@ -0,0 +1,431 @@
+"""Registry of running Claude sessions.
+
+Every launch is recorded (space, PID, start time, backend) in a small JSON
+file shared by all processes of the user, so the GUIs and the CLI agree on
+what is running. The registry is reconciled against /proc: a session is the
+claude process started with the space's ``--mcp-config``, found by its
+command line. That also picks up sessions started some other way, and it
+works whatever terminal the session lives in. Sessions whose process has
+exited are reaped from the registry, and our own exited terminal processes
+are waited for so they don't linger as zombies.
+
+A session is "live" while its process tree uses CPU and "idle" once it
+hasn't for a while (typically: Claude is waiting at its prompt). Each
+refresh also adds up what every session's process tree uses (resident
+memory, CPU since the previous refresh, open file descriptors).
+
+Finding claude processes by command line takes a scan of every process, so
+refreshes only do that while a launch is waiting for its process to show up
+and every DISCOVERY_INTERVAL seconds (for sessions started elsewhere). In
+between, only the registered sessions are looked at: a signal-0 probe and a
+start-time check per session, and a walk down its own process tree.
+"""
+
+import fcntl
+import json
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Iterator, Optional
+
+from claude_lan_manager import proc, tmux
+from claude_lan_manager.artifacts import atomic_write
+from claude_lan_manager.cache import get_cache_dir
+from claude_lan_manager.config import AppConfig, Space
+from claude_lan_manager.session_pool import STATE_WARM
+from claude_lan_manager.terminals import LaunchedSession
+
+REGISTRY_NAME = "sessions.json"
+
+# How long a launch may take before its claude process shows up
+STARTUP_GRACE = 30
+
+# Seconds between scans of every process for sessions started elsewhere, and
+# (while a launch waits for its claude process) between any two scans
+DISCOVERY_INTERVAL = 30
+STARTING_SCAN_INTERVAL = 2
+
+# A session that used less than this share of a CPU for IDLE_AFTER seconds is idle
+ACTIVE_CPU_SHARE = 0.02
+IDLE_AFTER = 120
+
+STATE_STARTING = "starting"
+STATE_LIVE = "live"
+STATE_IDLE = "idle"
+
+_lock = threading.Lock()
+
+# Terminal processes we started and still have to wait for
+_children: list[subprocess.Popen] = []
+
+# (pid, starttime) -> --mcp-config path (or None); a process's command line never changes
+_cmdline_cache: dict[tuple[int, int], Optional[str]] = {}
+
+# (pid, starttime) -> (cpu ticks, sampled at, last active at)
+_activity: dict[tuple[int, int], tuple[int, float, float]] = {}
+
+# time.monotonic() of the last scan of every process
+_last_scan = float("-inf")
+
+
+@dataclass(slots=True)
+class ResourceUsage:
+    """What a session's process tree uses."""
+    processes: int = 0
+    rss_bytes: int = 0
+    cpu_percent: float = 0.0  # of one CPU, since the previous sample
+    open_fds: int = 0
+
+    def __add__(self, other: "ResourceUsage") -> "ResourceUsage":
+        return ResourceUsage(
+            self.processes + other.processes,
+            self.rss_bytes + other.rss_bytes,
+            self.cpu_percent + other.cpu_percent,
+            self.open_fds + other.open_fds,
+        )
+
+    def describe(self) -> str:
+        return f"{self.cpu_percent:.0f}% CPU · {format_bytes(self.rss_bytes)} · {self.open_fds} fds"
+
+
+def format_bytes(size: float) -> str:
+    """Human-readable size in binary units (e.g. "480 MB")."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@dataclass
+class SessionRecord:
+    """A launched (or discovered) Claude session."""
+    space_id: str
+    mcp_config: str
+    backend: str
+    started_at: float
+    pid: int = 0  # claude process, once found
+    starttime: int = 0  # its /proc start time, to detect PID reuse
+    launcher_pid: int = 0  # terminal or tmux pane process we started
+    tmux_window: Optional[str] = None
+
+    # Not persisted; filled in by SessionRegistry.refresh()
+    state: str = field(default=STATE_STARTING, compare=False)
+    last_active: float = field(default=0.0, compare=False)
+    usage: Optional[ResourceUsage] = field(default=None, compare=False)
+
+    _PERSISTED = ("space_id", "mcp_config", "backend", "started_at", "pid", "starttime",
+                  "launcher_pid", "tmux_window")
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        return {key: data[key] for key in self._PERSISTED}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionRecord":
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+    def as_launched(self) -> LaunchedSession:
+        return LaunchedSession(
+            self.space_id, self.backend, pid=self.pid or self.launcher_pid,
+            tmux_window=self.tmux_window, reused=True,
+        )
+
+
+def _mcp_config_arg(args: list[str]) -> Optional[str]:
+    for i, arg in enumerate(args):
+        if arg == "--mcp-config" and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith("--mcp-config="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def find_claude_processes(
+    stats: dict[int, proc.ProcStat],
+    mcp_configs: set[str],
+) -> dict[str, list[int]]:
+    """Find the top-level claude processes started with each --mcp-config path."""
+    # Refreshes, launches and launch watchers call this from several threads at once
+    with _lock:
+        known = {
+            pid: _cmdline_cache[pid, stat.starttime]
+            for pid, stat in stats.items()
+            if (pid, stat.starttime) in _cmdline_cache
+        }
+    # Read new command lines without holding the lock
+    read = {
+        pid: _mcp_config_arg(proc.read_cmdline(pid))
+        for pid in stats.keys() - known.keys()
+    }
+    with _lock:
+        for pid, mcp_config in read.items():
+            _cmdline_cache[pid, stats[pid].starttime] = mcp_config
+        # Forget processes that are gone
+        for key in [key for key in _cmdline_cache if key[0] not in stats or stats[key[0]].starttime != key[1]]:
+            del _cmdline_cache[key]
+
+    matches: dict[int, str] = {
+        pid: mcp_config
+        for pid, mcp_config in {**known, **read}.items()
+        if mcp_config in mcp_configs
+    }
+
+    found: dict[str, list[int]] = {}
+    for pid, mcp_config in matches.items():
+        # Claude's own helper processes share its command line; keep the topmost
+        if any(matches.get(parent) == mcp_config for parent in proc.ancestors(pid, stats)):
+            continue
+        found.setdefault(mcp_config, []).append(pid)
+    return found
+
+
+def reap_children() -> None:
+    """Wait for terminal processes we started that have exited."""
+    with _lock:
+        _children[:] = [child for child in _children if child.poll() is None]
+
+
+class SessionRegistry:
+    """Sessions of one configuration, persisted under the cache directory."""
+
+    def __init__(self, config: AppConfig, path: Optional[Path] = None):
+        self.config = config
+        self.path = path or get_cache_dir() / REGISTRY_NAME
+
+    def _load(self) -> list[SessionRecord]:
+        """The records as last saved (take the lock to change them)."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            data = []
+        return [SessionRecord.from_dict(item) for item in data if isinstance(item, dict)]
+
+    @contextmanager
+    def _locked(self) -> Iterator[list[SessionRecord]]:
+        """Load the records under a lock shared with other processes, saving changes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _lock, open(self.path.with_suffix(".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            records = self._load()
+            before = [record.to_dict() for record in records]
+
+            yield records
+
+            after = [record.to_dict() for record in records]
+            if after != before:
+                atomic_write(self.path, json.dumps(after, indent=2).encode())
+
+    def register(self, space: Space, launched: LaunchedSession) -> SessionRecord:
+        """Record a session that was just launched."""
+        record = SessionRecord(
+            space_id=space.id,
+            mcp_config=str(space.mcp_json_path),
+            backend=launched.backend,
+            started_at=time.time(),
+            launcher_pid=launched.pid or 0,
+            tmux_window=launched.tmux_window,
+        )
+        if launched.process is not None:
+            with _lock:
+                _children.append(launched.process)
+        with self._locked() as records:
+            records.append(record)
+        return record
+
+    def refresh(self) -> dict[str, list[SessionRecord]]:
+        """Reconcile the registry with running processes.
+
+        Returns:
+            Sessions that are starting or running, by space ID, newest first
+        """
+        reap_children()
+        now = time.time()
+        spaces_by_config = {str(space.mcp_json_path): space.id for space in self.config.spaces.values()}
+        found: dict[str, list[int]] = {}
+        windows: dict[int, Optional[str]] = {}
+
+        registered = self._load()
+        scanned = self._should_scan(registered)
+        if scanned:
+            stats = proc.snapshot()
+            panes = {pane.pid: pane for pane in tmux.list_panes()} if tmux.is_available() else {}
+            found = find_claude_processes(stats, set(spaces_by_config))
+        else:
+            # Just the registered sessions' process trees; nothing new is adopted
+            stats = {}
+            for record in registered:
+                if record.pid:
+                    stats.update(proc.process_tree(record.pid, record.starttime))
+            panes = {}
+
+        # Ignore pre-warmed sessions nobody has claimed yet; note which tmux window each is in
+        for mcp_config, pids in found.items():
+            for pid in list(pids):
+                window = None
+                for ancestor in [pid, *proc.ancestors(pid, stats)]:
+                    pane = panes.get(ancestor)
+                    if pane is not None:
+                        window = pane
+                        break
+                if window is not None and window.state == STATE_WARM:
+                    pids.remove(pid)
+                else:
+                    windows[pid] = window.window_id if window is not None else None
+
+        with self._locked() as records:
+            claimed = {record.pid for record in records if record.pid}
+            kept = []
+            for record in records:
+                if not scanned and record.pid and record.pid not in stats:
+                    # Adopted since the records were read above
+                    stats.update(proc.process_tree(record.pid, record.starttime))
+                stat = stats.get(record.pid) if record.pid else None
+                if stat is None or stat.starttime != record.starttime or stat.state == "Z":
+                    record.pid = 0
+
+                if not record.pid:
+                    # Adopt the claude process this launch started, once it shows up
+                    candidates = [
+                        pid for pid in found.get(record.mcp_config, [])
+                        if pid not in claimed
+                    ]
+                    if candidates:
+                        own = [
+                            pid for pid in candidates
+                            if record.launcher_pid in (pid, *proc.ancestors(pid, stats))
+                        ]
+                        record.pid = (own or candidates)[0]
+                        record.starttime = stats[record.pid].starttime
+                        claimed.add(record.pid)
+
+                if record.pid:
+                    record.tmux_window = windows.get(record.pid, record.tmux_window)
+                    kept.append(record)
+                elif now - record.started_at < STARTUP_GRACE and proc.is_alive(record.launcher_pid):
+                    record.state = STATE_STARTING
+                    kept.append(record)
+                # else: exited (or never started); reaped
+
+            # Sessions started elsewhere (another window, the CLI, by hand)
+            boot = proc.boot_time()
+            for mcp_config, pids in found.items():
+                for pid in pids:
+                    if pid in claimed:
+                        continue
+                    kept.append(SessionRecord(
+                        space_id=spaces_by_config[mcp_config],
+                        mcp_config=mcp_config,
+                        backend="tmux" if windows.get(pid) else "external",
+                        started_at=boot + stats[pid].starttime / proc.CLK_TCK,
+                        pid=pid,
+                        starttime=stats[pid].starttime,
+                        tmux_window=windows.get(pid),
+                    ))
+            records[:] = kept
+
+        self._sample(kept, stats, proc.children_map(stats), now)
+
+        sessions: dict[str, list[SessionRecord]] = {}
+        for record in sorted(kept, key=lambda r: r.started_at, reverse=True):
+            if record.space_id in self.config.spaces:
+                sessions.setdefault(record.space_id, []).append(record)
+        return sessions
+
+    @staticmethod
+    def _sample(records, stats, children, now) -> None:
+        """Update the activity state and resource usage of running sessions."""
+        samples = []
+        for record in records:
+            if not record.pid:
+                continue
+            tree = [pid for pid in proc.descendants(record.pid, children) if pid in stats]
+            usage = ResourceUsage(
+                processes=len(tree),
+                rss_bytes=sum(stats[pid].rss_bytes for pid in tree),
+                open_fds=sum(proc.count_fds(pid) for pid in tree),
+            )
+            samples.append((record, (record.pid, record.starttime), sum(stats[pid].cpu_ticks for pid in tree), usage))
+
+        # Other threads refresh too; each sample is compared with the latest earlier one
+        with _lock:
+            for record, key, ticks, usage in samples:
+                previous = _activity.get(key)
+                if previous is None:
+                    last_active = now
+                else:
+                    prev_ticks, sampled_at, last_active = previous
+                    if now > sampled_at:
+                        cpu_share = max(ticks - prev_ticks, 0) / proc.CLK_TCK / (now - sampled_at)
+                        usage.cpu_percent = cpu_share * 100
+                        if cpu_share >= ACTIVE_CPU_SHARE:
+                            last_active = now
+                if previous is None or now > previous[1]:
+                    # A refresh that sampled before the stored one doesn't replace it
+                    _activity[key] = (ticks, now, last_active)
+                record.last_active = last_active
+                record.state = STATE_IDLE if now - last_active >= IDLE_AFTER else STATE_LIVE
+                record.usage = usage
+
+            # Forget processes that are gone (not sessions this refresh didn't see)
+            for key in list(_activity):
+                stat = stats.get(key[0])
+                if stat.starttime != key[1] if stat is not None else not proc.is_alive(*key):
+                    del _activity[key]
+
+    @staticmethod
+    def _should_scan(records: list[SessionRecord]) -> bool:
+        """Whether a refresh has to scan every process to find claude processes."""
+        global _last_scan
+        starting = any(not record.pid for record in records)
+        with _lock:
+            since = time.monotonic() - _last_scan
+            if not proc.HAS_CHILDREN or since >= (STARTING_SCAN_INTERVAL if starting else DISCOVERY_INTERVAL):
+                _last_scan = time.monotonic()
+                return True
+        return False
+
+    def live_session(self, space: Space) -> Optional[SessionRecord]:
+        """The newest starting or running session of a space, if any."""
+        sessions = self.refresh().get(space.id)
+        return sessions[0] if sessions else None
+
+    def focus(self, record: SessionRecord) -> bool:
+        """Bring a session's window to the front, if we know how.
+
+        tmux windows are selected in their session. For terminal windows,
+        xdotool or wmctrl is used when installed.
+        """
+        if record.tmux_window is not None:
+            try:
+                tmux.select_window(record.tmux_window)
+                return True
+            except tmux.TmuxError:
+                pass
+
+        stats = proc.snapshot()
+        pids = [record.pid, *proc.ancestors(record.pid, stats)] if record.pid else [record.launcher_pid]
+        for pid in pids:
+            if _activate_window_of(pid):
+                return True
+        return False
+
+
+def _activate_window_of(pid: int) -> bool:
+    if shutil.which("xdotool"):
+        result = subprocess.run(["xdotool", "search", "--pid", str(pid)], capture_output=True, text=True)
+        window_ids = result.stdout.split()
+        if window_ids:
+            return subprocess.run(["xdotool", "windowactivate", window_ids[-1]]).returncode == 0
+    if shutil.which("wmctrl"):
+        result = subprocess.run(["wmctrl", "-lp"], capture_output=True, text=True)
+        for line in result.stdout.splitlines():
+            columns = line.split(None, 4)
+            if len(columns) >= 3 and columns[2] == str(pid):
+                return subprocess.run(["wmctrl", "-ia", columns[0]]).returncode == 0
+    return False
@@ -1,9 +1,118 @@
 """Setup utilities for Claude LAN Manager."""
 
+import os
 import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
+
+from claude_lan_manager.artifacts import (
+    ARTIFACT_NAMES,
+    LOGS_README,
+    SpaceManifest,
+    is_space_current,
+    sync_space,
+)
+from claude_lan_manager.config import AppConfig, Space
+from claude_lan_manager.inventory import CATEGORIES
+
+
+@dataclass
+class SpaceInitResult:
+    """Outcome of initializing one space."""
+    space_id: str
+    written: list[str] = field(default_factory=list)
+    skipped: bool = False  # inputs unchanged since the last init (changed_only)
+    stale: list[str] = field(default_factory=list)  # outdated files kept because they were edited
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def init_space(
+    config: AppConfig,
+    space: Space,
+    force: bool = False,
+    changed_only: bool = False,
+    dry_run: bool = False,
+) -> SpaceInitResult:
+    """Initialize a single space without printing anything.
 
-from claude_lan_manager.config import AppConfig, generate_mcp_json, generate_claude_md
+    Args:
+        config: Application configuration
+        space: Space to initialize
+        force: If True, regenerate files even if they exist
+        changed_only: Skip the space if its stored fingerprint matches its inputs;
+            otherwise regenerate the files nobody edited since they were generated
+        dry_run: Only report which files would be written
+
+    Returns:
+        What was (or would be) done for the space
+    """
+    start = time.perf_counter()
+    result = SpaceInitResult(space.id)
+    try:
+        if changed_only and is_space_current(config, space):
+            result.skipped = True
+        elif changed_only and not force:
+            # The inputs changed: replace what we generated, but not files edited since
+            manifest = SpaceManifest(space)
+            edited = [
+                name for name in ARTIFACT_NAMES
+                if (space.path / name).exists() and not manifest.is_untouched(name, space.path / name)
+            ]
+            result.written = sync_space(
+                config, space,
+                overwrite=[name for name in ARTIFACT_NAMES if name not in edited],
+                dry_run=dry_run,
+            )
+            if dry_run or not is_space_current(config, space):
+                result.stale = edited
+        else:
+            result.written = sync_space(
+                config, space, overwrite=ARTIFACT_NAMES if force else (), dry_run=dry_run
+            )
+    except Exception as e:
+        # One broken space (a bad template, say) mustn't stop the others
+        result.error = str(e) or type(e).__name__
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def init_spaces(
+    config: AppConfig,
+    force: bool = False,
+    jobs: int = 1,
+    changed_only: bool = False,
+    dry_run: bool = False,
+) -> list[SpaceInitResult]:
+    """Initialize all configured spaces, optionally on a worker pool.
+
+    Args:
+        config: Application configuration
+        force: If True, regenerate files even if they exist
+        jobs: Number of worker threads (space initialization is I/O bound)
+        changed_only: Skip spaces whose inputs are unchanged since the last init and
+            regenerate the unedited files of the others
+        dry_run: Only report which files would be written
+
+    Returns:
+        One result per space, in config order
+    """
+    spaces = list(config.spaces.values())
+    # Resolve the inventory index up front rather than racing to build it in workers
+    config.index
+
+    def work(space):
+        return init_space(config, space, force, changed_only, dry_run)
+
+    if jobs <= 1 or len(spaces) <= 1:
+        return [work(space) for space in spaces]
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(work, spaces))
 
 
 def initialize_spaces(config: AppConfig, force: bool = False) -> list[str]:
@@ -35,48 +144,16 @@ def initialize_space(config: AppConfig, space, force: bool = False) -> bool:
         force: If True, regenerate files even if they exist
 
     Returns:
-        True if any files were created/updated
+        True if any files were created/updated. Files whose contents
+        would not change are left untouched, even with force.
     """
-    import json
-
-    created = False
-    devices = config.get_devices_for_space(space)
-
-    # Create directory structure
-    space.path.mkdir(parents=True, exist_ok=True)
-    space.logs_path.mkdir(exist_ok=True)
+    written = sync_space(config, space, overwrite=ARTIFACT_NAMES if force else ())
 
-    # Generate CLAUDE.md
-    if force or not space.claude_md_path.exists():
-        content = generate_claude_md(space, devices)
-        space.claude_md_path.write_text(content)
-        created = True
-        print(f"  Created: {space.claude_md_path}")
+    for name in written:
+        if name != LOGS_README:
+            print(f"  Created: {space.path / name}")
 
-    # Generate .mcp.json
-    if force or not space.mcp_json_path.exists():
-        mcp_config = generate_mcp_json(devices)
-        with open(space.mcp_json_path, "w") as f:
-            json.dump(mcp_config, f, indent=2)
-        created = True
-        print(f"  Created: {space.mcp_json_path}")
-
-    # Create a README in logs folder
-    logs_readme = space.logs_path / "README.md"
-    if force or not logs_readme.exists():
-        logs_readme.write_text(f"""# {space.name} Logs
-
-This folder contains logs and documentation generated during Claude sessions.
-
-## Recommended Structure
-
-- `session-YYYY-MM-DD.md` - Daily session notes
-- `changes.md` - Configuration and system changes
-- `issues.md` - Problems encountered and resolutions
-""")
-        created = True
-
-    return created
+    return bool(written)
 
 
 def copy_example_config(dest: Path = None) -> Path:
@@ -106,6 +183,30 @@ def copy_example_config(dest: Path = None) -> Path:
     return dest
 
 
+def print_launch_profile(spans: list, run_spans: Optional[list] = None) -> None:
+    """Print per-phase launch latency, optionally after each launch of this run."""
+    from claude_lan_manager.launch_trace import RECENT_LAUNCHES, summarize
+
+    if run_spans:
+        launches: dict[str, list] = {}
+        for span in sorted(run_spans, key=lambda s: s.start):
+            launches.setdefault(span.launch, []).append(span)
+        print("\nThis run:")
+        for launch_spans in launches.values():
+            space_id = launch_spans[0].space or "(config)"
+            phases = ", ".join(f"{span.phase} {span.ms:.0f}" for span in launch_spans)
+            print(f"  {space_id:<24} {phases} (ms)")
+
+    stats = summarize(spans)
+    if not stats:
+        print("No launches traced yet.")
+        return
+    print(f"\nLast {RECENT_LAUNCHES} launches, ms:")
+    print(f"  {'phase':<14} {'n':>5} {'p50':>8} {'p95':>8} {'mean':>8}")
+    for stat in stats:
+        print(f"  {stat.phase:<14} {stat.count:>5} {stat.p50:>8.1f} {stat.p95:>8.1f} {stat.mean:>8.1f}")
+
+
 def setup_cli():
     """CLI entry point for setup commands."""
     import argparse
@@ -113,6 +214,11 @@ def setup_cli():
     parser = argparse.ArgumentParser(
         description="Claude LAN Manager Setup Utilities"
     )
+    parser.add_argument(
+        "--no-config-cache",
+        action="store_true",
+        help="Always re-parse the config file instead of using the cached snapshot"
+    )
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # init command
@@ -130,6 +236,254 @@ def setup_cli():
         type=Path,
         help="Path to config file"
     )
+    init_parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Initialize spaces on N worker threads (0 = one per CPU)"
+    )
+    init_parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Skip spaces whose config inputs are unchanged since the last init; "
+             "regenerate the files of the others unless they were edited"
+    )
+    init_parser.add_argument(
+        "--dry-run", "-n",
+        action="store_true",
+        help="Report what would change without writing anything"
+    )
+    init_parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Only print the summary"
+    )
+    init_parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="Refresh stale tool catalogs first (contacts the devices); "
+             "by default CLAUDE.md lists the cached tools as they are"
+    )
+
+    # watch command
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Watch the config file and regenerate spaces affected by each change"
+    )
+    watch_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+
+    # logs command
+    logs_parser = subparsers.add_parser(
+        "logs",
+        help="Search the logs of all spaces"
+    )
+    logs_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+    logs_subparsers = logs_parser.add_subparsers(dest="logs_command", help="Log commands")
+
+    search_parser = logs_subparsers.add_parser(
+        "search",
+        help="Full-text search across every space's logs/ folder"
+    )
+    search_parser.add_argument("query", nargs="+", help="Search terms (FTS5 syntax)")
+    search_parser.add_argument(
+        "--space", "-s",
+        help="Only search this space"
+    )
+    search_parser.add_argument(
+        "--limit", "-l",
+        type=int,
+        default=20,
+        help="Maximum number of results"
+    )
+
+    logs_subparsers.add_parser(
+        "reindex",
+        help="Update the log search index"
+    )
+
+    tail_parser = logs_subparsers.add_parser(
+        "tail",
+        help="Follow new log lines from all spaces as they are written"
+    )
+    tail_parser.add_argument(
+        "--space", "-s",
+        action="append",
+        help="Only follow this space (repeatable)"
+    )
+    tail_parser.add_argument(
+        "--max-watches",
+        type=int,
+        help="Upper bound on inotify watches (most recently active spaces win)"
+    )
+
+    # launch command
+    launch_parser = subparsers.add_parser(
+        "launch",
+        help="Launch Claude in one or more spaces"
+    )
+    launch_parser.add_argument(
+        "space_ids",
+        nargs="*",
+        metavar="SPACE",
+        help="IDs of the spaces to launch"
+    )
+    launch_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+    launch_parser.add_argument(
+        "--category",
+        choices=CATEGORIES,
+        help="With --all: only launch spaces in this category"
+    )
+    launch_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Launch every space (of --category, if given)"
+    )
+    launch_parser.add_argument(
+        "--concurrency", "-j",
+        type=int,
+        help="Launches in flight at once (default: bulk_launch.concurrency)"
+    )
+    launch_parser.add_argument(
+        "--stagger",
+        type=float,
+        help="Minimum seconds between launch starts (default: bulk_launch.stagger)"
+    )
+    launch_parser.add_argument(
+        "--dry-run", "-n",
+        action="store_true",
+        help="Only list the spaces that would be launched"
+    )
+    launch_parser.add_argument(
+        "--new",
+        action="store_true",
+        help="Start a new session even if the space already has one running"
+    )
+    launch_parser.add_argument(
+        "--profile-launch",
+        action="store_true",
+        help="Wait for the sessions to start, then print each launch's phases and "
+             "p50/p95 per phase over recent launches (alone: just the p50/p95)"
+    )
+
+    # sessions command
+    sessions_parser = subparsers.add_parser(
+        "sessions",
+        help="List running Claude sessions (and reap exited ones)"
+    )
+    sessions_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+
+    # health command
+    health_parser = subparsers.add_parser(
+        "health",
+        help="Probe every device's MCP endpoint once and show which are up"
+    )
+    health_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+
+    # tools command
+    tools_parser = subparsers.add_parser(
+        "tools",
+        help="Show the tools each device's MCP server offers (refreshing stale catalogs)"
+    )
+    tools_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ask every server again, even if its catalog is fresh"
+    )
+    tools_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+
+    # discover command
+    discover_parser = subparsers.add_parser(
+        "discover",
+        help="Scan a network for MCP servers and print config entries for new ones"
+    )
+    discover_parser.add_argument(
+        "--cidr",
+        required=True,
+        help="Network to scan, e.g. 10.0.0.0/24 (at most a /16)"
+    )
+    discover_parser.add_argument(
+        "--ports",
+        help="Ports to try, e.g. 3000,8000-8010 (default: 3000,3001,8000)"
+    )
+    discover_parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Probes in flight at once (default: 512)"
+    )
+    discover_parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Seconds to wait for a connection (default: 1)"
+    )
+    discover_parser.add_argument(
+        "--ttl",
+        type=float,
+        help="Reuse results younger than this many seconds (default: 600)"
+    )
+    discover_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Probe everything again, ignoring cached results"
+    )
+    discover_parser.add_argument(
+        "--output", "-o",
+        type=Path,
+        help="Write the entries to this file (e.g. config/config.d/discovered.yaml) "
+             "instead of printing them"
+    )
+    discover_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file (servers already configured there are left out)"
+    )
+
+    # pool command
+    pool_parser = subparsers.add_parser(
+        "pool",
+        help="Manage the pool of pre-warmed Claude sessions"
+    )
+    pool_parser.add_argument(
+        "--config", "-c",
+        type=Path,
+        help="Path to config file"
+    )
+    pool_subparsers = pool_parser.add_subparsers(dest="pool_command", help="Pool commands")
+    pool_subparsers.add_parser(
+        "status",
+        help="Show warm and claimed sessions"
+    )
+    pool_subparsers.add_parser(
+        "fill",
+        help="Evict stale or idle sessions and start any missing ones"
+    )
+    pool_subparsers.add_parser(
+        "clear",
+        help="Stop all warm sessions"
+    )
 
     # copy-config command
     copy_parser = subparsers.add_parser(
@@ -151,19 +505,374 @@ def setup_cli():
     args = parser.parse_args()
 
     if args.command == "init":
-        config = AppConfig.load(args.config)
+        load_start = time.perf_counter()
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        load_seconds = time.perf_counter() - load_start
+
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
         print(f"Spaces base path: {config.spaces_base_path}")
-        print(f"Initializing {len(config.spaces)} spaces...")
 
-        initialized = initialize_spaces(config, args.force)
+        probe_seconds = 0.0
+        if args.probe:
+            # Only devices whose catalog is stale are asked
+            from claude_lan_manager.capabilities_probe import refresh_catalogs
+
+            probe_start = time.perf_counter()
+            probed = refresh_catalogs(config.devices.values())
+            probe_seconds = time.perf_counter() - probe_start
+            if probed:
+                print(f"Refreshed the tool catalogs of {len(probed)} MCP servers")
+
+        print(f"Initializing {len(config.spaces)} spaces{' (dry run)' if args.dry_run else ''}...")
+
+        init_start = time.perf_counter()
+        results = init_spaces(
+            config,
+            force=args.force,
+            jobs=jobs,
+            changed_only=args.changed_only,
+            dry_run=args.dry_run,
+        )
+        init_seconds = time.perf_counter() - init_start
+
+        verb = "Would write" if args.dry_run else "Created"
+        initialized = [r for r in results if r.written]
+        skipped = [r for r in results if r.skipped]
+        failed = [r for r in results if r.error]
+        stale = [r for r in results if r.stale]
+
+        if not args.quiet:
+            for result in initialized:
+                space = config.spaces[result.space_id]
+                for name in result.written:
+                    if name != LOGS_README or args.dry_run:
+                        print(f"  {verb}: {space.path / name}")
+
+        for result in failed:
+            print(f"  Error: {result.space_id}: {result.error}")
+        for result in stale:
+            space = config.spaces[result.space_id]
+            print(f"  Stale: {', '.join(str(space.path / name) for name in result.stale)} (edited; kept)")
 
         if initialized:
-            print(f"\nInitialized {len(initialized)} spaces:")
-            for space_id in initialized:
-                print(f"  - {space_id}")
+            print(f"\n{'Would update' if args.dry_run else 'Initialized'} {len(initialized)} spaces:")
+            if not args.quiet:
+                for result in initialized:
+                    print(f"  - {result.space_id}")
+        elif stale:
+            print(f"\n{len(stale)} spaces are out of date but were edited by hand. Use --force to regenerate.")
+        elif args.force or args.changed_only:
+            print("\nAll spaces already up to date.")
         else:
             print("\nAll spaces already initialized. Use --force to regenerate.")
 
+        files = sum(len(r.written) for r in results)
+        slowest = max(results, key=lambda r: r.seconds, default=None)
+        print(
+            f"\nSummary: {len(initialized)} updated ({files} files), "
+            f"{sum(1 for r in results if not (r.written or r.skipped or r.stale or r.error))} unchanged, "
+            f"{len(skipped)} skipped, {len(stale)} stale, {len(failed)} failed"
+        )
+        print(
+            f"Timing: config load {load_seconds * 1000:.0f} ms, "
+            + (f"tool catalogs {probe_seconds * 1000:.0f} ms, " if probe_seconds else "")
+            + f"init {init_seconds * 1000:.0f} ms with {jobs} job{'s' if jobs != 1 else ''}"
+            + (f", slowest space {slowest.space_id} {slowest.seconds * 1000:.0f} ms" if slowest else "")
+        )
+        if failed:
+            return 1
+
+    elif args.command == "watch":
+        from claude_lan_manager.reload import apply_diff, watch_config
+
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        if config.config_path is None:
+            print("Error: no config file found to watch")
+            return 1
+
+        def on_reload(new_config, diff):
+            regenerated = apply_diff(new_config, diff)
+            print(f"Config changed ({diff.summary()}); regenerated {len(regenerated)} spaces")
+            for space_id in regenerated:
+                print(f"  - {space_id}")
+
+        print(f"Watching {config.config_path} (Ctrl+C to stop)")
+        try:
+            watch_config(config, on_reload, use_cache=not args.no_config_cache)
+        except KeyboardInterrupt:
+            pass
+
+    elif args.command == "logs":
+        from claude_lan_manager.log_index import search_logs, update_index
+
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+
+        if args.logs_command == "search":
+            hits = search_logs(config, " ".join(args.query), limit=args.limit, space_id=args.space)
+            if not hits:
+                print("No matches.")
+            for hit in hits:
+                snippet = " ".join(hit.snippet.split())
+                print(f"{hit.space_id}: {hit.path}:{hit.line}")
+                print(f"    {snippet}")
+
+        elif args.logs_command == "reindex":
+            start = time.perf_counter()
+            stats = update_index(config)
+            print(
+                f"Scanned {stats.scanned} log files: {stats.added} added, "
+                f"{stats.appended} appended, {stats.reindexed} re-indexed, "
+                f"{stats.removed} removed ({(time.perf_counter() - start) * 1000:.0f} ms)"
+            )
+
+        elif args.logs_command == "tail":
+            from claude_lan_manager.log_tail import RESCAN_INTERVAL, LogTailer
+
+            tailer = LogTailer(config, space_ids=args.space, max_watches=args.max_watches)
+            message = f"Following logs of {tailer.watched_count} spaces"
+            if tailer.unwatched:
+                message += f" ({len(tailer.unwatched)} inactive spaces checked every {RESCAN_INTERVAL:.0f} s)"
+            print(message + " (Ctrl+C to stop)", file=sys.stderr)
+            try:
+                while True:
+                    for line in tailer.poll():
+                        print(line.format(), flush=True)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                tailer.close()
+
+        else:
+            logs_parser.print_help()
+
+    elif args.command == "launch":
+        from functools import partial
+
+        from claude_lan_manager import launch_trace
+        from claude_lan_manager.launcher import launch_claude_in_terminal, launch_many
+        from claude_lan_manager.session_pool import SessionPool
+
+        if args.profile_launch and not (args.all or args.space_ids):
+            print_launch_profile(launch_trace.load_spans())
+            return 0
+
+        run_start = time.time()
+        with launch_trace.LaunchTrace().span("config_load"):
+            config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+
+        if args.all:
+            spaces = (
+                config.get_spaces_by_category(args.category) if args.category
+                else list(config.spaces.values())
+            )
+        elif args.space_ids:
+            unknown = [space_id for space_id in args.space_ids if space_id not in config.spaces]
+            if unknown:
+                print(f"Error: unknown space(s): {', '.join(unknown)}")
+                return 1
+            spaces = [config.spaces[space_id] for space_id in args.space_ids]
+        else:
+            print("Error: give space IDs or --all (optionally with --category)")
+            return 1
+
+        if not spaces:
+            print("No spaces to launch.")
+            return 0
+
+        if args.dry_run:
+            for space in spaces:
+                print(f"  - {space.id}: {space.name}")
+            print(f"Would launch {len(spaces)} spaces")
+            return 0
+
+        def report(result):
+            if result.error:
+                print(f"  ! {result.space_id}: {result.error}", flush=True)
+            elif result.session.reused:
+                print(f"  = {result.space_id}: already running ({result.session.describe()})", flush=True)
+            else:
+                print(f"  + {result.space_id} ({result.seconds * 1000:.0f} ms)", flush=True)
+
+        start = time.perf_counter()
+        results = launch_many(
+            config, spaces, concurrency=args.concurrency, stagger=args.stagger, on_result=report,
+            launch=partial(launch_claude_in_terminal, reuse=not args.new),
+        )
+        failed = [result for result in results if result.error]
+        reused = [result for result in results if result.session is not None and result.session.reused]
+        print(
+            f"Launched {len(results) - len(failed) - len(reused)} of {len(results)} spaces "
+            f"({len(reused)} already running) in {time.perf_counter() - start:.1f}s"
+        )
+
+        # Background refills die with this process; finish topping up the pool
+        pool = SessionPool(config)
+        if pool.enabled:
+            pool.maintain()
+
+        if args.profile_launch:
+            print("Waiting for sessions to start...", flush=True)
+            launch_trace.wait_for_watchers()
+            spans = launch_trace.load_spans()
+            print_launch_profile(spans, [span for span in spans if span.start >= run_start])
+        if failed:
+            return 1
+
+    elif args.command == "sessions":
+        from claude_lan_manager.sessions import SessionRegistry
+
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        registry = SessionRegistry(config)
+        sessions = registry.refresh()
+        if not sessions:
+            print("No running sessions.")
+        else:
+            # CPU usage is measured between two samples
+            time.sleep(0.5)
+            sessions = registry.refresh()
+        now = time.time()
+        for space_id, records in sessions.items():
+            for record in records:
+                where = f"tmux {record.tmux_window}" if record.tmux_window else record.backend
+                usage = record.usage.describe() if record.usage is not None else ""
+                print(
+                    f"  {space_id:<24} {record.state:<8} pid {record.pid or record.launcher_pid:<8} "
+                    f"{where:<12} up {(now - record.started_at) / 60:>3.0f} min  {usage}"
+                )
+
+    elif args.command == "health":
+        from claude_lan_manager.health import STATE_ONLINE
+        from claude_lan_manager.health_probe import check_devices
+
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        start = time.perf_counter()
+        health = check_devices(config.devices.values(), config.health)
+        down = 0
+        for device_id, device_health in health.items():
+            down += device_health.state != STATE_ONLINE
+            device = config.devices[device_id]
+            print(f"  {device_id:<24} {device.ip}:{device.mcp_port:<6} {device_health.describe()}")
+        print(
+            f"{len(health) - down}/{len(health)} devices online "
+            f"(checked in {time.perf_counter() - start:.1f}s)"
+        )
+        if down:
+            return 1
+
+    elif args.command == "tools":
+        from claude_lan_manager.capabilities import endpoint_of, load_catalogs
+        from claude_lan_manager.capabilities_probe import refresh_catalogs
+
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        start = time.perf_counter()
+        probed = refresh_catalogs(config.devices.values(), force=args.refresh)
+        catalogs = load_catalogs()
+        unknown = 0
+        for device_id, device in config.devices.items():
+            catalog = catalogs.get(endpoint_of(device))
+            server = " ".join(part for part in (catalog.server_name, catalog.server_version) if part) if catalog else ""
+            print(f"{device_id} ({endpoint_of(device)}) {server}".rstrip())
+            if catalog is None or not catalog.listed_at:
+                unknown += 1
+                print(f"  tools unknown: {catalog.error if catalog else 'not probed'}")
+                continue
+            if catalog.error:
+                print(f"  last probe failed ({catalog.error}); tools as of the probe before")
+            for tool in catalog.tools:
+                print(f"  {tool.signature()}" + (f"  {tool.description}" if tool.description else ""))
+        print(
+            f"{len(config.devices) - unknown}/{len(config.devices)} devices with known tools "
+            f"({len(probed)} servers asked in {time.perf_counter() - start:.1f}s)"
+        )
+        if unknown:
+            return 1
+
+    elif args.command == "discover":
+        import yaml
+
+        from claude_lan_manager import discovery
+
+        try:
+            hosts = discovery.network_hosts(args.cidr)
+            ports = discovery.parse_ports(args.ports) if args.ports else discovery.DEFAULT_PORTS
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        result = discovery.discover(
+            hosts, ports,
+            concurrency=args.concurrency or discovery.DEFAULT_CONCURRENCY,
+            connect_timeout=args.timeout or discovery.CONNECT_TIMEOUT,
+            ttl=0 if args.refresh else args.ttl if args.ttl is not None else discovery.CACHE_TTL,
+        )
+        print(
+            f"Scanned {len(hosts)} addresses x {len(ports)} ports in {result.seconds:.1f}s "
+            f"({result.cached} cached): {len(result.servers)} MCP servers",
+            file=sys.stderr,
+        )
+        for server in result.servers:
+            label = " ".join(part for part in (server.name, server.version) if part)
+            print(f"  {server.mcp_url:<32} {label}", file=sys.stderr)
+
+        entries = discovery.suggest_config(result.servers, config)
+        if not entries["devices"]:
+            if result.servers:
+                print("No new servers (all are configured already).", file=sys.stderr)
+            return 0
+        text = (
+            f"# Found by `claude-lan-manager-setup discover --cidr {args.cidr}`\n"
+            + yaml.safe_dump(entries, sort_keys=False)
+        )
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(text)
+            print(f"Wrote {len(entries['devices'])} devices and spaces to {args.output}", file=sys.stderr)
+        else:
+            print(text, end="")
+
+    elif args.command == "pool":
+        from claude_lan_manager import tmux
+        from claude_lan_manager.session_pool import SessionPool
+
+        config = AppConfig.load(args.config, use_cache=not args.no_config_cache)
+        pool = SessionPool(config)
+
+        if args.pool_command == "status":
+            if not pool.enabled:
+                print("Session pool is disabled (set session_pool.size in config.yaml; requires tmux)")
+            else:
+                targets = ", ".join(space.id for space in pool.target_spaces()) or "none"
+                print(f"Pool size {pool.settings.size} per space; kept warm: {targets}")
+            now = time.time()
+            for session in tmux.list_sessions():
+                if not session.state:
+                    continue
+                print(
+                    f"  {session.name:<30} {session.state:<5} {session.space_id:<24} "
+                    f"started {now - session.created:.0f}s ago"
+                    + (" (attached)" if session.attached else "")
+                )
+
+        elif args.pool_command == "fill":
+            if not pool.enabled:
+                print("Session pool is disabled (set session_pool.size in config.yaml; requires tmux)")
+                return 1
+            status = pool.maintain()
+            print(f"Started {len(status.started)}, evicted {len(status.evicted)} sessions")
+            for space_id, count in status.warm.items():
+                print(f"  - {space_id}: {count} ready")
+            for error in status.errors:
+                print(f"  ! {error}")
+            if status.errors:
+                return 1
+
+        elif args.pool_command == "clear":
+            killed = pool.clear()
+            print(f"Stopped {len(killed)} warm sessions")
+
+        else:
+            pool_parser.print_help()
+
     elif args.command == "copy-config":
         try:
             dest = copy_example_config(args.dest)
@@ -174,7 +883,7 @@ def setup_cli():
             return 1
 
     elif args.command == "show-config":
-        config = AppConfig.load()
+        config = AppConfig.load(use_cache=not args.no_config_cache)
         print(f"Spaces base path: {config.spaces_base_path}")
         print(f"Terminal: {config.terminal_emulator}")
         print(f"Claude command: {config.claude_code_cmd}")
@@ -185,6 +894,12 @@ def setup_cli():
         for space in config.spaces.values():
             print(f"  - {space.id}: {space.name} [{space.category}] -> {space.devices}")
 
+        dangling = config.get_dangling_references()
+        if dangling:
+            print(f"\nWarning: {len(dangling)} spaces reference unknown devices:")
+            for space_id, dev_ids in dangling.items():
+                print(f"  - {space_id}: {', '.join(dev_ids)}")
+
     else:
         parser.print_help()
 
@@ -192,5 +907,4 @@ def setup_cli():
 
 
 if __name__ == "__main__":
-    import sys
     sys.exit(setup_cli())
@@ -0,0 +1,65 @@
+"""Incremental filter over spaces for the GUIs' target lists.
+
+Each space is reduced once to a lowercase haystack of its ID, name and its
+devices' IDs, names and IPs. A query is split into terms, and a space
+matches when every term occurs somewhere in its haystack (so "rout" finds
+"router" and "10.0.0" finds every device on that subnet).
+
+Typing usually extends the previous query, which can only narrow its
+matches, so those matches are searched instead of every space.
+"""
+
+from claude_lan_manager.config import AppConfig, Device, Space
+from claude_lan_manager.inventory import CATEGORIES
+
+# Separates fields in a haystack, so terms never match across two fields
+_SEPARATOR = "\n"
+
+
+def space_haystack(space: Space, devices: tuple[Device, ...]) -> str:
+    """Searchable text of a space."""
+    fields = [space.id, space.name]
+    for device in devices:
+        fields += (device.id, device.name, device.ip)
+    return _SEPARATOR.join(fields).lower()
+
+
+class SpaceSearchIndex:
+    """Matches query strings against spaces, in category order."""
+
+    def __init__(self, spaces: list[Space], space_devices: dict[str, tuple[Device, ...]]):
+        self.spaces = spaces
+        self._haystacks = [space_haystack(space, space_devices.get(space.id, ())) for space in spaces]
+        self._everything = list(range(len(spaces)))
+        # Last query's terms and matches, to narrow from when the next one extends it
+        self._last_terms: tuple[str, ...] = ()
+        self._last_matches = self._everything
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "SpaceSearchIndex":
+        index = config.index
+        spaces = [space for category in CATEGORIES for space in index.by_category[category]]
+        return cls(spaces, index.space_devices)
+
+    def search(self, query: str) -> list[int]:
+        """Positions (in self.spaces) of the spaces matching every term of the query."""
+        terms = tuple(query.lower().split())
+        if not terms:
+            matches = self._everything
+        else:
+            candidates = self._everything
+            if self._extends(terms):
+                candidates = self._last_matches
+            haystacks = self._haystacks
+            matches = candidates
+            for term in terms:
+                matches = [position for position in matches if term in haystacks[position]]
+        self._last_terms, self._last_matches = terms, matches
+        return matches
+
+    def _extends(self, terms: tuple[str, ...]) -> bool:
+        """Whether every match of terms also matches the last query."""
+        last = self._last_terms
+        if not last or len(terms) < len(last):
+            return False
+        return all(old in new for old, new in zip(last, terms))
@@ -0,0 +1,199 @@
+"""Base class of both GUIs' main windows.
+
+Owns what the classic window (claude_lan_manager.app) and the multiplexer
+(claude_lan_manager.multiplexer) have in common: the space list, the Launch
+and Logs menus, background launches, and the session, health and pool
+upkeep that starts after the first paint. Subclasses lay out the window
+(placing `_targets`) and implement `_launch_space`, `_on_launch_started`,
+`_on_launched` and `_on_launch_failed`.
+"""
+
+from functools import partial
+from typing import Callable
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QKeySequence
+from PyQt6.QtWidgets import QMainWindow
+
+from claude_lan_manager.config import AppConfig
+from claude_lan_manager.inventory import CATEGORIES
+from claude_lan_manager.launch_executor import LaunchExecutor
+from claude_lan_manager.launcher import launch_claude_in_terminal
+from claude_lan_manager.reload import ConfigDiff
+from claude_lan_manager.session_monitor import SessionMonitor
+from claude_lan_manager.session_pool import MAINTENANCE_INTERVAL, SessionPool
+from claude_lan_manager.target_list import TargetList
+
+
+class SpacesWindow(QMainWindow):
+    """Main window listing the spaces and launching Claude in them."""
+
+    def __init__(
+        self,
+        config: AppConfig,
+        section_titles: dict[str, str],
+        launch: Callable = launch_claude_in_terminal,
+    ):
+        super().__init__()
+        self.config = config
+        self.setWindowTitle("Claude LAN Manager")
+
+        # Spaces, rendered on demand and filterable (the subclass places it)
+        self._targets = TargetList(config, section_titles)
+        self._targets.launch_requested.connect(self._launch_space)
+        self._targets.launch_category_requested.connect(self._launch_category)
+
+        # Launch menu
+        launch_menu = self.menuBar().addMenu("L&aunch")
+        for category in CATEGORIES:
+            action = launch_menu.addAction(f"Launch All {section_titles[category]}")
+            action.triggered.connect(partial(self._launch_category, category))
+        launch_menu.addSeparator()
+        cancel_action = launch_menu.addAction("&Cancel Pending Launches")
+        cancel_action.triggered.connect(self._cancel_pending_launches)
+
+        # Logs menu
+        self._log_search = None
+        logs_menu = self.menuBar().addMenu("&Logs")
+        search_action = logs_menu.addAction("&Search Logs...")
+        search_action.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        search_action.triggered.connect(self._show_log_search)
+        self._log_tail = None
+        tail_action = logs_menu.addAction("&Live Tail")
+        tail_action.setCheckable(True)
+        tail_action.setShortcut(QKeySequence("Ctrl+Shift+L"))
+        tail_action.toggled.connect(self._toggle_log_tail)
+
+        # Status bar
+        self.statusBar().showMessage("Ready")
+
+        # Launches run on worker threads so slow disks never block the window
+        self._launcher = LaunchExecutor(launch, config.bulk_launch.concurrency, parent=self)
+        self._launcher.started.connect(self._on_launch_started)
+        self._launcher.launched.connect(self._on_launched)
+        self._launcher.failed.connect(self._on_launch_failed)
+
+        # The rest isn't needed to show the window; see paintEvent()
+        self._background_started = False
+        self._background_stopped = False
+        self._sessions = None
+        self._health = None
+        self._pool_timer = None
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._background_started:
+            self._background_started = True
+            QTimer.singleShot(0, self._start_background_work)
+
+    def _start_background_work(self):
+        """Start session tracking, health checks and pool upkeep (after the first paint)."""
+        if self._background_stopped:
+            return  # closed before the first paint's work got to run
+        # Track running sessions and show their state in the list
+        self._sessions = SessionMonitor(self.config, parent=self)
+        self._sessions.updated.connect(self._on_sessions_updated)
+
+        # Probe the devices' MCP endpoints and show how each space's devices are doing
+        # (imported here: asyncio alone would add a noticeable share to startup)
+        from claude_lan_manager.health_monitor import HealthMonitor
+
+        self._health = HealthMonitor(self.config, parent=self)
+        self._health.updated.connect(self._targets.set_health)
+
+        # Keep the warm session pool topped up, and idle spaces evicted from it
+        self._pool_timer = QTimer(self)
+        self._pool_timer.setInterval(MAINTENANCE_INTERVAL * 1000)
+        self._pool_timer.timeout.connect(self._maintain_pool)
+        self._pool_timer.start()
+        self._maintain_pool()
+
+    def _stop_background_work(self):
+        """Stop session tracking, health checks and pool upkeep, waiting for work in progress."""
+        self._background_stopped = True
+        if self._pool_timer is not None:
+            self._pool_timer.stop()
+        if self._sessions is not None:
+            self._sessions.stop()
+        if self._health is not None:
+            self._health.stop()
+
+    def apply_config(self, config: AppConfig, diff: ConfigDiff):
+        """Update the window for a config change."""
+        self.config = config
+
+        self._targets.set_config(config)
+
+        if self._log_search is not None:
+            self._log_search.apply_config(config, diff)
+        if self._log_tail is not None and self._log_tail.isVisible():
+            self._log_tail.apply_config(config, diff)
+
+        self._launcher.set_max_threads(config.bulk_launch.concurrency)
+        # Before the first paint there are no monitors yet; they'll start with this config
+        if self._sessions is not None:
+            self._sessions.apply_config(config)
+        if self._health is not None:
+            self._health.apply_config(config)
+
+        # Warm sessions started from the old config are stale now
+        self._maintain_pool()
+
+        self.statusBar().showMessage(f"Config reloaded ({diff.summary()})")
+
+    def _maintain_pool(self):
+        pool = SessionPool(self.config)
+        if pool.enabled:
+            pool.maintain_in_background()
+
+    def _toggle_log_tail(self, visible: bool):
+        """Show or hide the live log dock, following logs only while shown."""
+        if visible:
+            if self._log_tail is None:
+                from claude_lan_manager.log_views import LogTailDock
+
+                self._log_tail = LogTailDock(self.config, self)
+                self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self._log_tail)
+            else:
+                self._log_tail.apply_config(self.config)
+            self._log_tail.show()
+        elif self._log_tail is not None:
+            self._log_tail.stop()
+            self._log_tail.hide()
+
+    def _show_log_search(self):
+        """Open (or raise) the log search dialog."""
+        if self._log_search is None:
+            from claude_lan_manager.log_views import LogSearchDialog
+
+            self._log_search = LogSearchDialog(self.config, self)
+        else:
+            self._log_search.refresh_index()
+        self._log_search.show()
+        self._log_search.raise_()
+        self._log_search.activateWindow()
+
+    def _launch_category(self, category: str, *_args):
+        """Launch every space in a category, staggered and with bounded concurrency."""
+        spaces = self.config.get_spaces_by_category(category)
+        queued = self._launcher.submit_many(self.config, spaces, self.config.bulk_launch.stagger)
+        skipped = len(spaces) - len(queued)
+        message = f"Launching {len(queued)} spaces"
+        if skipped:
+            message += f" ({skipped} already launching)"
+        self.statusBar().showMessage(message + "...")
+
+    def _cancel_pending_launches(self):
+        dropped = self._launcher.cancel_staggered()
+        self.statusBar().showMessage(f"Cancelled {dropped} pending launches")
+
+    def _space_name(self, space_id: str) -> str:
+        space = self.config.spaces.get(space_id)
+        return space.name if space is not None else space_id
+
+    def _on_sessions_updated(self, sessions: dict):
+        self._targets.set_sessions(sessions)
+
+    def closeEvent(self, event):
+        self._stop_background_work()
+        super().closeEvent(event)
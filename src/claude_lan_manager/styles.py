@@ -0,0 +1,89 @@
+"""Application style sheet shared by both GUIs.
+
+It is installed once on the QApplication. Widgets get their look from
+dynamic properties (`role`, `warning`, `active`) matched by the selectors below rather
+than from style sheets of their own, each of which Qt would parse and
+cascade separately. Window classes are matched by their Python class names,
+e.g. `MultiplexerWindow QLabel[role="subtitle"]`.
+
+Space rows are painted by claude_lan_manager.target_list, which has its own
+category colors.
+"""
+
+from PyQt6.QtWidgets import QWidget
+
+STYLESHEET = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QWidget {
+        background-color: #f5f5f5;
+        color: #333;
+    }
+    QStatusBar {
+        background-color: #e8e8e8;
+        color: #666;
+        border-top: 1px solid #ddd;
+    }
+    QStatusBar[warning="true"] {
+        color: orange;
+    }
+    QLabel[role="status"] {
+        color: #666;
+        font-size: 11px;
+    }
+    QTableView[role="targets"] {
+        background-color: transparent;
+    }
+    QFrame[role="pane"] {
+        border: 1px solid #ccc;
+        border-radius: 4px;
+    }
+    QFrame[role="pane"][active="true"] {
+        border-color: #2980b9;
+    }
+    QLabel[role="pane-title"] {
+        color: #333;
+        font-size: 11px;
+    }
+
+    MainWindow QLabel[role="subtitle"] {
+        color: #888;
+        font-size: 10px;
+    }
+
+    MultiplexerWindow QStatusBar {
+        font-size: 11px;
+    }
+    MultiplexerWindow QLabel[role="title"] {
+        color: #333;
+        padding-bottom: 4px;
+    }
+    MultiplexerWindow QLabel[role="subtitle"] {
+        color: #666;
+        font-size: 11px;
+        padding-bottom: 8px;
+    }
+"""
+
+
+def set_role(widget: QWidget, role: str) -> None:
+    """Style a widget by the style sheet's rules for a role (set before it is shown)."""
+    widget.setProperty("role", role)
+
+
+def set_warning(widget: QWidget, warning: bool) -> None:
+    """Switch a widget's warning style, re-applying the style sheet to it."""
+    widget.setProperty("warning", warning)
+    _repolish(widget)
+
+
+def set_active(widget: QWidget, active: bool) -> None:
+    """Highlight a widget (e.g. the terminal pane with the keyboard focus)."""
+    widget.setProperty("active", active)
+    _repolish(widget)
+
+
+def _repolish(widget: QWidget) -> None:
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
@@ -0,0 +1,457 @@
+"""Virtualized, filterable list of spaces shared by both GUIs.
+
+Spaces are rows of one model, painted by a delegate, so only the rows on
+screen cost anything however large the inventory is. Section headers are
+rows too, and row heights are fixed rather than measured, so filtering
+thousands of rows takes a few milliseconds.
+
+The filter box narrows the list on every keystroke (see
+claude_lan_manager.space_search); Return launches the first match, Escape
+clears the filter and Ctrl+F gets back to it.
+"""
+
+from typing import Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QKeySequence, QPainter, QPainterPath, QPen, QShortcut
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QFrame,
+    QHeaderView,
+    QLineEdit,
+    QTableView,
+    QMenu,
+    QStyle,
+    QStyledItemDelegate,
+    QVBoxLayout,
+    QWidget,
+)
+
+from claude_lan_manager.capabilities import device_tools
+from claude_lan_manager.config import AppConfig, Space
+from claude_lan_manager.health import (
+    STATE_DEGRADED,
+    STATE_OFFLINE,
+    STATE_ONLINE,
+    format_latency,
+    summarize_health,
+)
+from claude_lan_manager.inventory import normalize_category
+from claude_lan_manager.session_monitor import STATE_LABELS, summarize, total_usage
+from claude_lan_manager.space_search import SpaceSearchIndex
+from claude_lan_manager.styles import set_role
+
+# Row background (normal, hovered) per category
+CATEGORY_COLORS = {
+    "consolidated": ("#4a90d9", "#5a9fe8"),
+    "group": ("#26a69a", "#2ebfb1"),
+    "individual": ("#6c8ebf", "#7c9ecf"),
+}
+
+# Status dot per device health state
+HEALTH_COLORS = {
+    STATE_ONLINE: "#76ff03",
+    STATE_DEGRADED: "#ffb300",
+    STATE_OFFLINE: "#e53935",
+}
+
+# Spaces with more devices than this get health counts in their tooltip
+TOOLTIP_DEVICES = 8
+
+# Tool names listed in a space's tooltip before the rest are counted
+TOOLTIP_TOOLS = 12
+
+# Row heights, including the gap below each row
+ROW_HEIGHT = 64
+HEADER_HEIGHT = 36
+ROW_GAP = 6
+
+
+SPACE_ROLE = Qt.ItemDataRole.UserRole.value
+CATEGORY_ROLE = SPACE_ROLE + 1
+SESSION_ROLE = SPACE_ROLE + 2  # (state, count, usage), or None
+HEALTH_ROLE = SPACE_ROLE + 3  # (state, slowest latency, devices not online), or None
+
+
+def health_label(health: tuple, device_count: int) -> str:
+    """Short text for a space's health, shown next to its status dot."""
+    state, latency, down = health
+    if state == STATE_OFFLINE:
+        return "offline"
+    if state == STATE_DEGRADED and device_count > 1:
+        return f"{down}/{device_count} down"
+    return format_latency(latency) if latency is not None else state
+
+
+class TargetListModel(QAbstractListModel):
+    """Spaces matching the filter, in category order under section headers."""
+
+    def __init__(self, config: AppConfig, section_titles: dict[str, str], parent=None):
+        super().__init__(parent)
+        self.section_titles = section_titles
+        self._query = ""
+        self._sessions: dict[str, tuple] = {}
+        self._device_health: dict = {}
+        self._health: dict[str, tuple] = {}
+        # Each row is a Space, or a category name for a section header
+        self._rows: list = []
+        self._row_of: Optional[dict[str, int]] = None  # space_id -> row, built when needed
+        self.header_rows: list[int] = []
+        self.set_config(config)
+
+    @property
+    def total_count(self) -> int:
+        return len(self._search.spaces)
+
+    def set_config(self, config: AppConfig):
+        self.config = config
+        self._search = SpaceSearchIndex.from_config(config)
+        self._health = self._summarize_health()
+        self._apply_filter()
+
+    def set_filter(self, query: str):
+        if query != self._query:
+            self._query = query
+            self._apply_filter()
+
+    def _apply_filter(self):
+        spaces = self._search.spaces
+        matches = self._search.search(self._query)
+        rows = []
+        header_rows = []
+        category = None
+        for position in matches:
+            space = spaces[position]
+            if normalize_category(space.category) != category:
+                category = normalize_category(space.category)
+                header_rows.append(len(rows))
+                rows.append(category)
+            rows.append(space)
+
+        self.beginResetModel()
+        self._rows = rows
+        self.header_rows = header_rows
+        self._row_of = None
+        self.endResetModel()
+
+    def set_sessions(self, sessions: dict):
+        """Show each space's sessions ({space_id: [SessionRecord, ...]})."""
+        previous, self._sessions = self._sessions, {
+            space_id: (*summarize(records), total_usage(records))
+            for space_id, records in sessions.items()
+            if records
+        }
+        self._emit_changed(previous, self._sessions, SESSION_ROLE)
+
+    def set_health(self, health: dict):
+        """Show the health of each space's devices ({device_id: DeviceHealth})."""
+        self._device_health = health
+        previous, self._health = self._health, self._summarize_health()
+        self._emit_changed(previous, self._health, HEALTH_ROLE)
+
+    def _summarize_health(self) -> dict[str, tuple]:
+        if not self._device_health:
+            return {}
+        summaries = {}
+        for space in self._search.spaces:
+            summary = summarize_health(self._device_health, space.devices)
+            if summary is not None:
+                summaries[space.id] = summary
+        return summaries
+
+    def _emit_changed(self, previous: dict, current: dict, role: int):
+        """Announce the rows of spaces whose entry differs between two {space_id: ...}."""
+        if self._row_of is None:
+            self._row_of = {row.id: i for i, row in enumerate(self._rows) if isinstance(row, Space)}
+        # Row by row: a multi-row change makes the view lay out every row again
+        for space_id in previous.keys() | current.keys():
+            row = self._row_of.get(space_id)
+            if row is not None and previous.get(space_id) != current.get(space_id):
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [role])
+
+    def space_at(self, index: QModelIndex) -> Optional[Space]:
+        row = self._rows[index.row()] if index.isValid() else None
+        return row if isinstance(row, Space) else None
+
+    def category_at(self, index: QModelIndex) -> Optional[str]:
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        return row if isinstance(row, str) else normalize_category(row.category)
+
+    def first_space(self) -> Optional[Space]:
+        return next((row for row in self._rows if isinstance(row, Space)), None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def flags(self, index):
+        if self.space_at(index) is None:
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == CATEGORY_ROLE:
+            return self.category_at(index)
+        if isinstance(row, str):
+            return self.section_titles[row] if role == Qt.ItemDataRole.DisplayRole else None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row.name
+        if role == SPACE_ROLE:
+            return row
+        if role == SESSION_ROLE:
+            return self._sessions.get(row.id)
+        if role == HEALTH_ROLE:
+            return self._health.get(row.id)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            # Description, what running sessions use, how the devices are doing
+            # and what they offer
+            parts = [row.description]
+            session = self._sessions.get(row.id)
+            if session is not None and session[2] is not None:
+                parts.append(session[2].describe())
+            if row.id in self._health:
+                parts.append(self._health_tooltip(row))
+            parts.append(self._tools_tooltip(row))
+            return "\n\n".join(part for part in parts if part) or None
+        return None
+
+    def _health_tooltip(self, space: Space) -> str:
+        checked = [
+            (device_id, self._device_health[device_id])
+            for device_id in space.devices
+            if device_id in self._device_health
+        ]
+        if len(checked) > TOOLTIP_DEVICES:
+            counts: dict[str, int] = {}
+            for _device_id, health in checked:
+                counts[health.state] = counts.get(health.state, 0) + 1
+            return ", ".join(f"{count} {state}" for state, count in sorted(counts.items()))
+        devices = self.config.devices
+        return "\n".join(
+            f"{devices[device_id].name if device_id in devices else device_id}: {health.describe()}"
+            for device_id, health in checked
+        )
+
+    def _tools_tooltip(self, space: Space) -> str:
+        # Read from the catalog cache on hover; it's only loaded again when it changed
+        names: dict[str, None] = {}
+        for _device_id, tools in device_tools(self.config.get_devices_for_space(space)):
+            names.update(dict.fromkeys(tool.name for tool in tools))
+        if not names:
+            return ""
+        shown = list(names)[:TOOLTIP_TOOLS]
+        text = "Tools: " + ", ".join(shown)
+        if len(names) > len(shown):
+            text += f" and {len(names) - len(shown)} more"
+        return text
+
+
+class TargetDelegate(QStyledItemDelegate):
+    """Paints spaces as colored tiles and section headers as small caps labels."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._name_font = QFont()
+        self._name_font.setPixelSize(12)
+        self._name_font.setWeight(QFont.Weight.DemiBold)
+        self._detail_font = QFont(self._name_font)
+        self._detail_font.setWeight(QFont.Weight.Normal)
+        self._header_font = QFont()
+        self._header_font.setPixelSize(11)
+        self._header_font.setBold(True)
+        self._header_font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 1)
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect.adjusted(0, 0, 0, -ROW_GAP)
+        space = index.data(SPACE_ROLE)
+
+        if space is None:
+            painter.setFont(self._header_font)
+            painter.setPen(QColor("#555"))
+            painter.drawText(
+                rect.adjusted(2, 0, 0, 0),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom,
+                index.data().upper(),
+            )
+            painter.restore()
+            return
+
+        normal, hover = CATEGORY_COLORS[index.data(CATEGORY_ROLE)]
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        tile = QPainterPath()
+        tile.addRoundedRect(QRectF(rect), 6, 6)
+        painter.fillPath(tile, QColor(hover if hovered else normal))
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(QPen(QColor("#333"), 2))
+            painter.drawPath(tile)
+
+        device_count = len(space.devices)
+        details = f"{device_count} device{'s' if device_count != 1 else ''}"
+        lines = [(self._name_font, space.name), (self._detail_font, details)]
+        session = index.data(SESSION_ROLE)
+        if session is not None:
+            state, count, usage = session
+            if state:
+                details += f"  ·  {STATE_LABELS[state]}" + (f" ×{count}" if count > 1 else "")
+                lines[1] = (self._detail_font, details)
+            if usage is not None:
+                lines.append((self._detail_font, usage.describe()))
+
+        text_rect = rect.adjusted(14, 0, -14, 0)
+        health = index.data(HEALTH_ROLE)
+        if health is not None:
+            details += f"  ·  {health_label(health, device_count)}"
+            lines[1] = (self._detail_font, details)
+            # Status dot in the top right corner
+            painter.setPen(QPen(QColor("white"), 1.5))
+            painter.setBrush(QColor(HEALTH_COLORS.get(health[0], "#9e9e9e")))
+            painter.drawEllipse(QRectF(rect.right() - 18, rect.top() + 8, 10, 10))
+            text_rect.setRight(text_rect.right() - 12)
+
+        painter.setPen(Qt.GlobalColor.white)
+        line_height = max(painter.fontMetrics().height(), 15)
+        top = text_rect.top() + (text_rect.height() - line_height * len(lines)) // 2
+        for font, text in lines:
+            painter.setFont(font)
+            elided = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, text_rect.width())
+            painter.drawText(
+                text_rect.left(), top, text_rect.width(), line_height,
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided,
+            )
+            top += line_height
+        painter.restore()
+
+
+class TargetList(QWidget):
+    """Filter box over a virtualized list of spaces.
+
+    Signals:
+        launch_requested(space): A space was clicked (or picked with Return)
+        launch_category_requested(category): "Launch All" was chosen for a section
+    """
+
+    launch_requested = pyqtSignal(object)
+    launch_category_requested = pyqtSignal(str)
+
+    def __init__(
+        self,
+        config: AppConfig,
+        section_titles: dict[str, str],
+        row_height: int = ROW_HEIGHT,
+        parent=None,
+    ):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.filter = QLineEdit()
+        self.filter.setClearButtonEnabled(True)
+        layout.addWidget(self.filter)
+
+        self.model = TargetListModel(config, section_titles, self)
+        # A table's header finds the visible rows from the row heights (all the same
+        # but for section headers), without visiting every row as QListView's layout
+        # does after each filter change
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(TargetDelegate(self.view))
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.verticalHeader().setMinimumSectionSize(1)
+        self.view.verticalHeader().setDefaultSectionSize(row_height)
+        self.view.setShowGrid(False)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.view.setMouseTracking(True)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.view.setFrameShape(QFrame.Shape.NoFrame)
+        set_role(self.view, "targets")
+        self.view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.view.customContextMenuRequested.connect(self._show_context_menu)
+        self.view.clicked.connect(self._on_clicked)
+        layout.addWidget(self.view)
+
+        self.row_height = row_height
+        self._sized_rows: list[int] = []
+        self.model.modelReset.connect(self._size_header_rows)
+        self._size_header_rows()
+        self.filter.textChanged.connect(self.model.set_filter)
+        self.filter.returnPressed.connect(self._launch_first_match)
+        QShortcut(QKeySequence.StandardKey.Find, self, self._focus_filter)
+        QShortcut(
+            QKeySequence(Qt.Key.Key_Escape), self.filter, self.filter.clear,
+            context=Qt.ShortcutContext.WidgetShortcut,
+        )
+        QShortcut(
+            QKeySequence(Qt.Key.Key_Return), self.view, self._launch_current,
+            context=Qt.ShortcutContext.WidgetShortcut,
+        )
+        self._update_placeholder()
+
+    def set_config(self, config: AppConfig):
+        """Show a new configuration, keeping the filter and scroll position."""
+        scroll = self.view.verticalScrollBar().value()
+        self.model.set_config(config)
+        self.view.verticalScrollBar().setValue(scroll)
+        self._update_placeholder()
+
+    def set_sessions(self, sessions: dict):
+        self.model.set_sessions(sessions)
+
+    def set_health(self, health: dict):
+        self.model.set_health(health)
+
+    def _size_header_rows(self):
+        # Sizes survive a model reset; put the previous header rows back first
+        header = self.view.verticalHeader()
+        for row in self._sized_rows:
+            header.resizeSection(row, self.row_height)
+        for row in self.model.header_rows:
+            header.resizeSection(row, HEADER_HEIGHT)
+        self._sized_rows = list(self.model.header_rows)
+
+    def _update_placeholder(self):
+        self.filter.setPlaceholderText(f"Filter {self.model.total_count} spaces by name, ID, device or IP")
+
+    def _focus_filter(self):
+        self.filter.setFocus()
+        self.filter.selectAll()
+
+    def _on_clicked(self, index: QModelIndex):
+        space = self.model.space_at(index)
+        if space is not None:
+            self.launch_requested.emit(space)
+
+    def _launch_current(self):
+        self._on_clicked(self.view.currentIndex())
+
+    def _launch_first_match(self):
+        space = self.model.first_space()
+        if space is not None:
+            self.launch_requested.emit(space)
+
+    def _show_context_menu(self, pos):
+        index = self.view.indexAt(pos)
+        category = self.model.category_at(index)
+        if category is None:
+            return
+        menu = QMenu(self)
+        space = self.model.space_at(index)
+        if space is not None:
+            menu.addAction(f"Launch {space.name}", lambda: self.launch_requested.emit(space))
+        menu.addAction(
+            f"Launch All {self.model.section_titles[category]}",
+            lambda: self.launch_category_requested.emit(category),
+        )
+        menu.exec(self.view.viewport().mapToGlobal(pos))
@@ -0,0 +1,300 @@
+"""CLAUDE.md templates.
+
+There is one template per space category. Built-in defaults can be
+overridden by dropping `consolidated.md`, `group.md` or `individual.md` into
+a `templates/` directory next to the config file. Templates use
+`string.Template` syntax with these variables:
+
+    $title              Heading, e.g. "LAN Manager" or "Router Manager"
+    $role_description   One-sentence role for the assistant
+    $device_list        Markdown bullet list of the space's devices
+    $device_ids         Comma-separated device IDs
+    $network            Network description, e.g. "10.0.0.0/24"
+    $tools              The tools each device's MCP server offers, when they
+                        are known (see claude_lan_manager.capabilities), or
+                        a generic description; in spaces that use the MCP
+                        gateway, named as it lists them (`<device id>__<tool>`)
+    $space_id, $space_name, $space_description
+
+Templates are compiled once per process (and again only if the file
+changes), and renders are memoized on the inputs a template actually uses,
+so the many spaces that share a device set render only once.
+"""
+
+import ipaddress
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import TYPE_CHECKING, Optional
+
+from claude_lan_manager.capabilities import GATEWAY_TOOL_SEPARATOR
+from claude_lan_manager.inventory import normalize_category
+
+if TYPE_CHECKING:
+    from claude_lan_manager.config import Device, Space
+
+TEMPLATE_DIR_NAME = "templates"
+
+_BODY = """# $title
+
+$role_description
+
+## Your Role
+
+You are a systems administration assistant. Your task is to help the user manage and administer the device(s) under your control using the MCP tools available to you.
+
+## Managed Devices
+
+$device_list
+
+## Available Tools
+
+$tools
+
+## Guidelines
+
+1. **Be careful with destructive operations** - Always confirm before deleting files or making irreversible changes
+2. **Log important actions** - Save notes and logs to the `logs/` subfolder
+3. **Stay focused** - Only interact with the devices assigned to you
+4. **Report issues** - If you encounter connectivity problems or errors, inform the user
+
+## Logging
+
+Save any important logs, notes, or documentation to the `logs/` subfolder in this space:
+- `logs/session-YYYY-MM-DD.md` for session notes
+- `logs/changes.md` for tracking configuration changes
+- `logs/issues.md` for recording problems and resolutions
+
+## Network Context
+
+All devices are on the local network ($network). MCP servers use Streamable HTTP transport and are unauthenticated (local network only).
+"""
+
+# $tools when no device's tools are known
+GENERIC_TOOLS = """You have MCP connections to the device(s) listed above. Use these tools to:
+- Execute commands on the target system(s)
+- Read and write files
+- Check system status
+- Perform administrative tasks"""
+
+# Added to $tools in spaces that reach their devices through the MCP gateway
+GATEWAY_TOOLS_NOTE = (
+    "All of them come through one MCP server, named after the device they act on: "
+    f"`<device id>{GATEWAY_TOOL_SEPARATOR}<tool>`, e.g. `{{example}}`."
+)
+
+# Devices named in a tool list heading before the rest are counted instead
+TOOL_HEADING_DEVICES = 8
+
+DEFAULT_TEMPLATES = {
+    "consolidated": _BODY,
+    "group": _BODY,
+    "individual": _BODY,
+}
+
+# Space attributes each variable depends on, per category.
+# Device-derived values are always part of the memo key.
+_SPACE_FIELDS = {
+    "space_id": ("id",),
+    "space_name": ("name",),
+    "space_description": ("description",),
+    "title": {"group": ("name",)},
+    "role_description": {"group": ("name",)},
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A parsed template plus what its renders depend on."""
+    key: tuple  # identifies the template source
+    category: str
+    template: Template
+    space_fields: tuple[str, ...]
+    identifiers: frozenset[str]
+
+
+def _space_fields(identifiers: set[str], category: str) -> tuple[str, ...]:
+    fields = set()
+    for identifier in identifiers:
+        deps = _SPACE_FIELDS.get(identifier, ())
+        if isinstance(deps, dict):
+            deps = deps.get(category, ())
+        fields.update(deps)
+    return tuple(sorted(fields))
+
+
+# Compiled templates by source key; reused for the life of the process
+_compiled: dict[tuple, CompiledTemplate] = {}
+
+
+def _compile(key: tuple, category: str, source: str) -> CompiledTemplate:
+    template = Template(source)
+    identifiers = set(template.get_identifiers())
+    compiled = CompiledTemplate(
+        key, category, template, _space_fields(identifiers, category), frozenset(identifiers)
+    )
+    _compiled[key] = compiled
+    return compiled
+
+
+def get_template(category: str, template_dir: Optional[Path] = None) -> CompiledTemplate:
+    """Get the compiled template for a category, preferring a user override."""
+    category = normalize_category(category)
+    if template_dir is not None:
+        path = template_dir / f"{category}.md"
+        try:
+            stat = path.stat()
+        except OSError:
+            pass
+        else:
+            key = (str(path), stat.st_size, stat.st_mtime_ns)
+            compiled = _compiled.get(key)
+            return compiled or _compile(key, category, path.read_text())
+
+    key = ("builtin", category)
+    return _compiled.get(key) or _compile(key, category, DEFAULT_TEMPLATES[category])
+
+
+def describe_network(devices: list["Device"]) -> str:
+    """Summarize the networks a set of devices lives on, e.g. "10.0.0.0/24"."""
+    return _describe_ips(tuple(device.ip for device in devices))
+
+
+@lru_cache(maxsize=1024)
+def _describe_ips(ips: tuple[str, ...]) -> str:
+    networks = []
+    for ip in ips:
+        try:
+            networks.append(ipaddress.ip_network(f"{ip}/24", strict=False))
+        except ValueError:
+            continue  # hostnames
+
+    networks = sorted(set(networks), key=lambda n: (n.version, n))
+    if not networks:
+        return "local network"
+    if len(networks) <= 3:
+        return ", ".join(str(n) for n in networks)
+    return f"{', '.join(str(n) for n in networks[:3])} and {len(networks) - 3} more"
+
+
+def _tool_list(device_rows: tuple, tool_rows: tuple, gateway: bool = False) -> str:
+    """Markdown list of each device's tools; devices with the same tools share one list.
+
+    With gateway, the tools are named the way the MCP gateway lists them.
+    """
+    if not tool_rows:
+        if not gateway or not device_rows:
+            return GENERIC_TOOLS
+        example = f"{device_rows[0][0]}{GATEWAY_TOOL_SEPARATOR}run_command"
+        return f"{GENERIC_TOOLS}\n\n{GATEWAY_TOOLS_NOTE.format(example=example)}"
+    names = {row[0]: row[1] for row in device_rows}
+    by_tools: dict[tuple, list[str]] = {}
+    for device_id, tools in tool_rows:
+        by_tools.setdefault(tools, []).append(device_id)
+
+    intro = "Each device's MCP server offers these tools (optional arguments end in `?`):"
+    if gateway:
+        device_id, tools = next(((i, t) for i, t in tool_rows if t), tool_rows[0])
+        tool_name = tools[0].name if tools else "run_command"
+        example = f"{device_id}{GATEWAY_TOOL_SEPARATOR}{tool_name}"
+        intro = f"The devices offer these tools (optional arguments end in `?`). {GATEWAY_TOOLS_NOTE.format(example=example)}"
+    sections = [intro]
+    for tools, device_ids in by_tools.items():
+        shown = device_ids[:TOOL_HEADING_DEVICES]
+        if gateway:
+            heading = ", ".join(f"{names.get(i, i)} (`{i}`)" for i in shown)
+            # A list shared by several devices can't spell out the device ID
+            prefix = (device_ids[0] if len(device_ids) == 1 else "<device id>") + GATEWAY_TOOL_SEPARATOR
+        else:
+            heading = ", ".join(names.get(i, i) for i in shown)
+            prefix = ""
+        if len(device_ids) > TOOL_HEADING_DEVICES:
+            heading += f" and {len(device_ids) - TOOL_HEADING_DEVICES} more"
+        lines = [f"**{heading}**:"]
+        lines.extend(
+            f"- `{prefix}{tool.signature()}`" + (f": {tool.description}" if tool.description else "")
+            for tool in tools
+        )
+        if not tools:
+            lines.append("- (no tools)")
+        sections.append("\n".join(lines))
+
+    unknown = len(device_rows) - len(tool_rows)
+    if unknown:
+        sections.append(
+            f"The tools of {unknown} more device{'s' if unknown != 1 else ''} aren't known yet; "
+            "expect the same kind of command and file access there."
+        )
+    return "\n\n".join(sections)
+
+
+@lru_cache(maxsize=4096)
+def _render(
+    compiled: CompiledTemplate,
+    space_values: tuple,
+    device_rows: tuple,
+    network: str,
+    tool_rows: tuple = (),
+    gateway: bool = False,
+) -> str:
+    values = dict(zip(compiled.space_fields, space_values))
+    category = compiled.category
+
+    if category == "consolidated":
+        title = "LAN Manager"
+        role_description = "You are the consolidated LAN Manager for the home network."
+    elif category == "group":
+        title = f"{values['name']}"
+        role_description = f"You are the {values['name']}, responsible for managing a group of related devices."
+    else:
+        device_name = device_rows[0][1] if device_rows else "Unknown Device"
+        title = f"{device_name} Manager"
+        role_description = f"You are the dedicated manager for {device_name}."
+
+    device_list = "\n".join([
+        f"- **{name}** ({ip}:{port}): {description}"
+        for _id, name, ip, port, description in device_rows
+    ])
+
+    return compiled.template.safe_substitute(
+        title=title,
+        role_description=role_description,
+        device_list=device_list,
+        device_ids=", ".join(row[0] for row in device_rows),
+        network=network,
+        tools=_tool_list(device_rows, tool_rows, gateway) if "tools" in compiled.identifiers else "",
+        space_id=values.get("id", ""),
+        space_name=values.get("name", ""),
+        space_description=values.get("description", ""),
+    )
+
+
+def render_claude_md(
+    space: "Space",
+    devices: list["Device"],
+    template_dir: Optional[Path] = None,
+    network: Optional[str] = None,
+    tools: tuple = (),
+    gateway: bool = False,
+) -> str:
+    """Render CLAUDE.md for a space.
+
+    Args:
+        space: Space to render for
+        devices: Resolved devices of the space
+        template_dir: Directory with per-category template overrides
+        network: Network description; derived from device IPs if not given
+        tools: (device ID, tools) of the devices whose tools are known
+            (see claude_lan_manager.capabilities.device_tools)
+        gateway: Whether the space reaches its devices through the MCP
+            gateway, which prefixes each tool name with the device ID
+    """
+    compiled = get_template(space.category, template_dir)
+    device_rows = tuple(
+        (d.id, d.name, d.ip, d.mcp_port, d.description) for d in devices
+    )
+    space_values = tuple(getattr(space, name) for name in compiled.space_fields)
+    if "tools" not in compiled.identifiers:
+        tools, gateway = (), False  # Don't let the catalogs split the render memo for nothing
+    return _render(compiled, space_values, device_rows, network or describe_network(devices), tools, gateway)
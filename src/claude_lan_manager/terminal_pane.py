@@ -0,0 +1,555 @@
+"""Embedded terminal panes for the multiplexer window.
+
+A `TerminalView` paints a `PtySession`'s screen and sends it keystrokes.
+It never reads the pty itself: the session's I/O thread tells it there is
+new output, and it collects the changed rows at most once a frame and
+repaints just those rows. A pane flooded with output therefore costs the
+GUI thread one repaint per frame, and other panes keep updating.
+
+`PaneGrid` tiles the panes to fill its area: one pane takes it all, two sit
+side by side, three or four make a 2×2 grid, and more add columns and rows
+(⌈√n⌉ columns).
+"""
+
+import math
+import time
+from functools import partial
+from itertools import groupby
+from typing import Optional
+
+from PyQt6.QtCore import QEvent, QPointF, QRect, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetricsF, QGuiApplication, QPainter
+from PyQt6.QtWidgets import QFrame, QGridLayout, QHBoxLayout, QLabel, QToolButton, QVBoxLayout, QWidget
+
+from claude_lan_manager.pty_session import PtySession
+from claude_lan_manager.styles import set_active, set_role
+from claude_lan_manager.vt import (
+    BOLD, DIM, HIDDEN, INVERSE, ITALIC, STRIKE, TRUECOLOR, UNDERLINE, bg_of, fg_of,
+)
+
+# Shortest time between two repaints of a view, in milliseconds
+FRAME_MS = 16
+
+# Lines scrolled per mouse wheel step
+WHEEL_LINES = 3
+
+FONT_SIZE = 10
+DEFAULT_FG = QColor("#d4d4d4")
+DEFAULT_BG = QColor("#1e1e1e")
+CURSOR_COLOR = QColor("#d4d4d4")
+
+ANSI_COLORS = [QColor(color) for color in (
+    "#000000", "#cd3131", "#0dbc79", "#e5e510", "#2472c8", "#bc3fbc", "#11a8cd", "#e5e5e5",
+    "#666666", "#f14c4c", "#23d18b", "#f5f543", "#3b8eea", "#d670d6", "#29b8db", "#ffffff",
+)]
+
+_CURSOR_KEYS = {
+    Qt.Key.Key_Up: "A",
+    Qt.Key.Key_Down: "B",
+    Qt.Key.Key_Right: "C",
+    Qt.Key.Key_Left: "D",
+    Qt.Key.Key_Home: "H",
+    Qt.Key.Key_End: "F",
+}
+_FUNCTION_KEYS = {Qt.Key.Key_F1: "P", Qt.Key.Key_F2: "Q", Qt.Key.Key_F3: "R", Qt.Key.Key_F4: "S"}
+_TILDE_KEYS = {
+    Qt.Key.Key_Insert: 2, Qt.Key.Key_Delete: 3, Qt.Key.Key_PageUp: 5, Qt.Key.Key_PageDown: 6,
+    Qt.Key.Key_F5: 15, Qt.Key.Key_F6: 17, Qt.Key.Key_F7: 18, Qt.Key.Key_F8: 19,
+    Qt.Key.Key_F9: 20, Qt.Key.Key_F10: 21, Qt.Key.Key_F11: 23, Qt.Key.Key_F12: 24,
+}
+_CONTROL_KEYS = {
+    Qt.Key.Key_Space: "\x00", Qt.Key.Key_At: "\x00", Qt.Key.Key_BracketLeft: "\x1b",
+    Qt.Key.Key_Backslash: "\x1c", Qt.Key.Key_BracketRight: "\x1d",
+    Qt.Key.Key_AsciiCircum: "\x1e", Qt.Key.Key_Underscore: "\x1f",
+}
+
+
+def palette_color(color: int) -> QColor:
+    """QColor of a non-default vt color (palette index + 1, or TRUECOLOR | 0xRRGGBB)."""
+    if color & TRUECOLOR:
+        return QColor((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+    index = color - 1
+    if index < 16:
+        return ANSI_COLORS[index]
+    if index < 232:
+        index -= 16
+        r, g, b = (0 if level == 0 else 55 + level * 40 for level in (index // 36, index // 6 % 6, index % 6))
+        return QColor(r, g, b)
+    gray = 8 + (index - 232) * 10
+    return QColor(gray, gray, gray)
+
+
+def key_sequence(key: int, modifiers: Qt.KeyboardModifier, text: str, application_cursor: bool) -> str:
+    """What an xterm sends for a key press ("" if nothing)."""
+    shift = bool(modifiers & Qt.KeyboardModifier.ShiftModifier)
+    alt = bool(modifiers & Qt.KeyboardModifier.AltModifier)
+    ctrl = bool(modifiers & Qt.KeyboardModifier.ControlModifier)
+    modifier = 1 + shift + 2 * alt + 4 * ctrl
+
+    if key in _CURSOR_KEYS:
+        final = _CURSOR_KEYS[key]
+        if modifier > 1:
+            return f"\x1b[1;{modifier}{final}"
+        return ("\x1bO" if application_cursor else "\x1b[") + final
+    if key in _FUNCTION_KEYS:
+        final = _FUNCTION_KEYS[key]
+        return f"\x1b[1;{modifier}{final}" if modifier > 1 else f"\x1bO{final}"
+    if key in _TILDE_KEYS:
+        number = _TILDE_KEYS[key]
+        return f"\x1b[{number};{modifier}~" if modifier > 1 else f"\x1b[{number}~"
+    if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+        return "\x1b\r" if alt or shift else "\r"
+    if key == Qt.Key.Key_Backspace:
+        return ("\x1b" if alt else "") + ("\x08" if ctrl else "\x7f")
+    if key == Qt.Key.Key_Backtab or (key == Qt.Key.Key_Tab and shift):
+        return "\x1b[Z"
+    if key == Qt.Key.Key_Tab:
+        return "\t"
+    if key == Qt.Key.Key_Escape:
+        return "\x1b"
+
+    prefix = "\x1b" if alt else ""
+    if ctrl:
+        if Qt.Key.Key_A <= key <= Qt.Key.Key_Z:
+            return prefix + chr(key - Qt.Key.Key_A + 1)
+        if key in _CONTROL_KEYS:
+            return prefix + _CONTROL_KEYS[key]
+    return prefix + text if text else ""
+
+
+class TerminalView(QWidget):
+    """Shows a pty session's screen and types into it."""
+
+    exited = pyqtSignal(int)
+    title_changed = pyqtSignal(str)
+    focus_changed = pyqtSignal(bool)
+
+    # Emitted from the session's I/O thread; delivered on the GUI thread
+    _output = pyqtSignal()
+    _exit = pyqtSignal(int)
+
+    def __init__(self, session: PtySession, parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WidgetAttribute.WA_InputMethodEnabled)
+        self.setMinimumSize(120, 60)
+
+        self._font = QFont("Monospace", FONT_SIZE)
+        self._font.setStyleHint(QFont.StyleHint.TypeWriter)
+        self._fonts: dict[int, QFont] = {}
+        metrics = QFontMetricsF(self._font)
+        self._cell_width = max(1, math.ceil(metrics.horizontalAdvance("M")))
+        self._cell_height = max(1, math.ceil(metrics.height()))
+        self._ascent = metrics.ascent()
+        self._styles: dict[int, tuple[QColor, Optional[QColor], QFont]] = {}
+
+        self._offset = 0  # lines scrolled back into the history
+        self._scrolled = session.screen.scrolled
+        self._title = ""
+        self._last_frame = 0.0
+        self._frame = QTimer(self)
+        self._frame.setSingleShot(True)
+        self._frame.timeout.connect(self._collect)
+
+        self._output.connect(self._schedule)
+        self._exit.connect(self.exited)
+        session.on_output = self._output.emit
+        session.on_exit = self._exit.emit
+        # Output (or an exit) from before the view was connected
+        self._schedule()
+        if not session.running:
+            QTimer.singleShot(0, lambda: self.exited.emit(session.exit_status))
+
+    def detach(self) -> None:
+        """Stop hearing from the session (before the view goes away)."""
+        self.session.on_output = None
+        self.session.on_exit = None
+
+    def grid_size(self) -> tuple[int, int]:
+        """Columns and rows that fit the view."""
+        return (
+            max(2, self.width() // self._cell_width),
+            max(1, self.height() // self._cell_height),
+        )
+
+    # Output
+
+    def _schedule(self):
+        """Collect new output now, or once a frame has passed since the last repaint."""
+        if self._frame.isActive():
+            return
+        elapsed = (time.monotonic() - self._last_frame) * 1000
+        self._frame.start(max(0, int(FRAME_MS - elapsed)))
+
+    def _collect(self):
+        self._last_frame = time.monotonic()
+        damage = self.session.take_damage()
+        screen = self.session.screen
+        with self.session.lock:
+            scrolled, title = screen.scrolled, screen.title
+            history = len(screen.scrollback)
+
+        if title != self._title:
+            self._title = title
+            self.title_changed.emit(title)
+
+        if self._offset:
+            # Keep showing the same lines while output scrolls past
+            self._offset = min(self._offset + scrolled - self._scrolled, history)
+            self._scrolled = scrolled
+            self.update()
+            return
+        self._scrolled = scrolled
+
+        width, height = self.width(), self._cell_height
+        for row in damage:
+            self.update(QRect(0, row * height, width, height))
+
+    # Painting
+
+    def _style(self, attr: int) -> tuple[QColor, Optional[QColor], QFont]:
+        """Foreground, background (None for the default) and font of an attribute."""
+        style = self._styles.get(attr)
+        if style is not None:
+            return style
+        fg_color, bg_color = fg_of(attr), bg_of(attr)
+        if attr & BOLD and 1 <= fg_color <= 8:
+            fg_color += 8  # bold brightens the basic colors, like xterm
+        fg = palette_color(fg_color) if fg_color else DEFAULT_FG
+        bg = palette_color(bg_color) if bg_color else None
+        if attr & INVERSE:
+            fg, bg = bg or DEFAULT_BG, fg
+        if attr & DIM:
+            fg = fg.darker(150)
+        if attr & HIDDEN:
+            fg = bg or DEFAULT_BG
+
+        flags = attr & (BOLD | ITALIC | UNDERLINE | STRIKE)
+        font = self._fonts.get(flags)
+        if font is None:
+            font = QFont(self._font)
+            font.setBold(bool(flags & BOLD))
+            font.setItalic(bool(flags & ITALIC))
+            font.setUnderline(bool(flags & UNDERLINE))
+            font.setStrikeOut(bool(flags & STRIKE))
+            self._fonts[flags] = font
+        style = self._styles[attr] = (fg, bg, font)
+        return style
+
+    def paintEvent(self, event):
+        rect = event.rect()
+        height = self._cell_height
+        session, offset = self.session, self._offset
+
+        # Copy the rows to paint, so the I/O thread isn't held up while painting
+        with session.lock:
+            screen = session.screen
+            offset = min(offset, len(screen.scrollback))
+            first = max(0, rect.top() // height)
+            last = min(screen.rows - 1, rect.bottom() // height)
+            rows = []
+            for row in range(first, last + 1):
+                if row < offset:
+                    rows.append(screen.history_line(offset - row))
+                else:
+                    chars, attrs = screen.line(row - offset)
+                    rows.append((list(chars), list(attrs)))
+            cursor = None
+            if screen.cursor_visible and first <= screen.y + offset <= last:
+                cursor = (min(screen.x, screen.cols - 1), screen.y + offset)
+
+        painter = QPainter(self)
+        painter.fillRect(rect, DEFAULT_BG)
+        for row, (chars, attrs) in enumerate(rows, first):
+            self._paint_row(painter, row * height, chars, attrs)
+        if cursor is not None:
+            self._paint_cursor(painter, *cursor, rows[cursor[1] - first])
+        painter.end()
+
+    def _paint_row(self, painter: QPainter, top: int, chars: list[str], attrs: list[int]) -> None:
+        width, height = self._cell_width, self._cell_height
+        baseline = top + self._ascent
+        col = 0
+        for attr, run in groupby(attrs):
+            count = len(list(run))
+            fg, bg, font = self._style(attr)
+            if bg is not None:
+                painter.fillRect(col * width, top, count * width, height, bg)
+            text = "".join(chars[col:col + count])
+            if text.strip() or attr & (UNDERLINE | STRIKE):
+                painter.setFont(font)
+                painter.setPen(fg)
+                if text.isascii():
+                    painter.drawText(QPointF(col * width, baseline), text)
+                else:
+                    # Glyphs from fallback fonts may not match the cell width; place each one
+                    for index, char in enumerate(chars[col:col + count], col):
+                        if char and char != " ":
+                            painter.drawText(QPointF(index * width, baseline), char)
+            col += count
+
+    def _paint_cursor(self, painter: QPainter, x: int, y: int, row: tuple[list[str], list[int]]) -> None:
+        width, height = self._cell_width, self._cell_height
+        cell = QRect(x * width, y * height, width, height)
+        if not self.hasFocus():
+            painter.setPen(CURSOR_COLOR)
+            painter.drawRect(cell.adjusted(0, 0, -1, -1))
+            return
+        painter.fillRect(cell, CURSOR_COLOR)
+        char = row[0][x]
+        if char.strip():
+            painter.setFont(self._style(row[1][x])[2])
+            painter.setPen(DEFAULT_BG)
+            painter.drawText(QPointF(x * width, y * height + self._ascent), char)
+
+    # Input
+
+    def event(self, event):
+        if event.type() == QEvent.Type.ShortcutOverride:
+            # Keys belong to the terminal, except Ctrl+Shift combinations (window shortcuts)
+            modifiers = event.modifiers()
+            shortcut = (
+                modifiers & Qt.KeyboardModifier.ControlModifier
+                and modifiers & Qt.KeyboardModifier.ShiftModifier
+            )
+            if not shortcut:
+                event.accept()
+                return True
+        return super().event(event)
+
+    def focusNextPrevChild(self, next):
+        return False  # Tab goes to the program
+
+    def keyPressEvent(self, event):
+        shift = event.modifiers() & Qt.KeyboardModifier.ShiftModifier
+        if self._is_ctrl_shift(event, Qt.Key.Key_V) or (shift and event.key() == Qt.Key.Key_Insert):
+            self.paste()
+            return
+        if shift and event.key() in (Qt.Key.Key_PageUp, Qt.Key.Key_PageDown):
+            page = max(1, self.session.screen.rows - 1)
+            self.scroll_history(page if event.key() == Qt.Key.Key_PageUp else -page)
+            return
+
+        with self.session.lock:
+            application_cursor = self.session.screen.application_cursor
+        data = key_sequence(event.key(), event.modifiers(), event.text(), application_cursor)
+        if not data:
+            super().keyPressEvent(event)
+            return
+        self.scroll_history(-self._offset)
+        self.session.write(data.encode())
+
+    @staticmethod
+    def _is_ctrl_shift(event, key: Qt.Key) -> bool:
+        modifiers = event.modifiers()
+        return (
+            event.key() == key
+            and modifiers & Qt.KeyboardModifier.ControlModifier
+            and modifiers & Qt.KeyboardModifier.ShiftModifier
+        )
+
+    def inputMethodEvent(self, event):
+        if event.commitString():
+            self.session.write(event.commitString().encode())
+        event.accept()
+
+    def paste(self):
+        """Type the clipboard into the terminal (bracketed, if the program asked for it)."""
+        text = QGuiApplication.clipboard().text()
+        if not text:
+            return
+        text = text.replace("\r\n", "\r").replace("\n", "\r")
+        with self.session.lock:
+            bracketed = self.session.screen.bracketed_paste
+        if bracketed:
+            text = f"\x1b[200~{text.replace(chr(27), '')}\x1b[201~"
+        self.scroll_history(-self._offset)
+        self.session.write(text.encode())
+
+    def scroll_history(self, lines: int) -> None:
+        """Scroll back (positive) or forward (negative) through the scrollback."""
+        with self.session.lock:
+            history = 0 if self.session.screen.alternate else len(self.session.screen.scrollback)
+            self._scrolled = self.session.screen.scrolled
+        offset = max(0, min(self._offset + lines, history))
+        if offset != self._offset:
+            self._offset = offset
+            self.update()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() // 120
+        if not steps:
+            return
+        with self.session.lock:
+            alternate = self.session.screen.alternate
+            application_cursor = self.session.screen.application_cursor
+        if alternate:
+            # Full-screen programs have no scrollback here; scroll them with the arrow keys
+            key = Qt.Key.Key_Up if steps > 0 else Qt.Key.Key_Down
+            sequence = key_sequence(key, Qt.KeyboardModifier.NoModifier, "", application_cursor)
+            self.session.write(sequence.encode() * (abs(steps) * WHEEL_LINES))
+        else:
+            self.scroll_history(steps * WHEEL_LINES)
+
+    def mousePressEvent(self, event):
+        self.setFocus()
+        super().mousePressEvent(event)
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self._update_cursor()
+        self.focus_changed.emit(True)
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self._update_cursor()
+        self.focus_changed.emit(False)
+
+    def _update_cursor(self):
+        with self.session.lock:
+            row = self.session.screen.y + self._offset
+        self.update(QRect(0, row * self._cell_height, self.width(), self._cell_height))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.session.resize(*self.grid_size())
+
+
+class TerminalPane(QFrame):
+    """A terminal view under a header with the space's name and a close button."""
+
+    close_requested = pyqtSignal(str)
+
+    def __init__(self, space_id: str, title: str, session: PtySession, parent=None):
+        super().__init__(parent)
+        self.space_id = space_id
+        self.title = title
+        self.session = session
+        set_role(self, "pane")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(1, 1, 1, 1)
+        layout.setSpacing(0)
+
+        header = QHBoxLayout()
+        header.setContentsMargins(6, 2, 2, 2)
+        self._label = QLabel(title)
+        set_role(self._label, "pane-title")
+        header.addWidget(self._label, 1)
+        close_button = QToolButton()
+        close_button.setText("✕")
+        close_button.setAutoRaise(True)
+        close_button.setToolTip("Close (hangs up the session)")
+        close_button.clicked.connect(lambda: self.close_requested.emit(self.space_id))
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        self.view = TerminalView(session)
+        self.view.exited.connect(self._on_exited)
+        self.view.title_changed.connect(self._label.setToolTip)
+        self.view.focus_changed.connect(partial(set_active, self))
+        layout.addWidget(self.view, 1)
+        self.setFocusProxy(self.view)
+
+    @property
+    def running(self) -> bool:
+        return self.session.running
+
+    def close_session(self) -> None:
+        """Hang up the session and stop showing it."""
+        self.view.detach()
+        self.session.terminate()
+
+    def _on_exited(self, status: int):
+        self._label.setText(f"{self.title} (exited {status})" if status else f"{self.title} (exited)")
+
+
+def tile_columns(count: int) -> int:
+    """Columns for tiling count panes: 1 → 1, 2 → 2, 3-4 → 2, 5-9 → 3, ..."""
+    return max(1, math.ceil(math.sqrt(count)))
+
+
+class PaneGrid(QWidget):
+    """Terminal panes, one per space, tiled to fill the widget."""
+
+    pane_closed = pyqtSignal(str)
+
+    def __init__(self, placeholder: str = "", parent=None):
+        super().__init__(parent)
+        self._panes: dict[str, TerminalPane] = {}
+        self._layout = QGridLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(6)
+        self._grid = (0, 0)
+        self._placeholder = QLabel(placeholder)
+        self._placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        set_role(self._placeholder, "status")
+        self._retile()
+
+    def __len__(self) -> int:
+        return len(self._panes)
+
+    def pane(self, space_id: str) -> Optional[TerminalPane]:
+        return self._panes.get(space_id)
+
+    def add(self, space_id: str, title: str, session: PtySession) -> TerminalPane:
+        """Show a session in a new pane (replacing the space's previous one) and focus it."""
+        if space_id in self._panes:
+            self.remove(space_id)
+        pane = TerminalPane(space_id, title, session)
+        pane.close_requested.connect(self.remove)
+        self._panes[space_id] = pane
+        self._retile()
+        pane.view.setFocus()
+        return pane
+
+    def focus(self, space_id: str) -> bool:
+        pane = self._panes.get(space_id)
+        if pane is None:
+            return False
+        pane.view.setFocus()
+        return True
+
+    def remove(self, space_id: str) -> None:
+        """Close a space's pane, hanging up its session."""
+        pane = self._panes.pop(space_id, None)
+        if pane is None:
+            return
+        pane.close_session()
+        self._layout.removeWidget(pane)
+        pane.deleteLater()
+        self._retile()
+        self.pane_closed.emit(space_id)
+
+    def close_all(self) -> None:
+        for space_id in list(self._panes):
+            self.remove(space_id)
+
+    def _retile(self):
+        layout = self._layout
+        while layout.count():
+            layout.takeAt(0)
+        old_rows, old_columns = self._grid
+        for row in range(old_rows):
+            layout.setRowStretch(row, 0)
+        for column in range(old_columns):
+            layout.setColumnStretch(column, 0)
+
+        count = len(self._panes)
+        self._placeholder.setVisible(not count)
+        if not count:
+            layout.addWidget(self._placeholder, 0, 0)
+            self._grid = (1, 1)
+            return
+
+        columns = tile_columns(count)
+        rows = math.ceil(count / columns)
+        for index, pane in enumerate(self._panes.values()):
+            layout.addWidget(pane, index // columns, index % columns)
+        for row in range(rows):
+            layout.setRowStretch(row, 1)
+        for column in range(columns):
+            layout.setColumnStretch(column, 1)
+        self._grid = (rows, columns)
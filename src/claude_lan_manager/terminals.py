@@ -0,0 +1,209 @@
+"""Terminal backends: where a space's Claude session is shown.
+
+`terminal_emulator` in config.yaml picks the backend:
+
+- konsole, gnome-terminal, kitty, alacritty, xterm or any other program:
+  a new terminal window (or tab) per launch, running the command directly.
+- tmux: one window per space, named after the space ID, in a single
+  session of the private tmux server (see claude_lan_manager.tmux). No GUI
+  process is started; attach with `tmux -L claude-lan-manager attach -t
+  spaces`, from any terminal or over SSH.
+
+The multiplexer window uses EmbeddedBackend instead: each session runs on a
+pseudo-terminal of our own and is shown in a pane of the window (see
+claude_lan_manager.terminal_pane), with no terminal process at all.
+
+Backends are given either a shell command to run or, when the session pool
+provided one, the name of a tmux session where Claude is already running.
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from claude_lan_manager import tmux
+from claude_lan_manager.config import AppConfig, Space
+
+if TYPE_CHECKING:
+    from claude_lan_manager.pty_session import PtySession
+
+# tmux session holding one window per space
+TMUX_SESSION = "spaces"
+
+# Used when the configured terminal emulator isn't installed
+FALLBACK_TERMINAL = "x-terminal-emulator"
+
+
+@dataclass
+class LaunchedSession:
+    """A session started by a terminal backend."""
+    space_id: str
+    backend: str
+    pid: Optional[int] = None  # terminal process, or the tmux pane's shell
+    process: Optional[subprocess.Popen] = None
+    tmux_window: Optional[str] = None  # window ID, for the tmux backend
+    pty: Optional["PtySession"] = None  # for the embedded backend, to show in a pane
+    reused: bool = False  # an already running session was focused instead
+
+    def describe(self) -> str:
+        if self.tmux_window is not None:
+            return f"tmux window {self.space_id} (attach: {shlex.join(attach_command())})"
+        if self.pty is not None:
+            return f"a terminal pane (pid {self.pid})"
+        return f"{self.backend} (pid {self.pid})"
+
+
+class TerminalBackend:
+    """Shows Claude sessions somewhere the user can interact with them."""
+
+    name = ""
+
+    def is_available(self) -> bool:
+        raise NotImplementedError
+
+    def open(
+        self,
+        config: AppConfig,
+        space: Space,
+        command: str,
+        warm_session: Optional[str] = None,
+    ) -> LaunchedSession:
+        """Start (or attach to) a Claude session for a space.
+
+        Args:
+            config: Application configuration
+            space: Space to open
+            command: Shell command that cold-starts Claude in the space
+            warm_session: tmux session already running Claude for the space
+        """
+        raise NotImplementedError
+
+
+class EmulatorBackend(TerminalBackend):
+    """A new terminal emulator window or tab per launch."""
+
+    def __init__(self, terminal: str):
+        self.name = terminal
+
+    def is_available(self) -> bool:
+        return shutil.which(self.name) is not None
+
+    def open(self, config, space, command, warm_session=None) -> LaunchedSession:
+        if warm_session is not None:
+            command = shlex.join(tmux.attach_command(warm_session))
+
+        terminal = self.name
+        if not self.is_available() and shutil.which(FALLBACK_TERMINAL):
+            terminal = FALLBACK_TERMINAL
+
+        # Launch the terminal
+        process = subprocess.Popen(
+            build_terminal_command(terminal, space.path, command, title=space.name),
+            env=os.environ.copy(),
+            start_new_session=True,  # Detach from parent process
+        )
+        return LaunchedSession(space.id, terminal, pid=process.pid, process=process)
+
+
+class TmuxBackend(TerminalBackend):
+    """One window per space in a single session of the private tmux server."""
+
+    name = "tmux"
+
+    def is_available(self) -> bool:
+        return tmux.is_available()
+
+    def open(self, config, space, command, warm_session=None) -> LaunchedSession:
+        name = tmux.session_name(space.id)
+        window = None
+        if warm_session is not None:
+            warm_windows = tmux.list_windows(warm_session)
+            if warm_windows:
+                window = tmux.move_window(warm_windows[0].id, TMUX_SESSION, name)
+        if window is None:
+            window = tmux.new_window(TMUX_SESSION, name, str(space.path), command)
+        return LaunchedSession(space.id, self.name, pid=window.pane_pid, tmux_window=window.id)
+
+
+class EmbeddedBackend(TerminalBackend):
+    """A pseudo-terminal per session, shown in a pane by whoever launched it."""
+
+    name = "embedded"
+
+    def is_available(self) -> bool:
+        return True
+
+    def open(self, config, space, command, warm_session=None) -> LaunchedSession:
+        from claude_lan_manager.pty_session import PtySession
+
+        if warm_session is not None:
+            command = shlex.join(tmux.attach_command(warm_session))
+        session = PtySession(["bash", "-c", command], cwd=space.path)
+        return LaunchedSession(space.id, self.name, pid=session.pid, pty=session)
+
+
+def attach_command() -> list[str]:
+    """Command line that shows the tmux backend's windows in a terminal."""
+    return tmux.attach_command(TMUX_SESSION)
+
+
+def get_backend(config: AppConfig) -> TerminalBackend:
+    """Get the backend selected by config.terminal_emulator."""
+    if config.terminal_emulator == "tmux":
+        return TmuxBackend()
+    return EmulatorBackend(config.terminal_emulator)
+
+
+def build_terminal_command(
+    terminal: str,
+    space_path: Path,
+    command: str,
+    title: Optional[str] = None,
+) -> list[str]:
+    """Build the command line that runs a shell command in a new terminal window."""
+    if terminal == "konsole":
+        # Konsole command: open new tab, set working directory, run claude
+        return [
+            "konsole",
+            "--new-tab",
+            "--workdir", str(space_path),
+            *(["-p", f"tabtitle={title}"] if title else []),
+            "-e", "bash", "-c", command,
+        ]
+    elif terminal == "gnome-terminal":
+        return [
+            "gnome-terminal",
+            "--working-directory", str(space_path),
+            *([f"--title={title}"] if title else []),
+            "--", "bash", "-c", command,
+        ]
+    elif terminal == "xterm":
+        return [
+            "xterm",
+            *(["-T", title] if title else []),
+            "-e", f"cd {shlex.quote(str(space_path))} && {command}",
+        ]
+    elif terminal == "kitty":
+        return [
+            "kitty",
+            "--directory", str(space_path),
+            *(["--title", title] if title else []),
+            "bash", "-c", command,
+        ]
+    elif terminal == "alacritty":
+        return [
+            "alacritty",
+            "--working-directory", str(space_path),
+            *(["--title", title] if title else []),
+            "-e", "bash", "-c", command,
+        ]
+    else:
+        # Generic fallback - try to use the terminal directly
+        return [
+            terminal,
+            "-e", "bash", "-c", f"cd {shlex.quote(str(space_path))} && {command}",
+        ]
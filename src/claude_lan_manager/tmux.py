@@ -0,0 +1,248 @@
+"""Thin wrapper around a private tmux server.
+
+All sessions live on a dedicated socket (``tmux -L claude-lan-manager``) so
+they never mix with the user's own tmux sessions. Metadata such as the space
+a session belongs to is kept in tmux user options (``@clm-*``) on the session
+itself, so any process can rediscover it with a single list-sessions call.
+"""
+
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+from typing import Optional
+
+SOCKET_NAME = "claude-lan-manager"
+
+# User options stored on every session we create
+OPTION_SPACE = "@clm-space"
+OPTION_STATE = "@clm-state"
+OPTION_FINGERPRINT = "@clm-fingerprint"
+
+_FIELDS = (
+    "session_name",
+    "session_created",
+    "session_activity",
+    "session_attached",
+    OPTION_SPACE,
+    OPTION_STATE,
+    OPTION_FINGERPRINT,
+)
+_LIST_FORMAT = "\t".join(f"#{{{name}}}" for name in _FIELDS)
+
+
+class TmuxError(RuntimeError):
+    """Raised when a tmux command fails."""
+
+
+@dataclass(slots=True)
+class TmuxSession:
+    """A session on the private tmux server."""
+    name: str
+    created: int
+    activity: int
+    attached: int
+    options: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def space_id(self) -> str:
+        return self.options.get(OPTION_SPACE, "")
+
+    @property
+    def state(self) -> str:
+        return self.options.get(OPTION_STATE, "")
+
+
+def _target(name: str) -> str:
+    # "=" forces an exact match; tmux otherwise falls back to prefix matching
+    return f"={name}"
+
+
+def _pane_target(name: str) -> str:
+    # Commands that take a pane target need the session spelled as "session:"
+    return f"={name}:"
+
+
+def is_available() -> bool:
+    """Check if tmux is installed."""
+    return shutil.which("tmux") is not None
+
+
+def tmux_command(*args: str) -> list[str]:
+    """Build a tmux command line addressed to the private server."""
+    return ["tmux", "-L", SOCKET_NAME, *args]
+
+
+def run(*args: str) -> str:
+    """Run a tmux command and return its output."""
+    try:
+        result = subprocess.run(tmux_command(*args), capture_output=True, text=True)
+    except FileNotFoundError as e:
+        raise TmuxError("tmux is not installed") from e
+    if result.returncode != 0:
+        raise TmuxError(result.stderr.strip() or f"tmux {args[0]} failed")
+    return result.stdout
+
+
+def session_name(text: str) -> str:
+    """Turn arbitrary text into a valid tmux session name ('.' and ':' are reserved)."""
+    return re.sub(r"[.:\s]", "_", text)
+
+
+def list_sessions() -> list[TmuxSession]:
+    """List sessions on the private server (empty if the server isn't running)."""
+    try:
+        output = run("list-sessions", "-F", _LIST_FORMAT)
+    except TmuxError:
+        return []  # no server yet
+
+    sessions = []
+    for line in output.splitlines():
+        values = line.split("\t")
+        if len(values) != len(_FIELDS):
+            continue
+        name, created, activity, attached, *options = values
+        sessions.append(TmuxSession(
+            name=name,
+            created=int(created or 0),
+            activity=int(activity or 0),
+            attached=int(attached or 0),
+            options={key: value for key, value in zip(_FIELDS[4:], options) if value},
+        ))
+    return sessions
+
+
+def new_session(
+    name: str,
+    cwd: str,
+    command: str,
+    options: Optional[dict[str, str]] = None,
+) -> None:
+    """Start a detached session running command in cwd, tagged with user options."""
+    args = ["new-session", "-d", "-s", name, "-c", cwd, command]
+    # Chain the option commands so the session is never visible untagged
+    for key, value in (options or {}).items():
+        args += [";", "set-option", "-t", _pane_target(name), key, value]
+    run(*args)
+
+
+def set_options(name: str, options: dict[str, str]) -> None:
+    args: list[str] = []
+    for key, value in options.items():
+        if args:
+            args.append(";")
+        args += ["set-option", "-t", _pane_target(name), key, value]
+    if args:
+        run(*args)
+
+
+def unset_options(name: str, keys: list[str]) -> None:
+    args: list[str] = []
+    for key in keys:
+        if args:
+            args.append(";")
+        args += ["set-option", "-u", "-t", _pane_target(name), key]
+    if args:
+        run(*args)
+
+
+def rename_session(old: str, new: str) -> None:
+    run("rename-session", "-t", _target(old), new)
+
+
+def kill_session(name: str) -> None:
+    run("kill-session", "-t", _target(name))
+
+
+def attach_command(name: str) -> list[str]:
+    """Command line that attaches a terminal to a session."""
+    return tmux_command("attach-session", "-t", _target(name))
+
+
+def has_session(name: str) -> bool:
+    try:
+        run("has-session", "-t", _target(name))
+    except TmuxError:
+        return False
+    return True
+
+
+@dataclass(slots=True)
+class TmuxWindow:
+    """A window on the private tmux server."""
+    id: str  # e.g. "@3", stable for the window's lifetime
+    name: str
+    session: str
+    pane_pid: int
+
+
+_WINDOW_FORMAT = "#{window_id}\t#{window_name}\t#{session_name}\t#{pane_pid}"
+
+
+def _parse_window(line: str) -> TmuxWindow:
+    window_id, name, session, pid = line.rstrip("\n").split("\t")
+    return TmuxWindow(window_id, name, session, int(pid or 0))
+
+
+def list_windows(session: Optional[str] = None) -> list[TmuxWindow]:
+    """List windows of one session, or of the whole server."""
+    args = ["list-windows", "-F", _WINDOW_FORMAT]
+    args += ["-t", _target(session)] if session is not None else ["-a"]
+    try:
+        output = run(*args)
+    except TmuxError:
+        return []
+    return [_parse_window(line) for line in output.splitlines() if line]
+
+
+def new_window(session: str, name: str, cwd: str, command: str) -> TmuxWindow:
+    """Run command in a new named window, creating the session if needed."""
+    if has_session(session):
+        args = ["new-window", "-d", "-t", _pane_target(session)]
+    else:
+        args = ["new-session", "-d", "-s", session]
+    output = run(*args, "-n", name, "-c", cwd, "-P", "-F", _WINDOW_FORMAT, command)
+    return _parse_window(output)
+
+
+def move_window(window_id: str, session: str, name: str) -> TmuxWindow:
+    """Move a window into another session (created if needed) and rename it.
+
+    A session whose last window is moved away simply ends.
+    """
+    if has_session(session):
+        run("move-window", "-d", "-s", window_id, "-t", _pane_target(session))
+    else:
+        # Turn the window's own session into the target session
+        source = run("display-message", "-p", "-t", window_id, "#{session_name}").strip()
+        run("rename-session", "-t", _target(source), session)
+        unset_options(session, [OPTION_SPACE, OPTION_STATE, OPTION_FINGERPRINT])
+    run("rename-window", "-t", window_id, name)
+    output = run("display-message", "-p", "-t", window_id, _WINDOW_FORMAT)
+    return _parse_window(output)
+
+
+def select_window(window_id: str) -> None:
+    run("select-window", "-t", window_id)
+
+
+@dataclass(slots=True)
+class TmuxPane:
+    """A pane on the private tmux server, with its session's state option."""
+    pid: int
+    window_id: str
+    session: str
+    state: str
+
+
+def list_panes() -> list[TmuxPane]:
+    """List every pane on the private server."""
+    try:
+        output = run("list-panes", "-a", "-F", f"#{{pane_pid}}\t#{{window_id}}\t#{{session_name}}\t#{{{OPTION_STATE}}}")
+    except TmuxError:
+        return []
+    panes = []
+    for line in output.splitlines():
+        pid, window_id, session, state = line.split("\t")
+        panes.append(TmuxPane(int(pid or 0), window_id, session, state))
+    return panes
@@ -0,0 +1,817 @@
+"""VT100/xterm terminal emulation for the embedded terminal panes.
+
+`Screen` interprets what a program writes to its terminal (text, C0
+controls, ESC, CSI and OSC sequences) into a grid of cells. It covers what
+full-screen programs commonly use: cursor movement and save/restore,
+erasing, inserting and deleting lines and characters, scroll regions, the
+alternate screen, DEC line drawing, wide characters and SGR attributes with
+16, 256 and 24-bit colors. Status and attribute queries are answered through
+take_replies().
+
+Runs of printable text are written a slice at a time and escape sequences
+are matched with regular expressions, so a flood of output costs a few
+list operations per line rather than a trip through a state machine per
+character.
+
+Rows changed since the last take_damage() are tracked, so a view repaints
+only those. Lines scrolled off the top of the main screen go to a bounded
+scrollback ring in a compact form: the line's text with trailing blanks
+dropped and its attributes run-length encoded, rather than a cell per column.
+
+Not thread-safe; see claude_lan_manager.pty_session for the locking.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from itertools import groupby
+from typing import Optional, Union
+
+# Lines kept in the scrollback ring
+SCROLLBACK_LINES = 10000
+
+# Cell attributes are packed into an int: flags in the low byte, then the
+# foreground and background colors. A color is 0 for the default, 1-256 for
+# palette entry n-1, or TRUECOLOR | 0xRRGGBB.
+BOLD = 1 << 0
+DIM = 1 << 1
+ITALIC = 1 << 2
+UNDERLINE = 1 << 3
+BLINK = 1 << 4
+INVERSE = 1 << 5
+HIDDEN = 1 << 6
+STRIKE = 1 << 7
+FG_SHIFT = 8
+BG_SHIFT = 33
+COLOR_MASK = (1 << 25) - 1
+TRUECOLOR = 1 << 24
+DEFAULT_ATTR = 0
+
+# The right half of a wide character's two cells
+FILLER = ""
+
+# Text that is one cell per character; anything else goes through _draw_char()
+_NARROW = re.compile(
+    "[\x20-\x7e\xa0-\u02ff\u0370-\u0482\u048a-\u058f\u2010-\u2027\u2030-\u205e"
+    "\u2070-\u2319\u2500-\u25ff\u2800-\u28ff]+"
+)
+_CSI = re.compile(r"\x1b\[([<=>?]?)([0-9;:]*)([ -/]*)([@-~])")
+_CSI_PARTIAL = re.compile(r"\x1b\[[<=>?]?[0-9;:]*[ -/]*\Z")
+_OSC = re.compile(r"\x1b\]([^\x07\x1b]*)(?:\x07|\x1b\\)")
+_STRING = re.compile(r"\x1b[PX^_][^\x07\x1b]*(?:\x07|\x1b\\)")  # DCS, SOS, PM, APC: ignored
+_STRING_PARTIAL = re.compile(r"\x1b[]PX^_][^\x07\x1b]*\Z")
+_ESC = re.compile(r"\x1b([ -/]*)([0-~])")
+
+# An unterminated sequence longer than this is dropped rather than buffered
+MAX_PENDING = 64 * 1024
+
+# ESC ( 0: DEC special graphics
+DEC_GRAPHICS = str.maketrans({
+    "`": "◆", "a": "▒", "b": "␉", "c": "␌", "d": "␍", "e": "␊", "f": "°", "g": "±",
+    "h": "␤", "i": "␋", "j": "┘", "k": "┐", "l": "┌", "m": "└", "n": "┼", "o": "⎺",
+    "p": "⎻", "q": "─", "r": "⎼", "s": "⎽", "t": "├", "u": "┤", "v": "┴", "w": "┬",
+    "x": "│", "y": "≤", "z": "≥", "{": "π", "|": "≠", "}": "£", "~": "·",
+})
+
+# SGR codes that only set or clear flags
+_SGR_SET = {1: BOLD, 2: DIM, 3: ITALIC, 4: UNDERLINE, 5: BLINK, 6: BLINK, 7: INVERSE,
+            8: HIDDEN, 9: STRIKE, 21: UNDERLINE}
+_SGR_CLEAR = {22: BOLD | DIM, 23: ITALIC, 24: UNDERLINE, 25: BLINK, 27: INVERSE,
+              28: HIDDEN, 29: STRIKE}
+
+# A scrollback line: its text (or its cells, when a cell isn't one character)
+# and (attribute, cell count) runs
+CompactLine = tuple[Union[str, tuple[str, ...]], tuple[tuple[int, int], ...]]
+
+
+def fg_of(attr: int) -> int:
+    return (attr >> FG_SHIFT) & COLOR_MASK
+
+
+def bg_of(attr: int) -> int:
+    return (attr >> BG_SHIFT) & COLOR_MASK
+
+
+def compact_line(chars: list[str], attrs: list[int]) -> CompactLine:
+    """Pack a row of cells for the scrollback."""
+    text = "".join(chars)
+    if len(text) == len(chars):
+        end = len(text.rstrip(" "))
+        if any(attrs[end:]):
+            end = len(attrs)
+        cells: Union[str, tuple[str, ...]] = text[:end]
+    else:
+        # Wide or combining characters: keep the cells so columns still line up
+        end = len(chars)
+        while end and chars[end - 1] == " " and not attrs[end - 1]:
+            end -= 1
+        cells = tuple(chars[:end])
+
+    row_attrs = attrs[:end]
+    if not end:
+        runs = ()
+    elif row_attrs.count(row_attrs[0]) == end:
+        runs = ((row_attrs[0], end),)
+    else:
+        runs = tuple((attr, len(list(group))) for attr, group in groupby(row_attrs))
+    return cells, runs
+
+
+def expand_line(line: CompactLine, cols: int) -> tuple[list[str], list[int]]:
+    """Unpack a scrollback line into cols cells."""
+    cells, runs = line
+    chars = list(cells[:cols])
+    attrs: list[int] = []
+    for attr, count in runs:
+        attrs.extend([attr] * count)
+    del attrs[cols:]
+    chars.extend([" "] * (cols - len(chars)))
+    attrs.extend([DEFAULT_ATTR] * (cols - len(attrs)))
+    return chars, attrs
+
+
+def _extended_color(values: list[int]) -> tuple[Optional[int], int]:
+    """Parse the arguments of SGR 38/48 (5;n or 2;r;g;b); returns (color, values used)."""
+    if values and values[0] == 5 and len(values) >= 2:
+        return (values[1] & 0xFF) + 1, 2
+    if values and values[0] == 2 and len(values) >= 4:
+        r, g, b = (v & 0xFF for v in values[1:4])
+        return TRUECOLOR | (r << 16) | (g << 8) | b, 4
+    return None, len(values)
+
+
+def _int(text: str, default: int = 0) -> int:
+    try:
+        return int(text) if text else default
+    except ValueError:
+        return default
+
+
+class _Buffer:
+    """The cells of the main or the alternate screen."""
+
+    __slots__ = ("chars", "attrs")
+
+    def __init__(self, cols: int, rows: int):
+        self.chars = [[" "] * cols for _ in range(rows)]
+        self.attrs = [[DEFAULT_ATTR] * cols for _ in range(rows)]
+
+
+class _Cursor:
+    """What DECSC saves."""
+
+    __slots__ = ("x", "y", "attr", "charsets", "shift", "origin", "autowrap")
+
+    def __init__(self, screen: "Screen"):
+        self.x, self.y, self.attr = screen.x, screen.y, screen.attr
+        self.charsets, self.shift = list(screen.charsets), screen.shift
+        self.origin, self.autowrap = screen.origin_mode, screen.autowrap
+
+
+class Screen:
+    """A terminal screen: fed program output, read by a view."""
+
+    def __init__(self, cols: int = 80, rows: int = 24, scrollback: int = SCROLLBACK_LINES):
+        self.cols = max(1, cols)
+        self.rows = max(1, rows)
+        self.scrollback: deque[CompactLine] = deque(maxlen=scrollback)
+        self.scrolled = 0  # lines ever added to the scrollback
+        self.title = ""
+        self._pending = ""
+        self._replies: list[str] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Full reset (RIS), keeping the scrollback."""
+        self._main = _Buffer(self.cols, self.rows)
+        self._alt = _Buffer(self.cols, self.rows)
+        self._buffer = self._main
+        self.alternate = False
+        self.x = self.y = 0
+        self.attr = DEFAULT_ATTR
+        self.wrap_next = False
+        self.top, self.bottom = 0, self.rows - 1
+        self.tabstops = set(range(8, self.cols, 8))
+        self.charsets = ["B", "B"]
+        self.shift = 0
+        self.autowrap = True
+        self.origin_mode = False
+        self.insert_mode = False
+        self.cursor_visible = True
+        self.application_cursor = False
+        self.application_keypad = False
+        self.bracketed_paste = False
+        self._saved: Optional[_Cursor] = None
+        self._saved_main: Optional[_Cursor] = None
+        self.dirty = set(range(self.rows))
+        self._cursor_row = 0
+
+    # Reading
+
+    def line(self, row: int) -> tuple[list[str], list[int]]:
+        """Cells of a screen row (the lists themselves; don't modify them)."""
+        return self._buffer.chars[row], self._buffer.attrs[row]
+
+    def history_line(self, back: int) -> tuple[list[str], list[int]]:
+        """Cells of the scrollback line `back` lines above the screen (1 = newest)."""
+        return expand_line(self.scrollback[-back], self.cols)
+
+    def take_damage(self) -> set[int]:
+        """Rows changed since the last call (including where the cursor was and is)."""
+        dirty = self.dirty
+        dirty.add(self._cursor_row)
+        dirty.add(self.y)
+        self._cursor_row = self.y
+        self.dirty = set()
+        return dirty
+
+    def take_replies(self) -> str:
+        """Answers to queries (cursor position, device attributes) to send to the program."""
+        replies = "".join(self._replies)
+        self._replies.clear()
+        return replies
+
+    def text(self) -> str:
+        """The screen as plain text, one line per row."""
+        return "\n".join("".join(chars).rstrip() for chars in self._buffer.chars)
+
+    # Input
+
+    def feed(self, text: str) -> None:
+        """Interpret program output."""
+        if self._pending:
+            text = self._pending + text
+            self._pending = ""
+        i, n = 0, len(text)
+        narrow = _NARROW.match
+        while i < n:
+            match = narrow(text, i)
+            if match is not None:
+                self._draw(match.group())
+                i = match.end()
+                continue
+            c = text[i]
+            if c == "\x1b":
+                end = self._escape(text, i)
+                if end is None:
+                    # Incomplete sequence; wait for the rest
+                    rest = text[i:]
+                    if len(rest) <= MAX_PENDING:
+                        self._pending = rest
+                    return
+                i = end
+            elif c < " ":
+                self._control(c)
+                i += 1
+            elif c == "\x7f" or "\x80" <= c < "\xa0":
+                i += 1
+            else:
+                self._draw_char(c)
+                i += 1
+
+    def _escape(self, text: str, i: int) -> Optional[int]:
+        """Handle the escape sequence at text[i]; returns where it ends (None if incomplete)."""
+        if i + 1 >= len(text):
+            return None
+        kind = text[i + 1]
+        if kind == "[":
+            match = _CSI.match(text, i)
+            if match is not None:
+                self._csi(*match.groups())
+                return match.end()
+            if _CSI_PARTIAL.match(text, i):
+                return None
+        elif kind == "]":
+            match = _OSC.match(text, i)
+            if match is not None:
+                self._osc(match.group(1))
+                return match.end()
+            if _STRING_PARTIAL.match(text, i):
+                return None
+        elif kind in "PX^_":
+            match = _STRING.match(text, i)
+            if match is not None:
+                return match.end()
+            if _STRING_PARTIAL.match(text, i):
+                return None
+        else:
+            match = _ESC.match(text, i)
+            if match is not None:
+                self._esc(*match.groups())
+                return match.end()
+            if re.match(r"\x1b[ -/]*\Z", text[i:]):
+                return None
+        # Malformed: drop the ESC and carry on with what follows as text
+        return i + 1
+
+    # Text
+
+    def _draw(self, text: str) -> None:
+        """Write a run of narrow characters at the cursor."""
+        if self.charsets[self.shift] == "0":
+            text = text.translate(DEC_GRAPHICS)
+        cols = self.cols
+        while text:
+            if self.wrap_next:
+                self._wrap()
+            x, y = self.x, self.y
+            chunk = text[:cols - x]
+            text = text[cols - x:]
+            n = len(chunk)
+            chars, attrs = self._buffer.chars[y], self._buffer.attrs[y]
+            # Overwriting half of a wide character blanks the other half
+            if x and chars[x] == FILLER:
+                chars[x - 1] = " "
+            if self.insert_mode:
+                chars[x:x] = chunk
+                attrs[x:x] = [self.attr] * n
+                del chars[cols:], attrs[cols:]
+            else:
+                chars[x:x + n] = chunk
+                attrs[x:x + n] = [self.attr] * n
+            if x + n < cols and chars[x + n] == FILLER:
+                chars[x + n] = " "
+            self.dirty.add(y)
+            if x + n >= cols:
+                self.x = cols - 1
+                if self.autowrap:
+                    self.wrap_next = True
+                else:
+                    if text:
+                        chars[cols - 1] = text[-1]
+                    return
+            else:
+                self.x = x + n
+
+    def _draw_char(self, c: str) -> None:
+        """Write a character that may be wide or combining."""
+        if unicodedata.combining(c) or unicodedata.category(c) in ("Mn", "Me", "Cf"):
+            # Zero width: joins the previous cell
+            x = self.x if self.wrap_next else self.x - 1
+            chars = self._buffer.chars[self.y]
+            if x >= 0:
+                if chars[x] == FILLER and x > 0:
+                    x -= 1
+                chars[x] += c
+                self.dirty.add(self.y)
+            return
+        if unicodedata.east_asian_width(c) not in ("W", "F"):
+            self._draw(c)
+            return
+        if self.cols < 2:
+            return
+        if self.wrap_next or self.x == self.cols - 1:
+            if not self.autowrap:
+                self.x = self.cols - 2
+            else:
+                self._wrap()
+        x, y = self.x, self.y
+        chars, attrs = self._buffer.chars[y], self._buffer.attrs[y]
+        if x and chars[x] == FILLER:
+            chars[x - 1] = " "
+        if x + 2 < self.cols and chars[x + 2] == FILLER:
+            chars[x + 2] = " "
+        chars[x], chars[x + 1] = c, FILLER
+        attrs[x] = attrs[x + 1] = self.attr
+        self.dirty.add(y)
+        if x + 2 >= self.cols:
+            self.x = self.cols - 1
+            self.wrap_next = self.autowrap
+        else:
+            self.x = x + 2
+
+    def _wrap(self) -> None:
+        self.wrap_next = False
+        self.x = 0
+        self._index()
+
+    # Controls
+
+    def _control(self, c: str) -> None:
+        if c == "\r":
+            self.x = 0
+            self.wrap_next = False
+        elif c in "\n\x0b\x0c":
+            self._index()
+        elif c == "\x08":
+            if self.x:
+                self.x -= 1
+            self.wrap_next = False
+        elif c == "\t":
+            self._tab(1)
+        elif c == "\x0e":
+            self.shift = 1
+        elif c == "\x0f":
+            self.shift = 0
+        # BEL and the rest: ignored
+
+    def _tab(self, count: int) -> None:
+        for _ in range(count):
+            stops = [stop for stop in self.tabstops if stop > self.x]
+            self.x = min(stops) if stops else self.cols - 1
+        self.wrap_next = False
+
+    def _back_tab(self, count: int) -> None:
+        for _ in range(count):
+            stops = [stop for stop in self.tabstops if stop < self.x]
+            self.x = max(stops) if stops else 0
+        self.wrap_next = False
+
+    def _index(self) -> None:
+        """Move down a line, scrolling at the bottom of the scroll region."""
+        if self.y == self.bottom:
+            self._scroll_up(1)
+        elif self.y < self.rows - 1:
+            self.y += 1
+
+    def _reverse_index(self) -> None:
+        if self.y == self.top:
+            self._scroll_down(1)
+        elif self.y > 0:
+            self.y -= 1
+
+    def _blank_attr(self) -> int:
+        """Erased cells keep the current background color (like xterm)."""
+        return self.attr & (COLOR_MASK << BG_SHIFT)
+
+    def _blank_rows(self, count: int) -> tuple[list[list[str]], list[list[int]]]:
+        attr = self._blank_attr()
+        return [[" "] * self.cols for _ in range(count)], [[attr] * self.cols for _ in range(count)]
+
+    def _scroll_up(self, count: int, top: Optional[int] = None) -> None:
+        """Scroll the region from `top` (default: its top) to its bottom up."""
+        top = self.top if top is None else top
+        bottom = self.bottom
+        count = min(count, bottom - top + 1)
+        if count <= 0:
+            return
+        buffer = self._buffer
+        if top == 0 and not self.alternate:
+            for row in range(count):
+                self.scrollback.append(compact_line(buffer.chars[row], buffer.attrs[row]))
+            self.scrolled += count
+        chars, attrs = self._blank_rows(count)
+        buffer.chars[top:bottom + 1] = buffer.chars[top + count:bottom + 1] + chars
+        buffer.attrs[top:bottom + 1] = buffer.attrs[top + count:bottom + 1] + attrs
+        self.dirty.update(range(top, bottom + 1))
+
+    def _scroll_down(self, count: int, top: Optional[int] = None) -> None:
+        top = self.top if top is None else top
+        bottom = self.bottom
+        count = min(count, bottom - top + 1)
+        if count <= 0:
+            return
+        buffer = self._buffer
+        chars, attrs = self._blank_rows(count)
+        buffer.chars[top:bottom + 1] = chars + buffer.chars[top:bottom + 1 - count]
+        buffer.attrs[top:bottom + 1] = attrs + buffer.attrs[top:bottom + 1 - count]
+        self.dirty.update(range(top, bottom + 1))
+
+    # Escape sequences
+
+    def _esc(self, intermediate: str, final: str) -> None:
+        if intermediate in ("(", ")"):
+            self.charsets[0 if intermediate == "(" else 1] = final
+        elif intermediate:
+            return  # ESC # 8 (DECALN), other charsets: ignored
+        elif final == "7":
+            self._save_cursor()
+        elif final == "8":
+            self._restore_cursor()
+        elif final == "D":
+            self._index()
+        elif final == "E":
+            self.x = 0
+            self._index()
+        elif final == "M":
+            self._reverse_index()
+        elif final == "H":
+            self.tabstops.add(self.x)
+        elif final == "c":
+            self.reset()
+        elif final == "=":
+            self.application_keypad = True
+        elif final == ">":
+            self.application_keypad = False
+
+    def _osc(self, body: str) -> None:
+        command, _, text = body.partition(";")
+        if command in ("0", "2"):
+            self.title = text
+
+    def _csi(self, private: str, raw: str, intermediate: str, final: str) -> None:
+        if final == "m" and not private and not intermediate:
+            self._sgr(raw)
+            return
+        if intermediate:
+            return  # DECSCUSR (cursor style) and friends: ignored
+        params = [_int(part.split(":")[0]) for part in raw.split(";")] if raw else []
+        first = params[0] if params else 0
+        count = max(first, 1)
+
+        if private == "?":
+            if final in "hl":
+                self._private_modes(params, final == "h")
+            return
+        if private == ">":
+            if final == "c":
+                self._replies.append("\x1b[>1;10;0c")
+            return
+        if private:
+            return
+
+        if final in "HfABCDEFGd`aeIZ":
+            self._move(final, params, count)
+        elif final == "J":
+            self._erase_display(first)
+        elif final == "K":
+            self._erase_line(first)
+        elif final == "L":
+            if self.top <= self.y <= self.bottom:
+                self._scroll_down(count, self.y)
+                self.x = 0
+        elif final == "M":
+            if self.top <= self.y <= self.bottom:
+                self._scroll_up_within(count)
+                self.x = 0
+        elif final == "@":
+            self._insert_chars(count)
+        elif final == "P":
+            self._delete_chars(count)
+        elif final == "X":
+            self._erase_cells(self.y, self.x, min(self.x + count, self.cols))
+        elif final == "S":
+            self._scroll_up(count)
+        elif final == "T":
+            self._scroll_down(count)
+        elif final == "r":
+            top = (first or 1) - 1
+            bottom = (params[1] if len(params) > 1 and params[1] else self.rows) - 1
+            bottom = min(bottom, self.rows - 1)
+            if top < bottom:
+                self.top, self.bottom = top, bottom
+                self.x, self.y = 0, (top if self.origin_mode else 0)
+                self.wrap_next = False
+        elif final == "s":
+            self._save_cursor()
+        elif final == "u":
+            self._restore_cursor()
+        elif final == "g":
+            if first == 3:
+                self.tabstops.clear()
+            else:
+                self.tabstops.discard(self.x)
+        elif final in "hl":
+            if 4 in params:
+                self.insert_mode = final == "h"
+        elif final == "n":
+            if first == 5:
+                self._replies.append("\x1b[0n")
+            elif first == 6:
+                y = self.y - self.top if self.origin_mode else self.y
+                self._replies.append(f"\x1b[{y + 1};{self.x + 1}R")
+        elif final == "c":
+            if first == 0:
+                self._replies.append("\x1b[?62;22c")
+        elif final == "t":
+            if first == 18:
+                self._replies.append(f"\x1b[8;{self.rows};{self.cols}t")
+
+    def _scroll_up_within(self, count: int) -> None:
+        """Delete lines at the cursor (DL): the rest of the region moves up, nothing leaves it."""
+        bottom = self.bottom
+        count = min(count, bottom - self.y + 1)
+        buffer = self._buffer
+        chars, attrs = self._blank_rows(count)
+        buffer.chars[self.y:bottom + 1] = buffer.chars[self.y + count:bottom + 1] + chars
+        buffer.attrs[self.y:bottom + 1] = buffer.attrs[self.y + count:bottom + 1] + attrs
+        self.dirty.update(range(self.y, bottom + 1))
+
+    def _move(self, final: str, params: list[int], count: int) -> None:
+        self.wrap_next = False
+        if final in "Hf":
+            row = params[0] if params and params[0] else 1
+            col = params[1] if len(params) > 1 and params[1] else 1
+            if self.origin_mode:
+                self.y = min(self.top + row - 1, self.bottom)
+            else:
+                self.y = min(row - 1, self.rows - 1)
+            self.x = min(col - 1, self.cols - 1)
+        elif final == "A":
+            top = self.top if self.y >= self.top else 0
+            self.y = max(self.y - count, top)
+        elif final in "Be":
+            bottom = self.bottom if self.y <= self.bottom else self.rows - 1
+            self.y = min(self.y + count, bottom)
+        elif final in "Ca":
+            self.x = min(self.x + count, self.cols - 1)
+        elif final == "D":
+            self.x = max(self.x - count, 0)
+        elif final == "E":
+            self.y = min(self.y + count, self.bottom if self.y <= self.bottom else self.rows - 1)
+            self.x = 0
+        elif final == "F":
+            self.y = max(self.y - count, self.top if self.y >= self.top else 0)
+            self.x = 0
+        elif final in "G`":
+            self.x = min(count - 1, self.cols - 1)
+        elif final == "d":
+            if self.origin_mode:
+                self.y = min(self.top + count - 1, self.bottom)
+            else:
+                self.y = min(count - 1, self.rows - 1)
+        elif final == "I":
+            self._tab(count)
+        elif final == "Z":
+            self._back_tab(count)
+
+    def _erase_cells(self, row: int, start: int, end: int) -> None:
+        if start >= end:
+            return
+        buffer = self._buffer
+        buffer.chars[row][start:end] = [" "] * (end - start)
+        buffer.attrs[row][start:end] = [self._blank_attr()] * (end - start)
+        self.dirty.add(row)
+
+    def _erase_line(self, mode: int) -> None:
+        if mode == 0:
+            self._erase_cells(self.y, self.x, self.cols)
+        elif mode == 1:
+            self._erase_cells(self.y, 0, self.x + 1)
+        elif mode == 2:
+            self._erase_cells(self.y, 0, self.cols)
+
+    def _erase_display(self, mode: int) -> None:
+        if mode == 0:
+            self._erase_line(0)
+            rows = range(self.y + 1, self.rows)
+        elif mode == 1:
+            self._erase_line(1)
+            rows = range(0, self.y)
+        else:
+            rows = range(self.rows)
+            if mode == 3:
+                self.scrollback.clear()
+        for row in rows:
+            self._erase_cells(row, 0, self.cols)
+
+    def _insert_chars(self, count: int) -> None:
+        chars, attrs = self._buffer.chars[self.y], self._buffer.attrs[self.y]
+        count = min(count, self.cols - self.x)
+        chars[self.x:self.x] = [" "] * count
+        attrs[self.x:self.x] = [self._blank_attr()] * count
+        del chars[self.cols:], attrs[self.cols:]
+        self.dirty.add(self.y)
+
+    def _delete_chars(self, count: int) -> None:
+        chars, attrs = self._buffer.chars[self.y], self._buffer.attrs[self.y]
+        count = min(count, self.cols - self.x)
+        del chars[self.x:self.x + count], attrs[self.x:self.x + count]
+        chars.extend([" "] * count)
+        attrs.extend([self._blank_attr()] * count)
+        self.dirty.add(self.y)
+
+    def _save_cursor(self) -> None:
+        self._saved = _Cursor(self)
+
+    def _restore_cursor(self, saved: Optional[_Cursor] = None) -> None:
+        saved = saved or self._saved
+        if saved is None:
+            self.x = self.y = 0
+            self.attr = DEFAULT_ATTR
+            return
+        self.x, self.y = min(saved.x, self.cols - 1), min(saved.y, self.rows - 1)
+        self.attr = saved.attr
+        self.charsets, self.shift = list(saved.charsets), saved.shift
+        self.origin_mode, self.autowrap = saved.origin, saved.autowrap
+        self.wrap_next = False
+
+    def _private_modes(self, params: list[int], enable: bool) -> None:
+        for mode in params:
+            if mode == 1:
+                self.application_cursor = enable
+            elif mode == 6:
+                self.origin_mode = enable
+                self.x, self.y = 0, (self.top if enable else 0)
+            elif mode == 7:
+                self.autowrap = enable
+            elif mode == 25:
+                self.cursor_visible = enable
+                self.dirty.add(self.y)
+            elif mode in (47, 1047, 1049):
+                self._set_alternate(enable, save_cursor=mode == 1049)
+            elif mode == 1048:
+                if enable:
+                    self._save_cursor()
+                else:
+                    self._restore_cursor()
+            elif mode == 2004:
+                self.bracketed_paste = enable
+            # Mouse reporting, focus events and the rest: ignored
+
+    def _set_alternate(self, enable: bool, save_cursor: bool) -> None:
+        if enable == self.alternate:
+            return
+        if enable:
+            if save_cursor:
+                self._saved_main = _Cursor(self)
+            self._alt = _Buffer(self.cols, self.rows)
+            self._buffer = self._alt
+        else:
+            self._buffer = self._main
+            if save_cursor and self._saved_main is not None:
+                self._restore_cursor(self._saved_main)
+        self.alternate = enable
+        self.dirty.update(range(self.rows))
+
+    def _sgr(self, raw: str) -> None:
+        attr = self.attr
+        parts = raw.split(";") if raw else ["0"]
+        i = 0
+        while i < len(parts):
+            part = parts[i]
+            i += 1
+            if ":" in part:
+                # ISO 8613-6 form: 38:2::r:g:b, 38:5:n, 4:3 (curly underline), ...
+                values = [_int(value) for value in part.split(":")]
+                code, args = values[0], values[1:]
+                if code in (38, 48):
+                    if args and args[0] == 2 and len(args) == 5:
+                        del args[1]  # color space ID
+                    color, _ = _extended_color(args)
+                    if color is not None:
+                        attr = self._with_color(attr, code == 48, color)
+                elif code == 4:
+                    attr = attr | UNDERLINE if args and args[0] else attr & ~UNDERLINE
+                continue
+            code = _int(part)
+            if code == 0:
+                attr = DEFAULT_ATTR
+            elif code in _SGR_SET:
+                attr |= _SGR_SET[code]
+            elif code in _SGR_CLEAR:
+                attr &= ~_SGR_CLEAR[code]
+            elif 30 <= code <= 37:
+                attr = self._with_color(attr, False, code - 30 + 1)
+            elif 40 <= code <= 47:
+                attr = self._with_color(attr, True, code - 40 + 1)
+            elif 90 <= code <= 97:
+                attr = self._with_color(attr, False, code - 90 + 9)
+            elif 100 <= code <= 107:
+                attr = self._with_color(attr, True, code - 100 + 9)
+            elif code == 39:
+                attr = self._with_color(attr, False, 0)
+            elif code == 49:
+                attr = self._with_color(attr, True, 0)
+            elif code in (38, 48):
+                color, used = _extended_color([_int(value) for value in parts[i:i + 4]])
+                i += used
+                if color is not None:
+                    attr = self._with_color(attr, code == 48, color)
+        self.attr = attr
+
+    @staticmethod
+    def _with_color(attr: int, background: bool, color: int) -> int:
+        shift = BG_SHIFT if background else FG_SHIFT
+        return (attr & ~(COLOR_MASK << shift)) | (color << shift)
+
+    # Size
+
+    def resize(self, cols: int, rows: int) -> None:
+        """Change the screen size, keeping the cursor's line on screen."""
+        cols, rows = max(1, cols), max(1, rows)
+        if (cols, rows) == (self.cols, self.rows):
+            return
+        for buffer in (self._main, self._alt):
+            for chars, attrs in zip(buffer.chars, buffer.attrs):
+                if cols > self.cols:
+                    chars.extend([" "] * (cols - self.cols))
+                    attrs.extend([DEFAULT_ATTR] * (cols - self.cols))
+                else:
+                    del chars[cols:], attrs[cols:]
+
+        if rows < self.rows:
+            # Lines above the cursor go to the scrollback; the rest is cut from the bottom
+            excess = self.rows - rows
+            above = min(excess, max(0, self.y - rows + 1))
+            for buffer in (self._main, self._alt):
+                if buffer is self._main and above:
+                    for row in range(above):
+                        self.scrollback.append(compact_line(buffer.chars[row], buffer.attrs[row]))
+                    self.scrolled += above
+                del buffer.chars[:above], buffer.attrs[:above]
+                del buffer.chars[rows:], buffer.attrs[rows:]
+            self.y -= above
+        else:
+            for buffer in (self._main, self._alt):
+                for _ in range(rows - self.rows):
+                    buffer.chars.append([" "] * cols)
+                    buffer.attrs.append([DEFAULT_ATTR] * cols)
+
+        self.cols, self.rows = cols, rows
+        self.top, self.bottom = 0, rows - 1
+        self.tabstops = {stop for stop in self.tabstops if stop < cols} | set(range(8, cols, 8))
+        self.x, self.y = min(self.x, cols - 1), min(self.y, rows - 1)
+        self.wrap_next = False
+        self._cursor_row = min(self._cursor_row, rows - 1)
+        self.dirty = set(range(rows))